@@ -27,10 +27,15 @@ django_application = get_asgi_application()
 
 # Import websocket application here, so apps from django_application are loaded first
 from config.websocket import websocket_application  # noqa: E402
+from lm_tracker.telegram_bot.webhook import is_webhook_path  # noqa: E402
+from lm_tracker.telegram_bot.webhook import telegram_webhook_app  # noqa: E402
 
 
 async def application(scope, receive, send):
-    if scope["type"] == "http":
+    if scope["type"] == "http" and is_webhook_path(scope["path"]):
+        # Telegram webhook: skip Django middleware and ATOMIC_REQUESTS
+        await telegram_webhook_app(scope, receive, send)
+    elif scope["type"] == "http":
         await django_application(scope, receive, send)
     elif scope["type"] == "websocket":
         await websocket_application(scope, receive, send)
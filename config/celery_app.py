@@ -2,6 +2,7 @@ import os
 
 from celery import Celery
 from celery.signals import setup_logging
+from celery.signals import worker_process_init
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
@@ -24,5 +25,16 @@ def config_loggers(*args, **kwargs):
     dictConfig(settings.LOGGING)
 
 
+@worker_process_init.connect
+def reset_db_pools(*args, **kwargs):
+    # Prefork children must not reuse the parent's psycopg pool (its sockets
+    # are shared and its worker threads don't survive fork); each child
+    # lazily creates its own pool instead.
+    from django.db import connections  # noqa: PLC0415
+
+    for conn in connections.all():
+        getattr(conn, "_connection_pools", {}).pop(conn.alias, None)
+
+
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
@@ -314,6 +314,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "lm_tracker.bot_alert.tasks.bot_broadcast_task",
         "schedule": crontab(minute="*/10"),
     },
+    "price-rollup-hourly": {
+        "task": "lm_tracker.bot_alert.tasks.price_rollup_task",
+        "schedule": crontab(minute="5"),
+    },
+    "subscription-sweep-hourly": {
+        "task": "lm_tracker.telegram_bot.tasks.subscription_sweep_task",
+        "schedule": crontab(minute="15"),
+    },
 }
 # django-allauth
 # ------------------------------------------------------------------------------
@@ -364,12 +372,53 @@ SPECTACULAR_SETTINGS = {
 # telegram bot
 TELEGRAM_BOT_TOKEN = env("TELEGRAM_BOT_TOKEN", default="")
 TELEGRAM_CHANNEL_ID = env("TELEGRAM_CHANNEL_ID", default="")
+# bahasa pesan broadcast channel: "id" atau "en" (services/formatting.py)
+TELEGRAM_CHANNEL_LOCALE = env("TELEGRAM_CHANNEL_LOCALE", default="id")
 TELEGRAM_BOT_USERNAME = env("TELEGRAM_BOT_USERNAME", default="logam_track_bot")
+# Bot API untuk send_telegram + Application PTB; bisa diarahkan ke emulator
+# lokal (manage.py run_bot_api_emulator) untuk test / benchmark tanpa network
+TELEGRAM_API_BASE_URL = env(
+    "TELEGRAM_API_BASE_URL",
+    default="https://api.telegram.org",
+).rstrip("/")
 APP_BASE_URL = env("APP_BASE_URL", default="https://bot-tracker.phib.web.id")
 PUBLIC_WEBHOOK_URL = env("PUBLIC_WEBHOOK_URL", default="")
 TELEGRAM_WEBHOOK_SECRET_TOKEN = env("TELEGRAM_WEBHOOK_SECRET_TOKEN", default="x8k2p9")
+# update webhook yang diproses paralel per worker (tiap update = 1 thread DB)
+TELEGRAM_UPDATE_CONCURRENCY = env.int("TELEGRAM_UPDATE_CONCURRENCY", default=16)
+# polling ter-shard (run_tx_telegram_bot --mode fetcher/consumer): jumlah stream
+# Redis; jangan diubah selagi stream masih berisi update
+TELEGRAM_UPDATE_SHARDS = env.int("TELEGRAM_UPDATE_SHARDS", default=32)
+TELEGRAM_UPDATE_STREAM_MAXLEN = env.int(
+    "TELEGRAM_UPDATE_STREAM_MAXLEN",
+    default=100_000,
+)
+# rate limit per user sebelum handler (token bucket): memory per proses, redis
+# (dibagi antar worker) atau off. RATE = token per detik, BURST = kapasitas.
+TELEGRAM_RATE_LIMIT_BACKEND = env("TELEGRAM_RATE_LIMIT_BACKEND", default="memory")
+TELEGRAM_RATE_LIMIT_RATE = env.float("TELEGRAM_RATE_LIMIT_RATE", default=0.5)
+TELEGRAM_RATE_LIMIT_BURST = env.int("TELEGRAM_RATE_LIMIT_BURST", default=10)
+# biaya token per command (tanpa "/"); "callback" = tombol inline
+TELEGRAM_RATE_LIMIT_COSTS = {
+    "default": 1,
+    "callback": 1,
+    "export": 5,
+    "chart": 3,
+    "report": 2,
+    "find": 2,
+    "stock": 2,
+}
+# balasan keluar lewat antrean per chat (telegram_bot.replies): jatah pesan
+# Telegram per chat / global, pesan beruntun digabung, 429 dicoba ulang
+TELEGRAM_REPLY_QUEUE = env.bool("TELEGRAM_REPLY_QUEUE", default=True)
+# handler bot lebih lambat dari ini ditulis ke log (warning)
+TELEGRAM_SLOW_HANDLER_MS = env.int("TELEGRAM_SLOW_HANDLER_MS", default=1000)
+# GET /metrics/ (Prometheus): kalau diisi, wajib header "Authorization: Bearer ..."
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
 
 FREE_TXN_LIMIT_PER_MONTH = 30
+# kirim pengingat perpanjangan PRO N hari sebelum current_period_end
+SUBSCRIPTION_REMINDER_DAYS = env.int("SUBSCRIPTION_REMINDER_DAYS", default=3)
 
 TWELVEDATA_API_KEY = env("TWELVEDATA_API_KEY", default="")
 GOLDAPI_KEY = env("GOLDAPI_KEY", default="")
@@ -380,3 +429,10 @@ COOLDOWN_ALERT_MIN = int(env("COOLDOWN_ALERT_MIN", default="60"))
 COOLDOWN_UPDATE_MIN = int(env("COOLDOWN_UPDATE_MIN", default="180"))
 UPDATE_SLOTS = env("UPDATE_SLOTS", default="09:00,13:00,19:00")
 DRY_RUN = env("DRY_RUN", default="0") == "1"
+
+# retensi time-series harga (snapshot mentah -> rollup 1 jam -> rollup harian)
+PRICE_RAW_RETENTION_DAYS = env.int("PRICE_RAW_RETENTION_DAYS", default=30)
+PRICE_HOURLY_RETENTION_DAYS = env.int("PRICE_HOURLY_RETENTION_DAYS", default=400)
+# isi path folder rekaman HTML (mis. lm_tracker/bot_alert/fixtures/pages) untuk
+# melayani halaman Logam Mulia secara offline (test / benchmark)
+PRICE_FIXTURE_DIR = env("PRICE_FIXTURE_DIR", default="")
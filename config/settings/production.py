@@ -12,6 +12,7 @@ from .base import DATABASES
 from .base import INSTALLED_APPS
 from .base import REDIS_URL
 from .base import SPECTACULAR_SETTINGS
+from .base import TELEGRAM_UPDATE_CONCURRENCY
 from .base import env
 
 # GENERAL
@@ -23,7 +24,25 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# psycopg3 connection pool per proses (web / bot polling / celery), ukuran
+# diatur per service lewat env. Pool butuh CONN_MAX_AGE = 0.
+# https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+if env.bool("DJANGO_DB_POOL", default=True):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "name": env("DB_POOL_NAME", default="web"),
+        "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+        # update webhook paralel + request Django biasa
+        "max_size": env.int(
+            "DB_POOL_MAX_SIZE",
+            default=TELEGRAM_UPDATE_CONCURRENCY + 4,
+        ),
+        # detik menunggu koneksi bebas sebelum PoolTimeout
+        "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+        "max_idle": env.float("DB_POOL_MAX_IDLE", default=300.0),
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -46,6 +65,8 @@ CACHES = {
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-ssl-redirect
 SECURE_SSL_REDIRECT = env.bool("DJANGO_SECURE_SSL_REDIRECT", default=True)
+# health check & scrape Prometheus internal (load balancer / docker) lewat http biasa
+SECURE_REDIRECT_EXEMPT = [r"^health/$", r"^metrics/$"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-secure
 SESSION_COOKIE_SECURE = True
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-name
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
+from .models import AntamBarPrice
 from .models import BroadcastLog
+from .models import PriceRollup
 from .models import PriceSnapshot
 
 
@@ -13,12 +15,35 @@ class PriceSnapshotAdmin(admin.ModelAdmin):
         "spot_idr_gr",
         "antam_1g_base",
         "buyback",
+        "xagusd",
+        "silver_buyback",
         "spot_source",
     )
     list_filter = ("spot_source",)
     ordering = ("-ts",)
 
 
+@admin.register(AntamBarPrice)
+class AntamBarPriceAdmin(admin.ModelAdmin):
+    list_display = ("snapshot", "weight_gram", "price_base", "price_pph")
+    list_select_related = ("snapshot",)
+    ordering = ("-snapshot__ts", "weight_gram")
+
+
+@admin.register(PriceRollup)
+class PriceRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "resolution",
+        "bucket",
+        "samples",
+        "xauusd_close",
+        "antam_1g_base_close",
+        "buyback_close",
+    )
+    list_filter = ("resolution",)
+    ordering = ("resolution", "-bucket")
+
+
 @admin.register(BroadcastLog)
 class BroadcastLogAdmin(admin.ModelAdmin):
     list_display = ("kind", "sent_at", "slot_key")
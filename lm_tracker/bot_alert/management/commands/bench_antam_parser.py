@@ -0,0 +1,71 @@
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from lm_tracker.bot_alert.services.parsers import parse_antam_table
+from lm_tracker.bot_alert.services.parsers import parse_antam_table_soup
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / "fixtures" / "pages"
+DEFAULT_PAGE = FIXTURE_DIR / "harga-emas-hari-ini.html"
+
+PARSERS = {
+    "soup": parse_antam_table_soup,
+    "fast": parse_antam_table,
+}
+
+
+def _bench(fn, html: str, iterations: int) -> tuple[float, float, list]:
+    # waktu: rata-rata per parse (ms); memori: peak alokasi satu parse (KiB)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        rows = fn(html)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024, rows
+
+
+class Command(BaseCommand):
+    help = "Benchmark parser tabel Emas Batangan (soup walk vs parser cepat)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("pages", nargs="*", help="File HTML (default: fixture)")
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        pages = [Path(p) for p in options["pages"]] or [DEFAULT_PAGE]
+        iterations = max(1, options["iterations"])
+
+        for page in pages:
+            html = page.read_text(encoding="utf-8")
+            self.stdout.write(f"{page.name} ({len(html) / 1024:.0f} KiB)")
+
+            results = {}
+            for name, fn in PARSERS.items():
+                try:
+                    ms, kib, rows = _bench(fn, html, iterations)
+                except RuntimeError as err:
+                    # halaman rusak / berubah (mis. fixture *-renamed.html)
+                    self.stderr.write(f"  {name:<5} gagal: {err}")
+                    continue
+                results[name] = (ms, kib, rows)
+                self.stdout.write(
+                    f"  {name:<5} {ms:8.2f} ms/parse  peak {kib:9.1f} KiB  "
+                    f"{len(rows)} baris",
+                )
+
+            if len(results) < len(PARSERS):
+                continue
+            soup_ms, soup_kib, soup_rows = results["soup"]
+            fast_ms, fast_kib, fast_rows = results["fast"]
+            self.stdout.write(
+                f"  speedup {soup_ms / fast_ms:.1f}x, "
+                f"memori {soup_kib / max(fast_kib, 0.1):.1f}x lebih hemat",
+            )
+            if soup_rows != fast_rows:
+                self.stderr.write("  HASIL BERBEDA antara soup dan parser cepat!")
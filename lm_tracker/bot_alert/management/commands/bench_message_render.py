@@ -0,0 +1,136 @@
+import time
+from string import Formatter
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from lm_tracker.bot_alert.services.broadcast import ALERT_TEMPLATE
+from lm_tracker.bot_alert.services.broadcast import UPDATE_TEMPLATE
+from lm_tracker.bot_alert.services.broadcast import alert_message
+from lm_tracker.bot_alert.services.broadcast import price_movement
+from lm_tracker.bot_alert.services.broadcast import update_message
+from lm_tracker.bot_alert.services.formatting import FORMATTERS
+from lm_tracker.bot_alert.services.formatting import LOCALES
+
+SNAPSHOT = SimpleNamespace(
+    xauusd=2345.67,
+    usdidr=16250.5,
+    spot_idr_gr=1225480.4,
+    antam_1g_base=1450000,
+    antam_1g_pph=1453625,
+    buyback=1302000,
+    buyback_ts="2025-01-15 09:00",
+    spot_source="TwelveData",
+    xagusd=29.53,
+    silver_spot_idr_gr=15420.7,
+    silver_buyback=14100,
+)
+PREVIOUS = SimpleNamespace(
+    xauusd=2360.1,
+    usdidr=16210.0,
+    buyback=1310000,
+    xagusd=29.4,
+)
+UPDATE_VALUES = {
+    "ts": "15 Jan 2025 09:00 WIB",
+    "xauusd": 2345.67,
+    "spot_icon": "▽",
+    "spot_pct": -0.61,
+    "usdidr": 16250.5,
+    "fx_icon": "Δ",
+    "fx_pct": 0.25,
+    "spot_idr_gr": 1225480.4,
+    "antam_1g_base": 1450000,
+    "antam_1g_pph": 1453625,
+    "buyback": 1302000,
+    "buyback_delta": " (▽ Rp -8.000)",
+    "silver": "",
+    "spread": 148000,
+    "buyback_ts": None,
+    "spot_source": "TwelveData",
+}
+ALERT_VALUES = {
+    "direction": "down",
+    "xauusd": 2345.67,
+    "spot_icon": "▽",
+    "spot_pct": -1.2,
+    "spot_idr_gr": 1225480.4,
+    "buyback": 1302000,
+    "buyback_delta": "",
+    "spot_source": "TwelveData",
+}
+
+
+class _PerCallFormatter(Formatter):
+    # pembanding: source di-parse ulang setiap render (str.format biasa)
+    def __init__(self, locale: str, phrases: dict):
+        self.locale = locale
+        self.phrases = phrases.get(locale, {})
+
+    def format_field(self, value, format_spec):
+        if value is None:
+            return "-"
+        if format_spec == "t":
+            return self.phrases[value]
+        return FORMATTERS[format_spec](value, self.locale)
+
+
+def _rate(fn, iterations: int) -> float:
+    # render / detik
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark render pesan broadcast: template precompiled (MessageTemplate) "
+        "vs parse string format per render, untuk tiap bahasa"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20000)
+        parser.add_argument("--locales", nargs="+", choices=LOCALES, default=LOCALES)
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        locales = options["locales"]
+
+        templates = {
+            "update": (UPDATE_TEMPLATE, UPDATE_VALUES),
+            "alert": (ALERT_TEMPLATE, ALERT_VALUES),
+        }
+        for name, (template, values) in templates.items():
+            for locale in locales:
+                source = template.sources[locale]
+                per_call = _PerCallFormatter(locale, template.phrases)
+                expected = per_call.vformat(source, (), values)
+                if template.render(locale, **values) != expected:
+                    self.stderr.write(f"  {name}/{locale}: HASIL BERBEDA!")
+
+                parse_rate = _rate(
+                    lambda: per_call.vformat(source, (), values),  # noqa: B023
+                    iterations,
+                )
+                compiled_rate = _rate(
+                    lambda: template.render(locale, **values),  # noqa: B023
+                    iterations,
+                )
+                self.stdout.write(
+                    f"{name:<6} {locale}  parse/render {parse_rate:10.0f}/s  "
+                    f"precompiled {compiled_rate:10.0f}/s  "
+                    f"speedup {compiled_rate / parse_rate:.1f}x",
+                )
+
+        # jalur broadcast penuh: movement sekali, render ke semua bahasa
+        def broadcast_all():
+            m = price_movement(SNAPSHOT, PREVIOUS)
+            for locale in locales:
+                update_message(SNAPSHOT, m, locale)
+                alert_message(SNAPSHOT, m, locale)
+
+        rate = _rate(broadcast_all, max(1, iterations // 10))
+        self.stdout.write(
+            f"broadcast update+alert x {len(locales)} bahasa: {rate:.0f} snapshot/s",
+        )
@@ -0,0 +1,97 @@
+import statistics
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from lm_tracker.bot_alert.services.parsers import is_cf_challenge
+from lm_tracker.bot_alert.services.providers import antam_1g_from_table
+from lm_tracker.bot_alert.services.providers import create_scraper
+from lm_tracker.bot_alert.services.providers import fetch_antam_prices
+from lm_tracker.bot_alert.services.providers import fetch_buyback
+from lm_tracker.bot_alert.services.replay import load_manifest
+from lm_tracker.bot_alert.services.replay import mount_replay
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / "fixtures" / "pages"
+
+
+def _fetch(page, scraper) -> dict:
+    if page.kind == "antam":
+        rows = fetch_antam_prices(scraper)
+        base, pph = antam_1g_from_table(rows)
+        return {"rows": len(rows), "base_1g": base, "pph_1g": pph}
+    buyback, ts = fetch_buyback(page.url, scraper)
+    return {"buyback": buyback, "buyback_ts": ts}
+
+
+def _check(page, result: dict | None, error: Exception | None) -> list[str]:
+    problems = []
+    expect = dict(page.expect)
+    if expect.pop("cf_challenge", False) != is_cf_challenge(page.read()):
+        problems.append("deteksi Cloudflare challenge tidak sesuai")
+    if expect.pop("error", False):
+        if error is None:
+            problems.append("harusnya gagal parse, tapi berhasil")
+        return problems
+    if error is not None:
+        problems.append(f"error: {error}")
+        return problems
+    problems.extend(
+        f"{key}: dapat {result.get(key)!r}, harusnya {value!r}"
+        for key, value in expect.items()
+        if result.get(key) != value
+    )
+    return problems
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay rekaman halaman Logam Mulia (offline) lewat session scraper: "
+        "ukur latency parse per halaman dan deteksi parser yang rusak"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixture-dir", default=str(FIXTURE_DIR))
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--page", action="append", help="Nama halaman saja")
+
+    def handle(self, *args, **options):
+        pages = load_manifest(options["fixture_dir"])
+        if options["page"]:
+            pages = [p for p in pages if p.name in options["page"]]
+        iterations = max(1, options["iterations"])
+
+        scraper = create_scraper()
+        adapter = mount_replay(scraper, options["fixture_dir"])
+
+        broken = []
+        for page in pages:
+            adapter.use(page)
+            timings = []
+            result, error = None, None
+            for _ in range(iterations):
+                start = time.perf_counter()
+                try:
+                    result, error = _fetch(page, scraper), None
+                except RuntimeError as err:
+                    result, error = None, err
+                timings.append((time.perf_counter() - start) * 1000)
+
+            problems = _check(page, result, error)
+            status = "OK" if not problems else "RUSAK"
+            p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else 0
+            self.stdout.write(
+                f"{page.name:<24} {page.kind:<8} "
+                f"mean {statistics.fmean(timings):7.2f} ms  p95 {p95:7.2f} ms  "
+                f"{status}",
+            )
+            for problem in problems:
+                self.stdout.write(f"    - {problem}")
+            if problems:
+                broken.append(page.name)
+
+        if broken:
+            msg = f"{len(broken)} halaman rusak: {', '.join(broken)}"
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS(f"{len(pages)} halaman OK"))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-19 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot_alert', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('1h', 'Hourly'), ('1d', 'Daily')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('xauusd_open', models.FloatField()),
+                ('xauusd_high', models.FloatField()),
+                ('xauusd_low', models.FloatField()),
+                ('xauusd_close', models.FloatField()),
+                ('buyback_open', models.BigIntegerField()),
+                ('buyback_high', models.BigIntegerField()),
+                ('buyback_low', models.BigIntegerField()),
+                ('buyback_close', models.BigIntegerField()),
+                ('antam_1g_base_open', models.BigIntegerField()),
+                ('antam_1g_base_high', models.BigIntegerField()),
+                ('antam_1g_base_low', models.BigIntegerField()),
+                ('antam_1g_base_close', models.BigIntegerField()),
+                ('usdidr_close', models.FloatField()),
+                ('spot_idr_gr_close', models.FloatField()),
+                ('antam_1g_pph_close', models.BigIntegerField()),
+            ],
+            options={
+                'ordering': ['resolution', '-bucket'],
+                'constraints': [models.UniqueConstraint(fields=('resolution', 'bucket'), name='uniq_price_rollup_bucket')],
+            },
+        ),
+    ]
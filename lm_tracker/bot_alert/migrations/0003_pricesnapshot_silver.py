@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot_alert', '0002_price_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pricesnapshot',
+            name='silver_buyback',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pricesnapshot',
+            name='silver_buyback_ts',
+            field=models.CharField(blank=True, default='', max_length=128),
+        ),
+        migrations.AddField(
+            model_name='pricesnapshot',
+            name='silver_spot_idr_gr',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pricesnapshot',
+            name='xagusd',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot_alert', '0003_pricesnapshot_silver'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AntamBarPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight_gram', models.DecimalField(decimal_places=3, max_digits=9)),
+                ('price_base', models.BigIntegerField()),
+                ('price_pph', models.BigIntegerField()),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='antam_prices', to='bot_alert.pricesnapshot')),
+            ],
+            options={
+                'ordering': ['snapshot', 'weight_gram'],
+                'constraints': [models.UniqueConstraint(fields=('snapshot', 'weight_gram'), name='uniq_antam_bar_price_weight')],
+            },
+        ),
+    ]
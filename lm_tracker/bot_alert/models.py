@@ -17,6 +17,12 @@ class PriceSnapshot(TimeStampedModel):
     buyback = models.BigIntegerField()
     buyback_ts = models.CharField(max_length=128, blank=True)
 
+    # Perak (opsional: snapshot tetap tersimpan kalau sumber perak gagal)
+    xagusd = models.FloatField(null=True, blank=True)
+    silver_spot_idr_gr = models.FloatField(null=True, blank=True)
+    silver_buyback = models.BigIntegerField(null=True, blank=True)
+    silver_buyback_ts = models.CharField(max_length=128, blank=True, default="")
+
     spot_source = models.CharField(max_length=64)
     local_source = models.CharField(max_length=64, default="Logam Mulia")
 
@@ -24,6 +30,79 @@ class PriceSnapshot(TimeStampedModel):
         ordering = ["-ts"]
 
 
+class AntamBarPrice(models.Model):
+    """Harga per ukuran emas batangan Antam (0.5 gr - 1 kg) untuk satu snapshot."""
+
+    snapshot = models.ForeignKey(
+        PriceSnapshot,
+        on_delete=models.CASCADE,
+        related_name="antam_prices",
+    )
+    weight_gram = models.DecimalField(max_digits=9, decimal_places=3)
+    price_base = models.BigIntegerField()
+    price_pph = models.BigIntegerField()
+
+    class Meta:
+        ordering = ["snapshot", "weight_gram"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "weight_gram"],
+                name="uniq_antam_bar_price_weight",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.weight_gram} gr @ {self.price_base}"
+
+
+class PriceRollup(models.Model):
+    """
+    Candle OHLC hasil agregasi PriceSnapshot per jam / per hari.
+    Dipakai untuk chart range panjang supaya tidak baca ribuan snapshot mentah.
+    """
+
+    RES_HOUR = "1h"
+    RES_DAY = "1d"
+    RES_CHOICES = [(RES_HOUR, "Hourly"), (RES_DAY, "Daily")]
+
+    resolution = models.CharField(max_length=4, choices=RES_CHOICES)
+    # awal bucket (UTC). daily = tengah malam waktu lokal (Asia/Jakarta)
+    bucket = models.DateTimeField()
+    samples = models.PositiveIntegerField(default=0)
+
+    xauusd_open = models.FloatField()
+    xauusd_high = models.FloatField()
+    xauusd_low = models.FloatField()
+    xauusd_close = models.FloatField()
+
+    buyback_open = models.BigIntegerField()
+    buyback_high = models.BigIntegerField()
+    buyback_low = models.BigIntegerField()
+    buyback_close = models.BigIntegerField()
+
+    antam_1g_base_open = models.BigIntegerField()
+    antam_1g_base_high = models.BigIntegerField()
+    antam_1g_base_low = models.BigIntegerField()
+    antam_1g_base_close = models.BigIntegerField()
+
+    # cukup nilai close untuk seri pendukung
+    usdidr_close = models.FloatField()
+    spot_idr_gr_close = models.FloatField()
+    antam_1g_pph_close = models.BigIntegerField()
+
+    class Meta:
+        ordering = ["resolution", "-bucket"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resolution", "bucket"],
+                name="uniq_price_rollup_bucket",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.resolution} @ {self.bucket:%Y-%m-%d %H:%M}"
+
+
 class BroadcastLog(TimeStampedModel):
     KIND_UPDATE = "UPDATE"
     KIND_ALERT = "ALERT"
@@ -3,32 +3,124 @@ from __future__ import annotations
 from django.conf import settings
 from django.utils import timezone
 
+from lm_tracker.bot_alert.models import AntamBarPrice
 from lm_tracker.bot_alert.models import BroadcastLog
 from lm_tracker.bot_alert.models import PriceSnapshot
-from lm_tracker.bot_alert.services.providers import calc_spot_idr_per_gram
-from lm_tracker.bot_alert.services.providers import fetch_antam_1g_prices
-from lm_tracker.bot_alert.services.providers import fetch_buyback
-from lm_tracker.bot_alert.services.providers import get_spot_world
+from lm_tracker.bot_alert.services.formatting import DEFAULT_LOCALE
+from lm_tracker.bot_alert.services.formatting import MessageTemplate
+from lm_tracker.bot_alert.services.providers import fetch_all_prices
+from lm_tracker.bot_alert.services.state import last_sent_at
+from lm_tracker.bot_alert.services.state import last_snapshot
+from lm_tracker.bot_alert.services.state import record_broadcast
+from lm_tracker.bot_alert.services.state import remember_snapshot
+from lm_tracker.bot_alert.services.state import slot_already_sent
 from lm_tracker.bot_alert.services.telegram import send_telegram
 
 FOUR_LEN = 4
 NINE_LEN = 9
+UP_ICON = "Δ"
+DOWN_ICON = "▽"
 
 
-def fmt_rp(n: float) -> str:
-    n_int = round(n)
-    return "Rp " + f"{n_int:,}".replace(",", ".")
-
-
-def fmt_num_us(n: float, d=2) -> str:
-    return f"{n:,.{d}f}"
-
-
-def fmt_pct(p):
-    if p is None:
-        return "-"
-    sign = "+" if p >= 0 else ""
-    return f"{sign}{p:.2f}%"
+UPDATE_TEMPLATE = MessageTemplate(
+    {
+        "id": (
+            "[UPDATE EMAS] {ts}\n"
+            "\n"
+            "Spot Dunia (XAU/USD)\n"
+            "- XAU/USD: {xauusd:quote} ({spot_icon} {spot_pct:pct})\n"
+            "- USD/IDR: {usdidr:quote} ({fx_icon} {fx_pct:pct})\n"
+            "- Est. Spot Rp/gram: {spot_idr_gr:rp}\n"
+            "\n"
+            "Lokal (Logam Mulia)\n"
+            "- Antam 1gr (Harga Dasar): {antam_1g_base:rp}\n"
+            "- Antam 1gr (+PPh 0,25%): {antam_1g_pph:rp}\n"
+            "- Buyback: {buyback:rp}{buyback_delta}{silver}\n"
+            "\n"
+            "Catatan cepat\n"
+            "- Spread (Dasar - Buyback): {spread:rp}/gr\n"
+            "- Timestamp buyback: {buyback_ts}\n"
+            "\n"
+            "Sumber: Spot via {spot_source} (fallback GoldAPI), "
+            "Lokal via Logam Mulia."
+        ),
+        "en": (
+            "[GOLD UPDATE] {ts}\n"
+            "\n"
+            "World Spot (XAU/USD)\n"
+            "- XAU/USD: {xauusd:quote} ({spot_icon} {spot_pct:pct})\n"
+            "- USD/IDR: {usdidr:quote} ({fx_icon} {fx_pct:pct})\n"
+            "- Est. Spot Rp/gram: {spot_idr_gr:rp}\n"
+            "\n"
+            "Local (Logam Mulia)\n"
+            "- Antam 1gr (base price): {antam_1g_base:rp}\n"
+            "- Antam 1gr (+0.25% income tax): {antam_1g_pph:rp}\n"
+            "- Buyback: {buyback:rp}{buyback_delta}{silver}\n"
+            "\n"
+            "Quick notes\n"
+            "- Spread (base - buyback): {spread:rp}/gr\n"
+            "- Buyback timestamp: {buyback_ts}\n"
+            "\n"
+            "Source: spot via {spot_source} (GoldAPI fallback), "
+            "local via Logam Mulia."
+        ),
+    },
+)
+SILVER_TEMPLATE = MessageTemplate(
+    {
+        "id": (
+            "\n\nPerak\n"
+            "- XAG/USD: {xagusd:quote} (Δ {silver_pct:pct})\n"
+            "- Est. Spot Rp/gram: {silver_spot_idr_gr:rp}\n"
+            "- Buyback perak: {silver_buyback:rp}"
+        ),
+        "en": (
+            "\n\nSilver\n"
+            "- XAG/USD: {xagusd:quote} (Δ {silver_pct:pct})\n"
+            "- Est. Spot Rp/gram: {silver_spot_idr_gr:rp}\n"
+            "- Silver buyback: {silver_buyback:rp}"
+        ),
+    },
+)
+DELTA_TEMPLATE = MessageTemplate(
+    {
+        "id": " ({icon} {delta:rp})",
+        "en": " ({icon} {delta:rp})",
+    },
+)
+ALERT_TEMPLATE = MessageTemplate(
+    {
+        "id": (
+            "🚨 [ALERT EMAS] {direction:t} cepat\n"
+            "\n"
+            "- XAU/USD: {xauusd:quote} ({spot_icon} {spot_pct:pct} "
+            "sejak update terakhir)\n"
+            "- Est. Spot Rp/gram: {spot_idr_gr:rp}\n"
+            "- Buyback LM: {buyback:rp}{buyback_delta}\n"
+            "\n"
+            "Catatan: Spot bergerak duluan—harga lokal biasanya menyusul "
+            "bertahap.\n"
+            "\n"
+            "Sumber: {spot_source} / GoldAPI, Logam Mulia."
+        ),
+        "en": (
+            "🚨 [GOLD ALERT] fast move {direction:t}\n"
+            "\n"
+            "- XAU/USD: {xauusd:quote} ({spot_icon} {spot_pct:pct} "
+            "since last update)\n"
+            "- Est. Spot Rp/gram: {spot_idr_gr:rp}\n"
+            "- LM buyback: {buyback:rp}{buyback_delta}\n"
+            "\n"
+            "Note: spot moves first—local prices usually follow gradually.\n"
+            "\n"
+            "Source: {spot_source} / GoldAPI, Logam Mulia."
+        ),
+    },
+    phrases={
+        "id": {"up": "naik", "down": "turun"},
+        "en": {"up": "up", "down": "down"},
+    },
+)
 
 
 def pct_change(new: float, old: float | None):
@@ -61,149 +153,144 @@ def can_send(last_sent_at, cooldown_min: int):
     return (timezone.now() - last_sent_at).total_seconds() >= cooldown_min * 60
 
 
-def run_broadcast():
-    # 1) ambil data
-    antam_base, antam_pph = fetch_antam_1g_prices()
-    buyback, buyback_ts = fetch_buyback()
+def _buyback_delta(delta, icon: str, locale: str) -> str:
+    if delta is None:
+        return ""
+    return DELTA_TEMPLATE.render(locale, icon=icon, delta=delta)
 
-    xauusd, usdidr, spot_source = get_spot_world(
-        settings.TWELVEDATA_API_KEY,
-        settings.GOLDAPI_KEY,
+
+def _silver_section(snap: PriceSnapshot, silver_pct, locale: str) -> str:
+    if snap.xagusd is None:
+        return ""
+    return SILVER_TEMPLATE.render(
+        locale,
+        xagusd=snap.xagusd,
+        silver_pct=silver_pct,
+        silver_spot_idr_gr=snap.silver_spot_idr_gr,
+        silver_buyback=snap.silver_buyback,
     )
-    spot_idr_gr = calc_spot_idr_per_gram(xauusd, usdidr)
-
-    snap = PriceSnapshot.objects.create(
-        xauusd=xauusd,
-        usdidr=usdidr,
-        spot_idr_gr=spot_idr_gr,
-        antam_1g_base=antam_base,
-        antam_1g_pph=antam_pph,
-        buyback=buyback,
-        buyback_ts=buyback_ts,
-        spot_source=spot_source,
+
+
+def update_message(snap, m: dict, locale: str = DEFAULT_LOCALE) -> str:
+    """Pesan update rutin; m dari price_movement() (dihitung sekali per snapshot)."""
+    return UPDATE_TEMPLATE.render(
+        locale,
+        ts=timezone.localtime().strftime("%d %b %Y %H:%M WIB"),
+        xauusd=snap.xauusd,
+        spot_icon=m["spot_icon"],
+        spot_pct=m["spot_pct"],
+        usdidr=snap.usdidr,
+        fx_icon=m["fx_icon"],
+        fx_pct=m["fx_pct"],
+        spot_idr_gr=snap.spot_idr_gr,
+        antam_1g_base=snap.antam_1g_base,
+        antam_1g_pph=snap.antam_1g_pph,
+        buyback=snap.buyback,
+        buyback_delta=_buyback_delta(m["buyback_delta"], m["bb_icon"], locale),
+        silver=_silver_section(snap, m["silver_pct"], locale),
+        spread=snap.antam_1g_base - snap.buyback,
+        buyback_ts=snap.buyback_ts or None,
+        spot_source=snap.spot_source,
     )
 
-    prev = PriceSnapshot.objects.exclude(id=snap.id).order_by("-ts").first()
+
+def alert_message(snap, m: dict, locale: str = DEFAULT_LOCALE) -> str:
+    """Pesan breaking alert; m dari price_movement()."""
+    return ALERT_TEMPLATE.render(
+        locale,
+        direction="up" if (m["spot_pct"] or 0) >= 0 else "down",
+        xauusd=snap.xauusd,
+        spot_icon=m["spot_icon"],
+        spot_pct=m["spot_pct"],
+        spot_idr_gr=snap.spot_idr_gr,
+        buyback=snap.buyback,
+        buyback_delta=_buyback_delta(m["buyback_delta"], m["bb_icon"], locale),
+        spot_source=snap.spot_source,
+    )
+
+
+def price_movement(snap, prev) -> dict:
     spot_pct = pct_change(snap.xauusd, prev.xauusd if prev else None)
     fx_pct = pct_change(snap.usdidr, prev.usdidr if prev else None)
     buyback_delta = (snap.buyback - prev.buyback) if prev else None
+    silver_pct = (
+        pct_change(snap.xagusd, prev.xagusd if prev else None)
+        if snap.xagusd is not None
+        else None
+    )
+    return {
+        "spot_pct": spot_pct,
+        "fx_pct": fx_pct,
+        "buyback_delta": buyback_delta,
+        "silver_pct": silver_pct,
+        "spot_icon": DOWN_ICON if spot_pct and spot_pct < 0 else UP_ICON,
+        "fx_icon": DOWN_ICON if fx_pct and fx_pct < 0 else UP_ICON,
+        "bb_icon": DOWN_ICON if buyback_delta and buyback_delta < 0 else UP_ICON,
+    }
 
-    icon = "▽"
-    spot_icon_show = "Δ"
-    fx_icon_show = "Δ"
-    bb_icon_show = "Δ"
 
-    if fx_pct and fx_pct < 0:
-        fx_icon_show = icon
+def run_broadcast():
+    # 1) ambil data (emas + perak paralel)
+    prices = fetch_all_prices(settings.TWELVEDATA_API_KEY, settings.GOLDAPI_KEY)
+    antam_table = prices.pop("antam_table")
 
-    if spot_pct and spot_pct < 0:
-        spot_icon_show = icon
+    # snapshot sebelumnya diambil dari state cache sebelum insert
+    prev = last_snapshot()
+    snap = PriceSnapshot.objects.create(**prices)
+    AntamBarPrice.objects.bulk_create(
+        [
+            AntamBarPrice(
+                snapshot=snap,
+                weight_gram=row.weight_gram,
+                price_base=row.base,
+                price_pph=row.pph,
+            )
+            for row in antam_table
+        ],
+        ignore_conflicts=True,
+    )
+    remember_snapshot(snap)
 
-    if buyback_delta and buyback_delta < 0:
-        bb_icon_show = icon
+    m = price_movement(snap, prev)
+    locale = settings.TELEGRAM_CHANNEL_LOCALE
 
     # 2) cek update rutin
     slot = current_slot()
     if slot:
         slot_key = f"{timezone.localdate().isoformat()}@{slot}"
-        already = BroadcastLog.objects.filter(
-            kind=BroadcastLog.KIND_UPDATE,
-            slot_key=slot_key,
-        ).exists()
-        last_update = (
-            BroadcastLog.objects.filter(kind=BroadcastLog.KIND_UPDATE)
-            .order_by("-sent_at")
-            .first()
-        )
+        already = slot_already_sent(slot_key)
         if (not already) and can_send(
-            last_update.sent_at if last_update else None,
+            last_sent_at(BroadcastLog.KIND_UPDATE),
             settings.COOLDOWN_UPDATE_MIN,
         ):
-            spread = snap.antam_1g_base - snap.buyback
-            update_tz = timezone.localtime().strftime("%d %b %Y %H:%M WIB")
-            msg = "\n".join(
-                [
-                    f"[UPDATE EMAS] {update_tz}",
-                    "",
-                    "Spot Dunia (XAU/USD)",
-                    f"- XAU/USD: {fmt_num_us(snap.xauusd)} ({spot_icon_show} "
-                    f"{fmt_pct(spot_pct)})",
-                    f"- USD/IDR: {fmt_num_us(snap.usdidr)} ({fx_icon_show} "
-                    f"{fmt_pct(fx_pct)})",
-                    f"- Est. Spot Rp/gram: {fmt_rp(snap.spot_idr_gr)}",
-                    "",
-                    "Lokal (Logam Mulia)",
-                    f"- Antam 1gr (Harga Dasar): {fmt_rp(snap.antam_1g_base)}",
-                    f"- Antam 1gr (+PPh 0.25%): {fmt_rp(snap.antam_1g_pph)}",
-                    f"- Buyback: {fmt_rp(snap.buyback)}"
-                    + (
-                        f" ({bb_icon_show} {fmt_rp(buyback_delta)})"
-                        if buyback_delta is not None
-                        else ""
-                    ),
-                    "",
-                    "Catatan cepat",
-                    f"- Spread (Dasar - Buyback): {fmt_rp(spread)}/gr",
-                    f"- Timestamp buyback: {snap.buyback_ts or '-'}",
-                    "",
-                    f"Sumber: Spot via {snap.spot_source} "
-                    f"(fallback GoldAPI), Lokal via Logam Mulia.",
-                ],
-            )
+            msg = update_message(snap, m, locale)
             send_telegram(
                 settings.TELEGRAM_BOT_TOKEN,
                 settings.TELEGRAM_CHANNEL_ID,
                 msg,
                 dry_run=settings.DRY_RUN,
             )
-            BroadcastLog.objects.create(
-                kind=BroadcastLog.KIND_UPDATE,
-                slot_key=slot_key,
-                message=msg,
-            )
+            record_broadcast(BroadcastLog.KIND_UPDATE, msg, slot_key=slot_key)
         return
 
     # 3) cek breaking alert
+    spot_pct = m["spot_pct"]
+    buyback_delta = m["buyback_delta"]
     cond_spot = (spot_pct is not None) and (abs(spot_pct) >= settings.SPOT_ALERT_PCT)
     cond_bb = (buyback_delta is not None) and (
         abs(buyback_delta) >= settings.BUYBACK_ALERT_RP
     )
 
     if cond_spot or cond_bb:
-        last_alert = (
-            BroadcastLog.objects.filter(kind=BroadcastLog.KIND_ALERT)
-            .order_by("-sent_at")
-            .first()
-        )
         if can_send(
-            last_alert.sent_at if last_alert else None,
+            last_sent_at(BroadcastLog.KIND_ALERT),
             settings.COOLDOWN_ALERT_MIN,
         ):
-            direction = "naik" if (spot_pct or 0) >= 0 else "turun"
-            note = "Spot bergerak duluan—harga lokal biasanya menyusul bertahap."
-            msg = "\n".join(
-                [
-                    f"🚨 [ALERT EMAS] {direction} cepat",
-                    "",
-                    f"- XAU/USD: {fmt_num_us(snap.xauusd)} ({spot_icon_show} "
-                    f"{fmt_pct(spot_pct)} sejak update terakhir)",
-                    f"- Est. Spot Rp/gram: {fmt_rp(snap.spot_idr_gr)}",
-                    f"- Buyback LM: {fmt_rp(snap.buyback)}"
-                    + (
-                        f" ({bb_icon_show} {fmt_rp(buyback_delta)})"
-                        if buyback_delta is not None
-                        else ""
-                    ),
-                    "",
-                    f"Catatan: {note}",
-                    "",
-                    f"Sumber: {snap.spot_source} / GoldAPI, Logam Mulia.",
-                ],
-            )
+            msg = alert_message(snap, m, locale)
             send_telegram(
                 settings.TELEGRAM_BOT_TOKEN,
                 settings.TELEGRAM_CHANNEL_ID,
                 msg,
                 dry_run=settings.DRY_RUN,
             )
-            BroadcastLog.objects.create(kind=BroadcastLog.KIND_ALERT, message=msg)
+            record_broadcast(BroadcastLog.KIND_ALERT, msg)
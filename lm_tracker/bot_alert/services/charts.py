@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import io
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+from PIL import Image
+from PIL import ImageDraw
+from PIL import ImageFont
+
+from lm_tracker.bot_alert.services.state import last_snapshot
+from lm_tracker.bot_alert.services.timeseries import PricePoint
+from lm_tracker.bot_alert.services.timeseries import price_series
+
+CHART_RANGES = {
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "1y": timedelta(days=365),
+}
+SERIES_LABELS = {
+    "buyback": "Buyback Logam Mulia (Rp/gr)",
+    "antam_1g_base": "Antam 1gr Harga Dasar (Rp)",
+    "xauusd": "XAU/USD",
+}
+CHART_TTL = 60 * 60 * 24
+KEY_CHART = "bot_alert:chart:{range_key}:{field}:{snap_id}"
+
+WIDTH = 900
+HEIGHT = 450
+PAD_LEFT = 110
+PAD_RIGHT = 20
+PAD_TOP = 40
+PAD_BOTTOM = 40
+GRID_LINES = 4
+
+BG = (255, 255, 255)
+GRID = (225, 225, 225)
+BAND = (250, 225, 160)
+LINE = (190, 130, 0)
+TEXT = (40, 40, 40)
+
+
+def _fmt_axis(n: float) -> str:
+    return f"{round(n):,}".replace(",", ".")
+
+
+def render_price_chart(points: list[PricePoint], title: str) -> bytes:
+    """Render seri harga (close + band high/low) jadi PNG."""
+    img = Image.new("RGB", (WIDTH, HEIGHT), BG)
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default()
+    draw.text((PAD_LEFT, 12), title, fill=TEXT, font=font)
+
+    if not points:
+        draw.text((WIDTH // 2, HEIGHT // 2), "Belum ada data", fill=TEXT, font=font)
+        return _to_png(img)
+
+    lo = min(p.low for p in points)
+    hi = max(p.high for p in points)
+    if hi == lo:
+        hi, lo = hi + 1, lo - 1
+
+    plot_w = WIDTH - PAD_LEFT - PAD_RIGHT
+    plot_h = HEIGHT - PAD_TOP - PAD_BOTTOM
+    step = plot_w / max(len(points) - 1, 1)
+
+    def y_of(v: float) -> float:
+        return PAD_TOP + (hi - v) / (hi - lo) * plot_h
+
+    for i in range(GRID_LINES + 1):
+        v = lo + (hi - lo) * i / GRID_LINES
+        y = y_of(v)
+        draw.line([(PAD_LEFT, y), (WIDTH - PAD_RIGHT, y)], fill=GRID)
+        draw.text((8, y - 6), _fmt_axis(v), fill=TEXT, font=font)
+
+    # band high/low (hanya kelihatan kalau data rollup)
+    upper = [(PAD_LEFT + i * step, y_of(p.high)) for i, p in enumerate(points)]
+    lower = [(PAD_LEFT + i * step, y_of(p.low)) for i, p in enumerate(points)]
+    if len(points) > 1:
+        draw.polygon(upper + lower[::-1], fill=BAND)
+        closes = [(PAD_LEFT + i * step, y_of(p.close)) for i, p in enumerate(points)]
+        draw.line(closes, fill=LINE, width=2)
+
+    first = timezone.localtime(points[0].ts).strftime("%d %b %Y")
+    last = timezone.localtime(points[-1].ts).strftime("%d %b %Y")
+    draw.text((PAD_LEFT, HEIGHT - PAD_BOTTOM + 10), first, fill=TEXT, font=font)
+    last_w = draw.textlength(last, font=font)
+    draw.text(
+        (WIDTH - PAD_RIGHT - last_w, HEIGHT - PAD_BOTTOM + 10),
+        last,
+        fill=TEXT,
+        font=font,
+    )
+    return _to_png(img)
+
+
+def _to_png(img: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def get_chart_png(range_key: str, field: str = "buyback") -> bytes:
+    """
+    PNG chart untuk range (7d/30d/1y) dari data rollup.
+    Di-cache per (range, snapshot terakhir), jadi chart populer cukup
+    dirender sekali sampai ada snapshot baru.
+    """
+    if range_key not in CHART_RANGES:
+        msg = f"Range chart tidak dikenal: {range_key}"
+        raise ValueError(msg)
+
+    snap = last_snapshot()
+    key = KEY_CHART.format(
+        range_key=range_key,
+        field=field,
+        snap_id=snap.id if snap else 0,
+    )
+    png = cache.get(key)
+    if png is not None:
+        return png
+
+    end = timezone.now()
+    _, points = price_series(end - CHART_RANGES[range_key], end, field)
+    title = f"{SERIES_LABELS.get(field, field)} - {range_key}"
+    png = render_price_chart(points, title)
+    cache.set(key, png, CHART_TTL)
+    return png
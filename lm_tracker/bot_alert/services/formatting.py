@@ -0,0 +1,147 @@
+"""
+Format angka + template pesan bot / broadcast, bahasa Indonesia dan Inggris.
+
+Satu tempat untuk format yang dulu terduplikasi di telegram_app, search dan
+broadcast:
+
+           id              en
+  rp     Rp 1.234.567    Rp 1,234,567
+  gr     1,5             1.5
+  pct    +0,25%          +0.25%
+  quote  2,345.67        2,345.67   (kurs XAU/USD, USD/IDR: notasi pasar)
+
+MessageTemplate memakai sintaks "{nama:spec}" (spec = nama formatter di
+FORMATTERS, atau "t" untuk frasa per bahasa). Source di-parse sekali saat
+template dibuat (level modul), jadi render hanya memanggil formatter per
+field lalu join potongan teks: tidak ada parse string format per pesan.
+Nilai None tampil "-". Benchmark: manage.py bench_message_render.
+
+Pembulatan Rupiah: fmt_int / fmt_rp (balasan bot) memotong desimal seperti
+format bot sebelumnya; spec "rp" di template broadcast membulatkan (round)
+seperti format broadcast sebelumnya.
+"""
+
+from __future__ import annotations
+
+from string import Formatter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+DEFAULT_LOCALE = "id"
+LOCALES = ("id", "en")
+
+# f"{n:,}" selalu "," ribuan + "." desimal; bahasa lain ditukar via translate
+_SEPARATORS = {
+    "id": str.maketrans(",.", ".,"),
+    "en": None,
+}
+
+
+def _localize(s: str, locale: str) -> str:
+    table = _SEPARATORS[locale]
+    return s.translate(table) if table else s
+
+
+def fmt_int(n, locale: str = DEFAULT_LOCALE) -> str:
+    # potong desimal (Rp 1.234,9/gr -> 1.234)
+    return _localize(f"{int(n):,}", locale)
+
+
+def fmt_rp(n, locale: str = DEFAULT_LOCALE) -> str:
+    return "Rp " + fmt_int(n, locale)
+
+
+def _fmt_rp_rounded(n, locale: str) -> str:
+    return "Rp " + _localize(f"{round(n):,}", locale)
+
+
+def fmt_gr(d, locale: str = DEFAULT_LOCALE) -> str:
+    # 1 desimal, hapus trailing nol; tanpa pemisah ribuan
+    s = f"{d:.1f}".rstrip("0").rstrip(".")
+    return _localize(s, locale)
+
+
+def fmt_num(n, d: int = 2, locale: str = DEFAULT_LOCALE) -> str:
+    return _localize(f"{n:,.{d}f}", locale)
+
+
+def fmt_quote(n, locale: str = DEFAULT_LOCALE) -> str:
+    # kuotasi pasar tetap notasi US di semua bahasa
+    return f"{n:,.2f}"
+
+
+def fmt_pct(p, locale: str = DEFAULT_LOCALE) -> str:
+    if p is None:
+        return "-"
+    sign = "+" if p >= 0 else ""
+    return sign + _localize(f"{p:.2f}", locale) + "%"
+
+
+def _fmt_str(value, locale: str) -> str:
+    return str(value)
+
+
+FORMATTERS: dict[str, Callable[[object, str], str]] = {
+    "": _fmt_str,
+    "int": fmt_int,
+    "rp": _fmt_rp_rounded,
+    "gr": fmt_gr,
+    "pct": fmt_pct,
+    "quote": fmt_quote,
+}
+
+_PARSER = Formatter()
+
+
+class MessageTemplate:
+    """Template pesan per bahasa, di-parse sekali saat dibuat."""
+
+    def __init__(
+        self,
+        sources: dict[str, str],
+        phrases: dict[str, dict[str, str]] | None = None,
+    ):
+        self.sources = sources
+        self.phrases = phrases or {}
+        self._compiled = {
+            locale: self._compile(source, locale) for locale, source in sources.items()
+        }
+
+    def _compile(self, source: str, locale: str) -> list[tuple]:
+        parts = []
+        for literal, name, spec, conversion in _PARSER.parse(source):
+            if name is None:
+                parts.append((literal, None, None))
+                continue
+            if conversion or not name.isidentifier():
+                msg = f"Field template tidak didukung: {{{name}}}"
+                raise ValueError(msg)
+            if spec == "t":
+                phrases = self.phrases.get(locale, {})
+                parts.append((literal, name, phrases.__getitem__))
+            elif spec in FORMATTERS:
+                fn = FORMATTERS[spec]
+                parts.append((literal, name, lambda v, fn=fn: fn(v, locale)))
+            else:
+                msg = f"Format template tidak dikenal: {spec!r}"
+                raise ValueError(msg)
+        return parts
+
+    def render(self, locale: str = DEFAULT_LOCALE, /, **values) -> str:
+        try:
+            parts = self._compiled[locale]
+        except KeyError:
+            parts = self._compiled[DEFAULT_LOCALE]
+        out = []
+        for literal, name, fmt in parts:
+            out.append(literal)
+            if name is not None:
+                value = values[name]
+                out.append("-" if value is None else fmt(value))
+        return "".join(out)
+
+    def render_many(self, locales: Iterable[str], /, **values) -> dict[str, str]:
+        return {locale: self.render(locale, **values) for locale in locales}
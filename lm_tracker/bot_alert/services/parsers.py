@@ -0,0 +1,200 @@
+"""
+Parser tabel harga "Emas Batangan" dari halaman harga-emas-hari-ini.
+
+parse_antam_table() = parser cepat: tokenizer html.parser (stdlib) yang mulai
+dari <table> terdekat sebelum judul section dan berhenti begitu section
+selesai, tanpa membangun DOM. parse_antam_table_soup() = cara lama (walk
+BeautifulSoup), disimpan sebagai fallback & pembanding di benchmark.
+
+Parser halaman buyback & deteksi Cloudflare challenge juga di sini supaya
+bisa diuji/di-benchmark offline dari rekaman HTML (lihat replay.py).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+ANTAM_TH_TITLE = "Emas Batangan"
+THREE_LEN = 3
+
+WEIGHT_RE = re.compile(r"(\d+(?:[.,]\d+)?)\s*(kg|gr|gram|g)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class AntamPrice:
+    weight_gram: Decimal
+    label: str
+    base: int
+    pph: int
+
+
+def rupiah_to_int(s: str) -> int:
+    digits = re.sub(r"[^\d]", "", s)
+    return int(digits) if digits else 0
+
+
+def parse_weight(label: str) -> Decimal | None:
+    m = WEIGHT_RE.search(label)
+    if not m:
+        return None
+    w = Decimal(m.group(1).replace(",", "."))
+    if m.group(2).lower() == "kg":
+        w *= 1000
+    return w
+
+
+def _row_to_price(cells: list[str]) -> AntamPrice | None:
+    if len(cells) < THREE_LEN:
+        return None
+    weight = parse_weight(cells[0])
+    base = rupiah_to_int(cells[1])
+    pph = rupiah_to_int(cells[2])
+    if weight is None or not base or not pph:
+        return None
+    return AntamPrice(weight_gram=weight, label=cells[0], base=base, pph=pph)
+
+
+class _StopParsing(Exception):  # noqa: N818
+    pass
+
+
+class _AntamTableParser(HTMLParser):
+    def __init__(self, title: str):
+        super().__init__(convert_charrefs=True)
+        self.title = title
+        self.in_section = False
+        self.rows: list[AntamPrice] = []
+        self._cell: list[str] | None = None
+        self._row_cells: list[str] = []
+        self._title_row = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row_cells = []
+            self._title_row = False
+        elif tag in ("td", "th"):
+            self._cell = []
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            text = " ".join("".join(self._cell).split())
+            self._cell = None
+            if tag == "th":
+                self._on_th(text)
+            else:
+                self._row_cells.append(text)
+        elif tag == "tr" and self.in_section:
+            price = _row_to_price(self._row_cells)
+            if price is not None:
+                self.rows.append(price)
+
+    def _on_th(self, text: str):
+        if text == self.title:
+            self.in_section = True
+            self._title_row = True
+        elif self.in_section and text and not self._title_row:
+            # header section lain (mis. "Emas Batangan Gift Series") -> selesai
+            raise _StopParsing
+
+
+def _section_start(html: str, title: str) -> int:
+    # posisi <table> terdekat sebelum <th>judul</th>; teks judul juga bisa muncul
+    # di overlay/menu, jadi cari yang memang di dalam <th> dulu
+    m = re.search(rf"<th[^>]*>\s*{re.escape(title)}\s*<", html, re.IGNORECASE)
+    idx = m.start() if m else html.find(title)
+    if idx < 0:
+        msg = f"<th>{title}</th> tidak ditemukan"
+        raise RuntimeError(msg)
+    return max(html.rfind("<table", 0, idx), 0)
+
+
+def parse_antam_table(html: str, title: str = ANTAM_TH_TITLE) -> list[AntamPrice]:
+    """Semua baris berat/harga di section "Emas Batangan", urut sesuai halaman."""
+    # mulai dari <table> section; tidak perlu tokenize <head>/script/menu
+    start = _section_start(html, title)
+
+    parser = _AntamTableParser(title)
+    with contextlib.suppress(_StopParsing):
+        parser.feed(html[start:])
+    if not parser.in_section:
+        msg = f"<th>{title}</th> tidak ditemukan"
+        raise RuntimeError(msg)
+    return parser.rows
+
+
+def parse_antam_table_soup(
+    html: str,
+    title: str = ANTAM_TH_TITLE,
+) -> list[AntamPrice]:
+    soup = BeautifulSoup(html, "html.parser")
+
+    # OPTIONAL: buang swal overlay kalau ada (tidak wajib)
+    for sel in [".swal-overlay", ".swal-modal", ".swal-overlay--show-modal"]:
+        for node in soup.select(sel):
+            node.decompose()
+
+    # cari <th> yang text-nya "Emas Batangan"
+    th = soup.find("th", string=lambda x: x and x.strip() == title)
+    if not th:
+        msg = f"<th>{title}</th> tidak ditemukan"
+        raise RuntimeError(msg)
+
+    table = th.find_parent("table")
+    if not table:
+        msg = "Table parent dari <th> tidak ditemukan"
+        raise RuntimeError(msg)
+
+    header_tr = th.find_parent("tr")
+
+    # iterasi row setelah header "Emas Batangan"
+    rows = []
+    for tr in header_tr.find_all_next("tr"):
+        # stop kalau ketemu header section lain (tr yang punya <th>)
+        th2 = tr.find("th")
+        if th2 and th2.get_text(strip=True) != title:
+            break
+
+        cells = [td.get_text(" ", strip=True) for td in tr.find_all("td")]
+        price = _row_to_price(cells)
+        if price is not None:
+            rows.append(price)
+    return rows
+
+
+def is_cf_challenge(html: str) -> bool:
+    return (
+        ("Just a moment" in html)
+        or ("_cf_chl_opt" in html)
+        or ("/cdn-cgi/challenge-platform" in html)
+    )
+
+
+def parse_buyback(html: str) -> tuple[int, str | None]:
+    text = BeautifulSoup(html, "html.parser").get_text("\n", strip=True)
+
+    m_price = re.search(r"Harga\s*Buyback\s*:\s*Rp\s*([\d\.\,]+)", text, re.IGNORECASE)
+    if not m_price:
+        msg = "Gagal parse buyback"
+        raise RuntimeError(msg)
+
+    buyback = rupiah_to_int(m_price.group(1))
+    m_ts = re.search(r"Perubahan\s*Terakhir\s*:\s*(.+)", text, re.IGNORECASE)
+    ts = m_ts.group(1).strip() if m_ts else None
+    return buyback, ts
+
+
+def find_weight(rows: list[AntamPrice], weight_gram: Decimal) -> AntamPrice | None:
+    for row in rows:
+        if row.weight_gram == weight_gram:
+            return row
+    return None
@@ -1,10 +1,19 @@
-import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
 import cloudscraper
 import requests
-from bs4 import BeautifulSoup
+from django.conf import settings
 from twelvedata import TDClient
 
+from lm_tracker.bot_alert.services.parsers import AntamPrice
+from lm_tracker.bot_alert.services.parsers import find_weight
+from lm_tracker.bot_alert.services.parsers import is_cf_challenge
+from lm_tracker.bot_alert.services.parsers import parse_antam_table
+from lm_tracker.bot_alert.services.parsers import parse_antam_table_soup
+from lm_tracker.bot_alert.services.parsers import parse_buyback
+
 PRICE_URL = "https://www.logammulia.com/harga-emas-hari-ini"
 PRICE_URLS = [
     "https://www.logammulia.com/harga-emas-hari-ini",
@@ -15,15 +24,29 @@ BUYBACK_URL = "https://www.logammulia.com/id/sell/gold"
 BUYBACK_URLS = [
     "https://www.logammulia.com/id/sell/gold",
 ]
-THREE_LEN = 3
+BUYBACK_SILVER_URL = "https://www.logammulia.com/id/sell/silver"
+
+logger = logging.getLogger(__name__)
+
+
+def create_scraper():
+    # satu session dipakai bareng semua fetch dalam satu run,
+    # supaya cookie clearance Cloudflare cukup didapat sekali
+    scraper = cloudscraper.create_scraper(interpreter="nodejs")
+    if settings.PRICE_FIXTURE_DIR:
+        # mode offline: halaman Logam Mulia dilayani dari rekaman HTML
+        from lm_tracker.bot_alert.services.replay import mount_replay  # noqa: PLC0415
+
+        mount_replay(scraper, settings.PRICE_FIXTURE_DIR)
+    return scraper
 
 
-def is_cf_challenge(html: str) -> bool:
-    return (
-        ("Just a moment" in html)
-        or ("_cf_chl_opt" in html)
-        or ("/cdn-cgi/challenge-platform" in html)
-    )
+def _get_html(scraper, url: str) -> str:
+    html = scraper.get(url).text
+    if is_cf_challenge(html):
+        msg = f"Kena Cloudflare challenge: {url}"
+        raise RuntimeError(msg)
+    return html
 
 
 def td_latest_close(api_key: str, symbol: str, interval="1min") -> float:
@@ -54,6 +77,13 @@ def goldapi_xauusd(api_key: str, symbol: str, curr: str) -> float:
     return float(r.json()["price"])
 
 
+def get_spot_silver(td_key: str, silver_key: str) -> tuple[float, str]:
+    try:
+        return td_latest_close(td_key, "XAG/USD"), "TwelveData"
+    except RuntimeError:
+        return goldapi_xauusd(silver_key, "XAG", "USD"), "GoldAPI"
+
+
 def get_spot_world(td_key: str, gold_key: str):
     try:
         xauusd = td_latest_close(td_key, "XAU/USD")
@@ -70,69 +100,99 @@ def calc_spot_idr_per_gram(xauusd: float, usdidr: float) -> float:
     return (xauusd * usdidr) / 31.1034768
 
 
-def rupiah_to_int(s: str) -> int:
-    digits = re.sub(r"[^\d]", "", s)
-    return int(digits) if digits else 0
-
-
-def fetch_antam_1g_prices():
-    th_title = "Emas Batangan"
-    scraper = cloudscraper.create_scraper(interpreter="nodejs")
-    html = scraper.get(PRICE_URL).text
-    soup = BeautifulSoup(html, "html.parser")
-
-    # OPTIONAL: buang swal overlay kalau ada (tidak wajib)
-    for sel in [".swal-overlay", ".swal-modal", ".swal-overlay--show-modal"]:
-        for node in soup.select(sel):
-            node.decompose()
-
-    # cari <th> yang text-nya "Emas Batangan"
-    th = soup.find("th", string=lambda x: x and x.strip() == th_title)
-    if not th:
-        msg = f"<th>{th_title}</th> tidak ditemukan"
+def fetch_antam_prices(scraper=None) -> list[AntamPrice]:
+    """Tabel lengkap Emas Batangan (0.5 gr - 1 kg) dari halaman harga."""
+    scraper = scraper or create_scraper()
+    html = _get_html(scraper, PRICE_URL)
+    try:
+        rows = parse_antam_table(html)
+    except RuntimeError:
+        rows = []
+    if not rows:
+        # fallback ke walk BeautifulSoup kalau layout tidak terbaca parser cepat
+        rows = parse_antam_table_soup(html)
+    if not rows:
+        msg = "Gagal parse tabel Emas Batangan"
         raise RuntimeError(msg)
+    return rows
 
-    table = th.find_parent("table")
-    if not table:
-        msg = "Table parent dari <th> tidak ditemukan"
-        raise RuntimeError(msg)
 
-    header_tr = th.find_parent("tr")
+def antam_1g_from_table(rows: list[AntamPrice]) -> tuple[int, int]:
+    row = find_weight(rows, Decimal(1))
+    if row is None:
+        msg = "Gagal parse Antam 1gr"
+        raise RuntimeError(msg)
+    return row.base, row.pph
 
-    # iterasi row setelah header "Emas Batangan"
-    for tr in header_tr.find_all_next("tr"):
-        # stop kalau ketemu header section lain (tr yang punya <th>)
-        th2 = tr.find("th")
-        if th2 and th2.get_text(strip=True) != th_title:
-            break
 
-        tds = tr.find_all("td")
-        if len(tds) < THREE_LEN:
-            continue
+def fetch_antam_1g_prices(scraper=None):
+    return antam_1g_from_table(fetch_antam_prices(scraper))
 
-        cells = [td.get_text(" ", strip=True) for td in tds]
-        berat = cells[0].lower()
-        if berat == "1 gr":
-            base = rupiah_to_int(cells[1])
-            pph = rupiah_to_int(cells[2])
-            if base and pph:
-                return base, pph
 
-    msg = "Gagal parse Antam 1gr"
-    raise RuntimeError(msg)
+def fetch_buyback(url: str = BUYBACK_URL, scraper=None):
+    scraper = scraper or create_scraper()
+    return parse_buyback(_get_html(scraper, url))
 
 
-def fetch_buyback():
-    scraper = cloudscraper.create_scraper(interpreter="nodejs")
-    html = scraper.get(BUYBACK_URL).text
-    text = BeautifulSoup(html, "html.parser").get_text("\n", strip=True)
+def _silver_spot(td_key: str, gold_key: str) -> float | None:
+    try:
+        xagusd, _ = get_spot_silver(td_key, gold_key)
+    except (RuntimeError, requests.RequestException) as err:
+        logger.warning("Gagal ambil spot perak: %s", err)
+        return None
+    return xagusd
 
-    m_price = re.search(r"Harga\s*Buyback\s*:\s*Rp\s*([\d\.\,]+)", text, re.IGNORECASE)
-    if not m_price:
-        msg = "Gagal parse buyback"
-        raise RuntimeError(msg)
 
-    buyback = rupiah_to_int(m_price.group(1))
-    m_ts = re.search(r"Perubahan\s*Terakhir\s*:\s*(.+)", text, re.IGNORECASE)
-    ts = m_ts.group(1).strip() if m_ts else None
-    return buyback, ts
+def _silver_buyback(scraper) -> tuple | None:
+    try:
+        return fetch_buyback(BUYBACK_SILVER_URL, scraper)
+    except (RuntimeError, requests.RequestException) as err:
+        logger.warning("Gagal ambil buyback perak: %s", err)
+        return None
+
+
+def fetch_all_prices(td_key: str, gold_key: str) -> dict:
+    """
+    Ambil semua harga (emas + perak) dalam satu run. Return dict field
+    PriceSnapshot + "antam_table" (list AntamPrice semua berat).
+    API spot (TwelveData / GoldAPI) jalan paralel di thread pool; halaman
+    Logam Mulia diambil berurutan di thread ini dengan satu session scraper
+    (requests.Session tidak thread-safe, cookie clearance Cloudflare cukup
+    didapat sekali). Kegagalan sumber perak tidak menggagalkan snapshot emas.
+    """
+    scraper = create_scraper()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        f_spot = pool.submit(get_spot_world, td_key, gold_key)
+        f_silver = pool.submit(_silver_spot, td_key, gold_key)
+
+        antam_table = fetch_antam_prices(scraper)
+        antam_base, antam_pph = antam_1g_from_table(antam_table)
+        buyback, buyback_ts = fetch_buyback(BUYBACK_URL, scraper)
+        silver_buyback = _silver_buyback(scraper)
+
+        xauusd, usdidr, spot_source = f_spot.result()
+        xagusd = f_silver.result()
+
+    silver = {}
+    if xagusd is not None and silver_buyback is not None:
+        silver = {
+            "xagusd": xagusd,
+            "silver_buyback": silver_buyback[0],
+            "silver_buyback_ts": silver_buyback[1] or "",
+        }
+
+    data = {
+        "xauusd": xauusd,
+        "usdidr": usdidr,
+        "spot_idr_gr": calc_spot_idr_per_gram(xauusd, usdidr),
+        "antam_1g_base": antam_base,
+        "antam_1g_pph": antam_pph,
+        "buyback": buyback,
+        "buyback_ts": buyback_ts,
+        "spot_source": spot_source,
+        "antam_table": antam_table,
+    }
+    if silver:
+        data.update(silver)
+        data["silver_spot_idr_gr"] = calc_spot_idr_per_gram(silver["xagusd"], usdidr)
+    return data
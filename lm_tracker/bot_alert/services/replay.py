@@ -0,0 +1,113 @@
+"""
+Transport replay untuk halaman Logam Mulia dari rekaman HTML (offline).
+
+Folder fixture berisi manifest.json:
+  {"pages": [{"name", "file", "url", "kind", "default", "status", "expect"}]}
+
+FixtureReplayAdapter dipasang (mount) ke session scraper, jadi
+fetch_antam_prices / fetch_buyback berjalan persis seperti production
+tanpa akses ke logammulia.com. Satu URL boleh punya beberapa rekaman
+(varian layout / Cloudflare challenge); yang dipakai adalah "default",
+atau pilih varian lewat argumen `pages`.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter
+
+LOGAMMULIA_PREFIX = "https://www.logammulia.com/"
+
+
+@dataclass
+class FixturePage:
+    name: str
+    file: Path
+    url: str
+    kind: str
+    default: bool = False
+    status: int = 200
+    expect: dict = field(default_factory=dict)
+
+    def read(self) -> str:
+        return self.file.read_text(encoding="utf-8")
+
+
+def load_manifest(fixture_dir: str | Path) -> list[FixturePage]:
+    fixture_dir = Path(fixture_dir)
+    data = json.loads((fixture_dir / "manifest.json").read_text(encoding="utf-8"))
+    return [
+        FixturePage(
+            name=p["name"],
+            file=fixture_dir / p["file"],
+            url=p["url"],
+            kind=p["kind"],
+            default=p.get("default", False),
+            status=p.get("status", 200),
+            expect=p.get("expect", {}),
+        )
+        for p in data["pages"]
+    ]
+
+
+class FixtureReplayAdapter(BaseAdapter):
+    def __init__(
+        self,
+        pages: list[FixturePage],
+        latency_ms: float = 0,
+    ):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.routes: dict[str, FixturePage] = {}
+        for page in pages:
+            if page.default or page.url not in self.routes:
+                self.routes[page.url] = page
+        self._cache: dict[str, bytes] = {}
+
+    def use(self, page: FixturePage) -> None:
+        """Arahkan URL halaman ini ke rekaman `page` (pilih varian)."""
+        self.routes[page.url] = page
+
+    def send(self, request, **kwargs):
+        resp = requests.Response()
+        resp.request = request
+        resp.url = request.url
+        resp.encoding = "utf-8"
+        resp.headers["Content-Type"] = "text/html; charset=utf-8"
+
+        page = self.routes.get(request.url)
+        if page is None:
+            resp.status_code = 404
+            resp._content = b""  # noqa: SLF001
+            return resp
+
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        body = self._cache.get(page.name)
+        if body is None:
+            body = page.file.read_bytes()
+            self._cache[page.name] = body
+        # status 200 & tanpa header "Server: cloudflare": cloudscraper tidak
+        # mencoba solve challenge, deteksi diserahkan ke is_cf_challenge()
+        resp.status_code = page.status
+        resp._content = body  # noqa: SLF001
+        return resp
+
+    def close(self):
+        self._cache.clear()
+
+
+def mount_replay(
+    session: requests.Session,
+    fixture_dir: str | Path,
+    latency_ms: float = 0,
+) -> FixtureReplayAdapter:
+    adapter = FixtureReplayAdapter(load_manifest(fixture_dir), latency_ms=latency_ms)
+    session.mount(LOGAMMULIA_PREFIX, adapter)
+    return adapter
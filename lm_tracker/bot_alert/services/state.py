@@ -0,0 +1,106 @@
+"""
+State kecil untuk run_broadcast: snapshot terakhir + waktu update/alert terakhir.
+
+Disimpan di cache (Redis di production) dan ditulis ulang setiap kali
+PriceSnapshot / BroadcastLog dibuat, jadi satu run broadcast normalnya cukup
+1x insert tanpa query baca. Kalau cache kosong (cold start / Redis flush),
+fallback ke DB lalu cache diisi lagi.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+
+from lm_tracker.bot_alert.models import BroadcastLog
+from lm_tracker.bot_alert.models import PriceSnapshot
+
+KEY_LAST_SNAPSHOT = "bot_alert:last_snapshot"
+KEY_LAST_LOG = "bot_alert:last_log:{kind}"
+STATE_TTL = 60 * 60 * 24 * 7
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "ts",
+    "xauusd",
+    "usdidr",
+    "spot_idr_gr",
+    "antam_1g_base",
+    "antam_1g_pph",
+    "buyback",
+    "buyback_ts",
+    "xagusd",
+    "silver_spot_idr_gr",
+    "silver_buyback",
+    "silver_buyback_ts",
+    "spot_source",
+    "local_source",
+)
+
+
+def _snapshot_to_dict(snap: PriceSnapshot) -> dict:
+    return {f: getattr(snap, f) for f in SNAPSHOT_FIELDS}
+
+
+def _log_to_dict(log: BroadcastLog) -> dict:
+    return {"sent_at": log.sent_at, "slot_key": log.slot_key}
+
+
+def remember_snapshot(snap: PriceSnapshot) -> None:
+    # tulis cache setelah commit supaya cache tidak mendahului DB
+    data = _snapshot_to_dict(snap)
+    transaction.on_commit(lambda: cache.set(KEY_LAST_SNAPSHOT, data, STATE_TTL))
+
+
+def last_snapshot() -> PriceSnapshot | None:
+    """
+    Snapshot terbaru. Dari cache kalau ada (instance tidak di-fetch dari DB,
+    cukup untuk dibaca); fallback query DB.
+    """
+    data = cache.get(KEY_LAST_SNAPSHOT)
+    if data is not None:
+        return PriceSnapshot(**data)
+
+    snap = PriceSnapshot.objects.order_by("-ts").first()
+    if snap is not None:
+        cache.set(KEY_LAST_SNAPSHOT, _snapshot_to_dict(snap), STATE_TTL)
+    return snap
+
+
+def _last_log(kind: str) -> dict | None:
+    key = KEY_LAST_LOG.format(kind=kind)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    log = BroadcastLog.objects.filter(kind=kind).order_by("-sent_at").first()
+    if log is None:
+        return None
+    data = _log_to_dict(log)
+    cache.set(key, data, STATE_TTL)
+    return data
+
+
+def last_sent_at(kind: str) -> datetime | None:
+    data = _last_log(kind)
+    return data["sent_at"] if data else None
+
+
+def slot_already_sent(slot_key: str) -> bool:
+    # slot_key berurutan waktu, jadi kalau slot ini sudah terkirim
+    # pasti dia UPDATE paling akhir
+    data = _last_log(BroadcastLog.KIND_UPDATE)
+    return bool(data and data["slot_key"] == slot_key)
+
+
+def record_broadcast(kind: str, message: str, slot_key: str = "") -> BroadcastLog:
+    log = BroadcastLog.objects.create(kind=kind, slot_key=slot_key, message=message)
+    data = _log_to_dict(log)
+    key = KEY_LAST_LOG.format(kind=kind)
+    transaction.on_commit(lambda: cache.set(key, data, STATE_TTL))
+    return log
@@ -1,12 +1,92 @@
+import logging
+import threading
+import time
+
 import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# batas kirim Telegram Bot API: ~30 pesan/detik total
+BATCH_PER_SECOND = 25
+MAX_RETRY_AFTER = 30
+HTTP_TOO_MANY_REQUESTS = 429
+
+_local = threading.local()
+
+
+def api_url(bot_token: str, method: str) -> str:
+    return f"{settings.TELEGRAM_API_BASE_URL}/bot{bot_token}/{method}"
+
+
+def _session() -> requests.Session:
+    # koneksi keep-alive ke Bot API dipakai ulang antar pesan (per thread)
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
 
 
 def send_telegram(bot_token: str, chat_id: str, text: str, *, dry_run=False):
     if dry_run:
         return
-    r = requests.post(
-        f"https://api.telegram.org/bot{bot_token}/sendMessage",
-        json={"chat_id": chat_id, "text": text, "disable_web_page_preview": True},
-        timeout=25,
+    r = _post_with_retry(
+        _session(),
+        api_url(bot_token, "sendMessage"),
+        {"chat_id": chat_id, "text": text, "disable_web_page_preview": True},
     )
     r.raise_for_status()
+
+
+def _post_with_retry(session: requests.Session, url: str, payload: dict):
+    # satu kali ulang kalau kena rate limit (429 + retry_after)
+    r = session.post(url, json=payload, timeout=25)
+    if r.status_code == HTTP_TOO_MANY_REQUESTS:
+        retry_after = r.json().get("parameters", {}).get("retry_after", 1)
+        time.sleep(min(retry_after, MAX_RETRY_AFTER))
+        r = session.post(url, json=payload, timeout=25)
+    return r
+
+
+def send_telegram_batch(
+    bot_token: str,
+    messages: list[tuple[int | str, str]],
+    *,
+    per_second: int = BATCH_PER_SECOND,
+    dry_run=False,
+) -> list[int | str]:
+    """
+    Kirim banyak pesan [(chat_id, text)] lewat satu session keep-alive,
+    dibatasi `per_second` dan menghormati 429 retry_after. Pesan yang gagal
+    di-log lalu dilewati. Return chat_id yang berhasil terkirim.
+    """
+    if dry_run:
+        return [chat_id for chat_id, _ in messages]
+
+    url = api_url(bot_token, "sendMessage")
+    interval = 1 / per_second
+    sent = []
+    session = _session()
+    for chat_id, text in messages:
+        started = time.monotonic()
+        payload = {
+            "chat_id": chat_id,
+            "text": text,
+            "disable_web_page_preview": True,
+        }
+        try:
+            r = _post_with_retry(session, url, payload)
+        except requests.RequestException as err:
+            logger.warning("send_telegram_batch gagal ke %s: %s", chat_id, err)
+        else:
+            if r.ok:
+                sent.append(chat_id)
+            else:
+                logger.warning(
+                    "send_telegram_batch gagal ke %s: %s %s",
+                    chat_id,
+                    r.status_code,
+                    r.text[:200],
+                )
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+    return sent
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.utils import timezone
+
+from lm_tracker.bot_alert.models import PriceRollup
+from lm_tracker.bot_alert.models import PriceSnapshot
+
+# seri yang disimpan OHLC lengkap di PriceRollup
+OHLC_FIELDS = ("xauusd", "buyback", "antam_1g_base")
+# seri pendukung, cukup close
+CLOSE_FIELDS = ("usdidr", "spot_idr_gr", "antam_1g_pph")
+SERIES_FIELDS = OHLC_FIELDS + CLOSE_FIELDS
+
+# batas span range sebelum pindah ke resolusi yang lebih kasar
+RAW_MAX_SPAN = timedelta(days=2)
+HOURLY_MAX_SPAN = timedelta(days=60)
+
+
+@dataclass
+class PricePoint:
+    ts: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+def hour_start(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def day_start(dt: datetime) -> datetime:
+    # hari dihitung di waktu lokal (Asia/Jakarta), bukan UTC
+    return timezone.localtime(dt).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rollup_update_fields() -> list[str]:
+    fields = ["samples"]
+    for name in OHLC_FIELDS:
+        fields += [f"{name}_open", f"{name}_high", f"{name}_low", f"{name}_close"]
+    fields += [f"{name}_close" for name in CLOSE_FIELDS]
+    return fields
+
+
+def _upsert(rows: list[PriceRollup]) -> int:
+    if not rows:
+        return 0
+    PriceRollup.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["resolution", "bucket"],
+        update_fields=_rollup_update_fields(),
+    )
+    return len(rows)
+
+
+def _last_bucket(resolution: str) -> datetime | None:
+    return (
+        PriceRollup.objects.filter(resolution=resolution)
+        .order_by("-bucket")
+        .values_list("bucket", flat=True)
+        .first()
+    )
+
+
+def rollup_hourly() -> int:
+    """
+    Agregasi snapshot mentah ke candle 1 jam.
+    Bucket terakhir selalu dihitung ulang karena bisa jadi belum lengkap.
+    """
+    start = _last_bucket(PriceRollup.RES_HOUR)
+    qs = PriceSnapshot.objects.order_by("ts")
+    if start is not None:
+        qs = qs.filter(ts__gte=start)
+
+    rows = qs.values_list("ts", *SERIES_FIELDS).iterator(chunk_size=2000)
+    out = []
+    for bucket, group in groupby(rows, key=lambda r: hour_start(r[0])):
+        snaps = list(group)
+        candle = PriceRollup(
+            resolution=PriceRollup.RES_HOUR,
+            bucket=bucket,
+            samples=len(snaps),
+        )
+        for i, name in enumerate(SERIES_FIELDS, start=1):
+            values = [s[i] for s in snaps]
+            setattr(candle, f"{name}_close", values[-1])
+            if name in OHLC_FIELDS:
+                setattr(candle, f"{name}_open", values[0])
+                setattr(candle, f"{name}_high", max(values))
+                setattr(candle, f"{name}_low", min(values))
+        out.append(candle)
+    return _upsert(out)
+
+
+def rollup_daily() -> int:
+    """Agregasi candle 1 jam ke candle harian (hari lokal)."""
+    last = _last_bucket(PriceRollup.RES_DAY)
+    qs = PriceRollup.objects.filter(resolution=PriceRollup.RES_HOUR).order_by("bucket")
+    if last is not None:
+        qs = qs.filter(bucket__gte=last)
+
+    out = []
+    for bucket, group in groupby(qs.iterator(), key=lambda c: day_start(c.bucket)):
+        hours = list(group)
+        candle = PriceRollup(
+            resolution=PriceRollup.RES_DAY,
+            bucket=bucket,
+            samples=sum(h.samples for h in hours),
+        )
+        for name in SERIES_FIELDS:
+            setattr(candle, f"{name}_close", getattr(hours[-1], f"{name}_close"))
+            if name in OHLC_FIELDS:
+                setattr(candle, f"{name}_open", getattr(hours[0], f"{name}_open"))
+                setattr(
+                    candle,
+                    f"{name}_high",
+                    max(getattr(h, f"{name}_high") for h in hours),
+                )
+                setattr(
+                    candle,
+                    f"{name}_low",
+                    min(getattr(h, f"{name}_low") for h in hours),
+                )
+        out.append(candle)
+    return _upsert(out)
+
+
+def prune_raw_snapshots() -> int:
+    """
+    Hapus snapshot mentah yang lewat retensi DAN sudah ter-rollup.
+    Snapshot di jam yang belum di-rollup tidak pernah dihapus.
+    """
+    rolled_until = _last_bucket(PriceRollup.RES_HOUR)
+    if rolled_until is None:
+        return 0
+    cutoff = timezone.now() - timedelta(days=settings.PRICE_RAW_RETENTION_DAYS)
+    cutoff = min(cutoff, rolled_until)
+    deleted, _ = PriceSnapshot.objects.filter(ts__lt=cutoff).delete()
+    return deleted
+
+
+def prune_hourly_rollups() -> int:
+    rolled_until = _last_bucket(PriceRollup.RES_DAY)
+    if rolled_until is None:
+        return 0
+    cutoff = timezone.now() - timedelta(days=settings.PRICE_HOURLY_RETENTION_DAYS)
+    cutoff = min(cutoff, rolled_until)
+    deleted, _ = PriceRollup.objects.filter(
+        resolution=PriceRollup.RES_HOUR,
+        bucket__lt=cutoff,
+    ).delete()
+    return deleted
+
+
+def run_rollup() -> dict:
+    return {
+        "hourly": rollup_hourly(),
+        "daily": rollup_daily(),
+        "pruned_raw": prune_raw_snapshots(),
+        "pruned_hourly": prune_hourly_rollups(),
+    }
+
+
+def pick_resolution(start: datetime, end: datetime) -> str | None:
+    """
+    Pilih resolusi untuk range [start, end).
+    None = snapshot mentah. Resolusi halus hanya dipakai kalau datanya
+    masih dalam masa retensi.
+    """
+    now = timezone.now()
+    span = end - start
+    raw_from = now - timedelta(days=settings.PRICE_RAW_RETENTION_DAYS)
+    hourly_from = now - timedelta(days=settings.PRICE_HOURLY_RETENTION_DAYS)
+    if span <= RAW_MAX_SPAN and start >= raw_from:
+        return None
+    if span <= HOURLY_MAX_SPAN and start >= hourly_from:
+        return PriceRollup.RES_HOUR
+    return PriceRollup.RES_DAY
+
+
+def price_series(
+    start: datetime,
+    end: datetime,
+    field: str = "buyback",
+    resolution: str | None = "auto",
+) -> tuple[str | None, list[PricePoint]]:
+    """
+    Ambil seri harga untuk chart. Resolusi dipilih otomatis dari panjang range
+    sehingga chart 1 tahun cukup baca ~365 baris, bukan ~50rb snapshot.
+    Return (resolution, points); resolution None berarti snapshot mentah.
+    """
+    if field not in SERIES_FIELDS:
+        msg = f"Seri harga tidak dikenal: {field}"
+        raise ValueError(msg)
+    if resolution == "auto":
+        resolution = pick_resolution(start, end)
+
+    if resolution is None:
+        rows = (
+            PriceSnapshot.objects.filter(ts__gte=start, ts__lt=end)
+            .order_by("ts")
+            .values_list("ts", field)
+        )
+        return None, [PricePoint(ts, v, v, v, v) for ts, v in rows]
+
+    qs = PriceRollup.objects.filter(
+        resolution=resolution,
+        bucket__gte=start,
+        bucket__lt=end,
+    ).order_by("bucket")
+    if field in OHLC_FIELDS:
+        cols = [f"{field}_open", f"{field}_high", f"{field}_low", f"{field}_close"]
+        return resolution, [PricePoint(*row) for row in qs.values_list("bucket", *cols)]
+    rows = qs.values_list("bucket", f"{field}_close")
+    return resolution, [PricePoint(ts, v, v, v, v) for ts, v in rows]
@@ -0,0 +1,124 @@
+"""
+Valuasi per ukuran batangan dari tabel harga Antam satu snapshot.
+
+Tabel per snapshot (berat -> harga per gram) dibangun sekali lalu di-cache,
+tanpa query per lot. Lot dinilai sebagai array NumPy: np.interp sekali untuk
+semua berat. Ukuran yang tidak ada di tabel (mis. 8 gr, 20 gr) diinterpolasi
+linear dari harga per gram ukuran terdekat; di luar rentang tabel dipakai
+ukuran terdekat.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from django.core.cache import cache
+
+from lm_tracker.bot_alert.models import AntamBarPrice
+from lm_tracker.bot_alert.services.state import last_snapshot
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+    from lm_tracker.bot_alert.models import PriceSnapshot
+
+KEY_PRICE_TABLE = "bot_alert:price_table:{snap_id}"
+PRICE_TABLE_TTL = 60 * 60 * 24
+
+
+@dataclass
+class PriceTable:
+    snapshot_id: int
+    # berat (gram) urut naik + harga retail (harga dasar) per gram
+    weights: list[float]
+    retail_per_gram: list[float]
+    # buyback Logam Mulia per gram (tidak tergantung ukuran)
+    buyback_per_gram: dict[str, float | None]
+
+    def retail_gram_prices(self, weights: np.ndarray) -> np.ndarray | None:
+        if not self.weights:
+            return None
+        # linear antar ukuran tabel, clamp ke ukuran terdekat di luar rentang
+        return np.interp(weights, self.weights, self.retail_per_gram)
+
+    def retail_gram_price(self, weight: float) -> float | None:
+        prices = self.retail_gram_prices(np.array([weight], dtype=float))
+        return float(prices[0]) if prices is not None else None
+
+    def retail_bar_price(self, weight: float) -> float | None:
+        per_gram = self.retail_gram_price(weight)
+        return per_gram * weight if per_gram is not None else None
+
+
+def build_price_table(snap: PriceSnapshot) -> PriceTable:
+    rows = (
+        AntamBarPrice.objects.filter(snapshot_id=snap.id)
+        .order_by("weight_gram")
+        .values_list("weight_gram", "price_base")
+    )
+    weights, per_gram = [], []
+    for weight, price in rows:
+        w = float(weight)
+        weights.append(w)
+        per_gram.append(price / w)
+    if not weights and snap.antam_1g_base:
+        # snapshot lama tanpa tabel: pakai referensi 1 gr saja
+        weights, per_gram = [1.0], [float(snap.antam_1g_base)]
+    return PriceTable(
+        snapshot_id=snap.id,
+        weights=weights,
+        retail_per_gram=per_gram,
+        buyback_per_gram={"GOLD": snap.buyback, "SILVER": snap.silver_buyback},
+    )
+
+
+def price_table(snap: PriceSnapshot | None = None) -> PriceTable | None:
+    """Tabel harga snapshot terbaru (atau `snap`), di-cache per snapshot id."""
+    snap = snap or last_snapshot()
+    if snap is None:
+        return None
+    key = KEY_PRICE_TABLE.format(snap_id=snap.id)
+    table = cache.get(key)
+    if table is None:
+        table = build_price_table(snap)
+        cache.set(key, table, PRICE_TABLE_TTL)
+    return table
+
+
+def value_lots(
+    lots: list[tuple[str, Decimal, int]],
+    table: PriceTable,
+) -> dict[str, dict]:
+    """
+    Nilai lot terbuka [(asset, berat per keping, jumlah keping)].
+    Return per asset: grams, buyback_value, retail_value.
+    """
+    lots = [
+        (asset, float(weight), pcs)
+        for asset, weight, pcs in lots
+        if weight is not None and pcs > 0
+    ]
+    if not lots:
+        return {}
+    assets = np.array([lot[0] for lot in lots])
+    weights = np.array([lot[1] for lot in lots], dtype=float)
+    grams = weights * np.array([lot[2] for lot in lots], dtype=float)
+    per_gram = table.retail_gram_prices(weights)
+
+    out = {}
+    for asset in dict.fromkeys(lot[0] for lot in lots):
+        mask = assets == asset
+        asset_grams = float(grams[mask].sum())
+        buyback = table.buyback_per_gram.get(asset)
+        retail = 0.0
+        # tabel retail Antam hanya untuk emas batangan
+        if asset == "GOLD" and per_gram is not None:
+            retail = float((per_gram[mask] * grams[mask]).sum())
+        out[asset] = {
+            "grams": asset_grams,
+            "buyback_value": asset_grams * buyback if buyback is not None else 0.0,
+            "retail_value": retail,
+        }
+    return out
@@ -1,8 +1,14 @@
 from celery import shared_task
 
 from lm_tracker.bot_alert.services.broadcast import run_broadcast
+from lm_tracker.bot_alert.services.timeseries import run_rollup
 
 
 @shared_task
 def bot_broadcast_task():
     run_broadcast()
+
+
+@shared_task
+def price_rollup_task():
+    return run_rollup()
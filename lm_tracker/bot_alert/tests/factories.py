@@ -0,0 +1,16 @@
+from factory.django import DjangoModelFactory
+
+from lm_tracker.bot_alert.models import PriceSnapshot
+
+
+class PriceSnapshotFactory(DjangoModelFactory[PriceSnapshot]):
+    xauusd = 2345.67
+    usdidr = 16250.5
+    spot_idr_gr = 1225480.4
+    antam_1g_base = 1450000
+    antam_1g_pph = 1453625
+    buyback = 1302000
+    spot_source = "TwelveData"
+
+    class Meta:
+        model = PriceSnapshot
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+
+from lm_tracker.bot_alert.services.broadcast import alert_message
+from lm_tracker.bot_alert.services.broadcast import price_movement
+from lm_tracker.bot_alert.services.broadcast import update_message
+from lm_tracker.bot_alert.services.formatting import MessageTemplate
+from lm_tracker.bot_alert.services.formatting import fmt_gr
+from lm_tracker.bot_alert.services.formatting import fmt_pct
+from lm_tracker.bot_alert.services.formatting import fmt_quote
+from lm_tracker.bot_alert.services.formatting import fmt_rp
+
+SNAPSHOT = SimpleNamespace(
+    xauusd=2345.67,
+    usdidr=16250.5,
+    spot_idr_gr=1225480.4,
+    antam_1g_base=1450000,
+    antam_1g_pph=1453625,
+    buyback=1302000,
+    buyback_ts="",
+    spot_source="TwelveData",
+    xagusd=None,
+)
+PREVIOUS = SimpleNamespace(xauusd=2360.1, usdidr=16210.0, buyback=1310000, xagusd=None)
+
+
+@pytest.mark.parametrize(
+    ("fn", "value", "expected_id", "expected_en"),
+    [
+        (fmt_rp, 1234567.4, "Rp 1.234.567", "Rp 1,234,567"),
+        (fmt_gr, 1.5, "1,5", "1.5"),
+        (fmt_gr, 2.0, "2", "2"),
+        (fmt_pct, 0.254, "+0,25%", "+0.25%"),
+        (fmt_pct, -1.2, "-1,20%", "-1.20%"),
+        (fmt_pct, None, "-", "-"),
+        (fmt_quote, 2345.67, "2,345.67", "2,345.67"),
+    ],
+)
+def test_formatters_per_locale(fn, value, expected_id, expected_en):
+    assert fn(value, "id") == expected_id
+    assert fn(value, "en") == expected_en
+
+
+def test_rupiah_truncated_in_replies_rounded_in_broadcast():
+    assert fmt_rp(666666.67) == "Rp 666.666"
+    assert fmt_rp(666666.67, "en") == "Rp 666,666"
+    template = MessageTemplate({"id": "{harga:rp}"})
+    assert template.render("id", harga=666666.67) == "Rp 666.667"
+
+
+def test_template_renders_phrases_none_and_fallback_locale():
+    template = MessageTemplate(
+        {"id": "{arah:t} {harga:rp} ({ubah:pct}) {ket}", "en": "{arah:t} {harga:rp}"},
+        phrases={"id": {"up": "naik"}, "en": {"up": "up"}},
+    )
+    values = {"arah": "up", "harga": 1500000, "ubah": None, "ket": None}
+    assert template.render("id", **values) == "naik Rp 1.500.000 (-) -"
+    assert template.render("en", **values) == "up Rp 1,500,000"
+    # bahasa tanpa template memakai default (id)
+    assert template.render("fr", **values) == template.render("id", **values)
+    assert template.render_many(["id", "en"], **values)["en"] == "up Rp 1,500,000"
+
+
+@pytest.mark.parametrize(
+    ("source", "match"),
+    [("{harga:usd}", "tidak dikenal"), ("{harga!r}", "tidak didukung")],
+)
+def test_template_rejects_unknown_fields(source, match):
+    with pytest.raises(ValueError, match=match):
+        MessageTemplate({"id": source})
+
+
+def test_broadcast_messages():
+    m = price_movement(SNAPSHOT, PREVIOUS)
+    text = update_message(SNAPSHOT, m, "id")
+    assert "- XAU/USD: 2,345.67 (▽ -0,61%)" in text
+    assert "- Buyback: Rp 1.302.000 (▽ Rp -8.000)\n" in text
+    assert "- Spread (Dasar - Buyback): Rp 148.000/gr" in text
+    assert "- Timestamp buyback: -" in text
+    assert "Perak" not in text
+
+    text = update_message(SNAPSHOT, m, "en")
+    assert "- USD/IDR: 16,250.50 (Δ +0.25%)" in text
+    assert "- Buyback: Rp 1,302,000 (▽ Rp -8,000)\n" in text
+
+    assert alert_message(SNAPSHOT, m, "id").startswith("🚨 [ALERT EMAS] turun cepat")
+    assert alert_message(SNAPSHOT, m, "en").startswith("🚨 [GOLD ALERT] fast move down")
@@ -0,0 +1,102 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from lm_tracker.bot_alert.models import PriceRollup
+from lm_tracker.bot_alert.models import PriceSnapshot
+from lm_tracker.bot_alert.services import timeseries
+from lm_tracker.bot_alert.tests.factories import PriceSnapshotFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def hour():
+    return timeseries.hour_start(timezone.now()) - timedelta(hours=3)
+
+
+def _snapshots(hour, buybacks):
+    step = timedelta(minutes=60 // len(buybacks))
+    for i, buyback in enumerate(buybacks):
+        PriceSnapshotFactory(ts=hour + i * step, buyback=buyback, usdidr=16000 + i)
+
+
+def test_rollup_hourly_candles(hour):
+    _snapshots(hour, [100, 130, 90, 110])
+    _snapshots(hour + timedelta(hours=1), [110, 120])
+
+    assert timeseries.rollup_hourly() == 2  # noqa: PLR2004
+    first, second = PriceRollup.objects.filter(
+        resolution=PriceRollup.RES_HOUR,
+    ).order_by("bucket")
+    assert first.bucket == hour
+    assert (first.samples, first.buyback_open, first.buyback_close) == (4, 100, 110)
+    assert (first.buyback_high, first.buyback_low) == (130, 90)
+    assert first.usdidr_close == 16003  # noqa: PLR2004
+    assert second.samples == 2  # noqa: PLR2004
+
+    # jam terakhir dihitung ulang, jam sebelumnya tidak disentuh
+    PriceSnapshotFactory(ts=hour + timedelta(hours=1, minutes=50), buyback=150)
+    assert timeseries.rollup_hourly() == 1
+    second.refresh_from_db()
+    assert (second.samples, second.buyback_high, second.buyback_close) == (3, 150, 150)
+
+
+def test_rollup_daily_from_hours():
+    # 03:00 UTC = 10:00 WIB: dua jam di hari lokal yang sama
+    hour = datetime(2025, 1, 15, 3, tzinfo=UTC)
+    _snapshots(hour, [100, 130])
+    _snapshots(hour + timedelta(hours=1), [80, 120])
+    timeseries.rollup_hourly()
+
+    assert timeseries.rollup_daily() == 1
+    day = PriceRollup.objects.get(resolution=PriceRollup.RES_DAY)
+    assert day.bucket == datetime(2025, 1, 14, 17, tzinfo=UTC)
+    assert (day.samples, day.buyback_open, day.buyback_close) == (4, 100, 120)
+    assert (day.buyback_high, day.buyback_low) == (130, 80)
+
+
+def test_prune_keeps_snapshots_not_yet_rolled_up(settings):
+    settings.PRICE_RAW_RETENTION_DAYS = 1
+    old = timeseries.hour_start(timezone.now() - timedelta(days=5))
+    _snapshots(old, [100, 110])
+    # belum ada rollup: snapshot lama tidak boleh hilang
+    assert timeseries.prune_raw_snapshots() == 0
+
+    timeseries.rollup_hourly()
+    _snapshots(old + timedelta(days=3), [120])
+    timeseries.rollup_hourly()
+    assert timeseries.prune_raw_snapshots() == 2  # noqa: PLR2004
+    assert PriceSnapshot.objects.count() == 1
+
+
+def test_price_series_picks_resolution(hour):
+    now = timezone.now()
+    assert timeseries.pick_resolution(now - timedelta(hours=6), now) is None
+    assert (
+        timeseries.pick_resolution(now - timedelta(days=7), now) == PriceRollup.RES_HOUR
+    )
+    assert (
+        timeseries.pick_resolution(now - timedelta(days=365), now)
+        == PriceRollup.RES_DAY
+    )
+
+    _snapshots(hour, [100, 130, 90, 110])
+    timeseries.rollup_hourly()
+    resolution, points = timeseries.price_series(hour, now)
+    assert resolution is None
+    assert [p.close for p in points] == [100, 130, 90, 110]
+
+    resolution, points = timeseries.price_series(
+        hour,
+        now,
+        resolution=PriceRollup.RES_HOUR,
+    )
+    assert resolution == PriceRollup.RES_HOUR
+    assert [(p.open, p.high, p.low, p.close) for p in points] == [(100, 130, 90, 110)]
+
+    with pytest.raises(ValueError, match="tidak dikenal"):
+        timeseries.price_series(hour, now, field="xagusd")
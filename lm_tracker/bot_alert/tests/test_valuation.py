@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+import pytest
+
+from lm_tracker.bot_alert.models import AntamBarPrice
+from lm_tracker.bot_alert.services.valuation import PriceTable
+from lm_tracker.bot_alert.services.valuation import price_table
+from lm_tracker.bot_alert.services.valuation import value_lots
+from lm_tracker.bot_alert.tests.factories import PriceSnapshotFactory
+
+TABLE = PriceTable(
+    snapshot_id=1,
+    weights=[1.0, 5.0, 10.0],
+    retail_per_gram=[1_500_000.0, 1_400_000.0, 1_300_000.0],
+    buyback_per_gram={"GOLD": 1_300_000, "SILVER": 15_000},
+)
+
+
+def test_retail_gram_price_interpolates_and_clamps():
+    smallest, mid, largest = TABLE.retail_per_gram
+    assert TABLE.retail_gram_price(5) == mid
+    assert TABLE.retail_gram_price(8) == pytest.approx(1_340_000)
+    assert TABLE.retail_gram_price(0.5) == smallest
+    assert TABLE.retail_gram_price(100) == largest
+    assert TABLE.retail_bar_price(8) == pytest.approx(8 * 1_340_000)
+
+
+def test_value_lots_per_asset():
+    lots = [
+        ("GOLD", Decimal(1), 2),
+        ("SILVER", Decimal(100), 1),
+        ("GOLD", Decimal(8), 1),
+        ("GOLD", None, 1),  # FEE / tanpa berat
+        ("GOLD", Decimal(5), 0),  # sudah terjual semua
+    ]
+    out = value_lots(lots, TABLE)
+    assert out["GOLD"]["grams"] == 10  # noqa: PLR2004
+    assert out["GOLD"]["buyback_value"] == 13_000_000  # noqa: PLR2004
+    assert out["GOLD"]["retail_value"] == pytest.approx(2 * 1_500_000 + 8 * 1_340_000)
+    # tabel retail Antam hanya untuk emas
+    assert out["SILVER"] == {
+        "grams": 100,
+        "buyback_value": 1_500_000,
+        "retail_value": 0.0,
+    }
+    assert value_lots([], TABLE) == {}
+
+
+@pytest.mark.django_db
+def test_price_table_from_snapshot():
+    snap = PriceSnapshotFactory(antam_1g_base=1_450_000)
+    # snapshot tanpa tabel ukuran: pakai harga dasar 1 gr
+    assert price_table(snap).weights == [1.0]
+
+    snap = PriceSnapshotFactory()
+    AntamBarPrice.objects.bulk_create(
+        [
+            AntamBarPrice(snapshot=snap, weight_gram=w, price_base=p, price_pph=p)
+            for w, p in ((Decimal("0.5"), 800_000), (Decimal(5), 7_000_000))
+        ],
+    )
+    table = price_table(snap)
+    assert table.weights == [0.5, 5.0]
+    assert table.retail_per_gram == [1_600_000, 1_400_000]
+    assert table.buyback_per_gram["GOLD"] == snap.buyback
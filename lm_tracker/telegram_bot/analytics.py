@@ -0,0 +1,215 @@
+"""
+Analitik ledger transaksi dalam bentuk kolom (NumPy).
+
+Ledger user diambil sekali lewat values_list lalu disimpan per kolom
+(tanggal, asset, side, produk, gram, nominal). Semua hitungan - total per
+side, stok, avg cost, cashflow per periode, breakdown per produk - jadi
+operasi array (bincount / unique), bukan loop per model instance.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+import numpy as np
+from django.db.models import F
+from django.db.models import FloatField
+from django.db.models import Value
+from django.db.models.functions import Cast
+from django.db.models.functions import Coalesce
+
+from .models import Transaction
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+ASSETS = (Transaction.ASSET_GOLD, Transaction.ASSET_SILVER)
+SIDES = (
+    Transaction.SIDE_BUY,
+    Transaction.SIDE_SELL,
+    Transaction.SIDE_BUYBACK,
+    Transaction.SIDE_FEE,
+)
+_ASSET_CODE = {a: i for i, a in enumerate(ASSETS)}
+_SIDE_CODE = {s: i for i, s in enumerate(SIDES)}
+
+# berat x pcs dihitung di DB sebagai float: tidak ada Decimal per baris
+GRAMS = Coalesce(
+    Cast(F("weight_gram") * F("pcs"), FloatField()),
+    Value(0.0),
+)
+LEDGER_COLUMNS = ("tx_date", "asset", "side", "product", GRAMS, "total_amount")
+
+# tanggal -> datetime64[D]: ordinal Python dikurangi ordinal 1970-01-01
+_EPOCH_ORDINAL = 719163
+
+# granularity periode -> unit datetime64
+PERIODS = {"day": "D", "week": "W", "month": "M", "year": "Y"}
+# datetime64[W] dihitung dari epoch 1970-01-01 (Kamis); Senin + 3 hari = Kamis,
+# jadi geser maju sebelum dipotong lalu mundur lagi -> minggu mulai Senin
+# seperti periods.py / /week
+_WEEK_SHIFT = np.timedelta64(3, "D")
+
+
+@dataclass
+class Ledger:
+    day: np.ndarray  # datetime64[D]
+    asset: np.ndarray  # kode ASSETS (int8)
+    side: np.ndarray  # kode SIDES (int8)
+    product: np.ndarray  # kode produk (int32), nama di `products`
+    products: list[str]
+    grams: np.ndarray  # berat x pcs (float64), 0 kalau berat kosong
+    amount: np.ndarray  # total_amount (int64)
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+
+def ledger_from_rows(rows: list[tuple]) -> Ledger:
+    """Bangun Ledger dari tuple urut LEDGER_COLUMNS (hasil values_list)."""
+    n = len(rows)
+
+    def column(i, fn, dtype):
+        # satu lintasan per kolom tanpa zip(*rows) (yang membuat tuple raksasa)
+        return np.fromiter(map(fn, map(itemgetter(i), rows)), dtype=dtype, count=n)
+
+    # kode produk sesuai urutan kemunculan
+    products: dict[str, int] = {}
+    product = column(3, lambda p: products.setdefault(p, len(products)), np.int32)
+    day = column(0, date.toordinal, np.int64) - _EPOCH_ORDINAL
+    return Ledger(
+        day=day.astype("datetime64[D]"),
+        asset=column(1, _ASSET_CODE.__getitem__, np.int8),
+        side=column(2, _SIDE_CODE.__getitem__, np.int8),
+        product=product,
+        products=list(products),
+        grams=column(4, float, np.float64),
+        amount=column(5, int, np.int64),
+    )
+
+
+def load_ledger(qs: QuerySet[Transaction]) -> Ledger:
+    return ledger_from_rows(list(qs.order_by().values_list(*LEDGER_COLUMNS)))
+
+
+def _grid(keys: np.ndarray, size: int, values: np.ndarray) -> np.ndarray:
+    return np.bincount(keys, weights=values, minlength=size)
+
+
+def flows(ledger: Ledger) -> dict:
+    """
+    Gram & nominal per (asset, side), bentuknya sama dengan agregat ledger:
+      {"GOLD": {"BUY": {"grams": Decimal, "amount": int}, ...}, ...}
+    """
+    size = len(ASSETS) * len(SIDES)
+    keys = ledger.asset.astype(np.intp) * len(SIDES) + ledger.side
+    counts = np.bincount(keys, minlength=size)
+    grams = _grid(keys, size, ledger.grams)
+    amount = _grid(keys, size, ledger.amount)
+
+    out = {asset: {} for asset in ASSETS}
+    for a, asset in enumerate(ASSETS):
+        for s, side in enumerate(SIDES):
+            k = a * len(SIDES) + s
+            if counts[k]:
+                out[asset][side] = {
+                    # berat desimal 3 angka: bulatkan balik ke presisi field
+                    "grams": Decimal(f"{grams[k]:.3f}"),
+                    "amount": round(amount[k]),
+                }
+    return out
+
+
+def side_totals(ledger: Ledger) -> dict[str, int]:
+    amount = _grid(ledger.side, len(SIDES), ledger.amount)
+    counts = np.bincount(ledger.side, minlength=len(SIDES))
+    return {side: round(amount[s]) for s, side in enumerate(SIDES) if counts[s]}
+
+
+def holdings(
+    ledger: Ledger,
+    inflow: tuple[str, ...] = (Transaction.SIDE_BUY,),
+    outflow: tuple[str, ...] = (Transaction.SIDE_SELL, Transaction.SIDE_BUYBACK),
+) -> dict[str, float]:
+    """Stok gram per asset; side `inflow` menambah, `outflow` mengurangi."""
+    sign = np.zeros(len(SIDES))
+    sign[[_SIDE_CODE[s] for s in inflow]] = 1
+    sign[[_SIDE_CODE[s] for s in outflow]] = -1
+    net = _grid(ledger.asset, len(ASSETS), ledger.grams * sign[ledger.side])
+    return {asset: float(net[a]) for a, asset in enumerate(ASSETS)}
+
+
+def average_cost(ledger: Ledger) -> dict[str, float | None]:
+    """Avg harga BUY per gram per asset."""
+    buy = ledger.side == _SIDE_CODE[Transaction.SIDE_BUY]
+    grams = _grid(ledger.asset[buy], len(ASSETS), ledger.grams[buy])
+    cost = _grid(ledger.asset[buy], len(ASSETS), ledger.amount[buy])
+    return {
+        asset: (float(cost[a] / grams[a]) if grams[a] > 0 else None)
+        for a, asset in enumerate(ASSETS)
+    }
+
+
+def cash_flow_by_period(
+    ledger: Ledger,
+    period: str = "month",
+) -> list[tuple[date, dict[str, int]]]:
+    """Nominal per side per periode (awal periode), urut naik."""
+    if not len(ledger):
+        return []
+    shift = _WEEK_SHIFT if period == "week" else np.timedelta64(0, "D")
+    buckets = (ledger.day + shift).astype(f"datetime64[{PERIODS[period]}]")
+    starts, idx = np.unique(buckets, return_inverse=True)
+    size = len(starts) * len(SIDES)
+    keys = idx.astype(np.intp) * len(SIDES) + ledger.side
+    amount = _grid(keys, size, ledger.amount).reshape(len(starts), len(SIDES))
+    counts = np.bincount(keys, minlength=size).reshape(len(starts), len(SIDES))
+    return [
+        (
+            (start.astype("datetime64[D]") - shift).item(),
+            {side: round(amount[i, s]) for s, side in enumerate(SIDES) if counts[i, s]},
+        )
+        for i, start in enumerate(starts)
+    ]
+
+
+def product_breakdown(ledger: Ledger) -> list[dict]:
+    """
+    Per (asset, produk): stok gram (buy - sell - buyback), gram & nominal BUY,
+    avg beli per gram. Urut stok terbesar dulu.
+    """
+    n_products = max(len(ledger.products), 1)
+    keys = ledger.asset.astype(np.intp) * n_products + ledger.product
+    size = len(ASSETS) * n_products
+
+    buy = ledger.side == _SIDE_CODE[Transaction.SIDE_BUY]
+    out_sides = np.isin(
+        ledger.side,
+        [_SIDE_CODE[Transaction.SIDE_SELL], _SIDE_CODE[Transaction.SIDE_BUYBACK]],
+    )
+    buy_grams = _grid(keys[buy], size, ledger.grams[buy])
+    buy_amount = _grid(keys[buy], size, ledger.amount[buy])
+    out_grams = _grid(keys[out_sides], size, ledger.grams[out_sides])
+    counts = np.bincount(keys, minlength=size)
+
+    rows = []
+    for k in np.flatnonzero(counts):
+        a, p = divmod(int(k), n_products)
+        rows.append(
+            {
+                "asset": ASSETS[a],
+                "product": ledger.products[p] if ledger.products else "",
+                "holdings": float(buy_grams[k] - out_grams[k]),
+                "buy_grams": float(buy_grams[k]),
+                "buy_amount": round(buy_amount[k]),
+                "avg_cost": (
+                    float(buy_amount[k] / buy_grams[k]) if buy_grams[k] > 0 else None
+                ),
+            },
+        )
+    rows.sort(key=lambda r: r["holdings"], reverse=True)
+    return rows
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class TelegramBotConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "lm_tracker.telegram_bot"
+
+    def ready(self):
+        from .instrumentation import install_db_wrapper  # noqa: PLC0415
+
+        # hitung query DB per handler bot
+        connection_created.connect(install_db_wrapper, weak=False)
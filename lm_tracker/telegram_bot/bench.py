@@ -0,0 +1,168 @@
+"""
+Alat bantu benchmark bot: Bot API tiruan (tanpa network), payload update,
+teks sintetis (command + transaksi) dan klien ASGI in-process.
+
+Dipakai management command bench_* supaya handler PTB bisa dijalankan penuh
+(termasuk reply_text) tanpa token / koneksi ke api.telegram.org.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from telegram.request import BaseRequest
+
+if TYPE_CHECKING:
+    import random
+
+BENCH_TOKEN = "123456:bench"  # noqa: S105
+BENCH_SECRET = "bench-secret"  # noqa: S105
+BENCH_WEBHOOK_PATH = "/telegram/webhook/bench/"
+BOT_USER = {"id": 123456, "is_bot": True, "first_name": "bench", "username": "bench"}
+
+# bobot command read-only yang umum dipakai user
+COMMAND_MIX = {
+    "/today": 4,
+    "/week": 2,
+    "/month": 2,
+    "/list": 3,
+    "/summary": 1,
+    "/report": 1,
+    "/find beli emas": 1,
+    "/find produk:antam >1jt": 1,
+    "/help": 1,
+}
+TX_SIDES = ("beli", "beli", "beli", "jual", "buyback", "fee")
+TX_PRODUCTS = ("antam", "ubs", "galeri 24", "king halim", "")
+TX_GRAMS = ("0.5", "1", "2", "5", "10", "25", "50")
+TX_NOTES = ("", "", "", " note: hadiah", " catatan: toko langganan")
+PRICE_PER_GRAM = {"emas": 1_900_000, "perak": 25_000}
+
+
+class CannedBotApi(BaseRequest):
+    """Bot API tiruan: getMe + pesan dummy untuk semua method lain."""
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        if url.endswith("/getMe"):
+            result = BOT_USER
+        else:
+            result = {
+                "message_id": 1,
+                "date": int(time.time()),
+                "chat": {"id": 1, "type": "private"},
+            }
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+def update_payload(update_id: int, chat_id: int, text: str) -> dict:
+    user = {"id": chat_id, "is_bot": False, "first_name": "bench"}
+    entities = []
+    if text.startswith("/"):
+        command = text.split(maxsplit=1)[0]
+        entities = [{"type": "bot_command", "offset": 0, "length": len(command)}]
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": user,
+            "text": text,
+            "entities": entities,
+        },
+    }
+
+
+def transaction_text(rng: random.Random) -> str:
+    """Teks transaksi yang diterima parse_transaction."""
+    asset = rng.choice(("emas", "emas", "emas", "perak"))
+    grams = rng.choice(TX_GRAMS)
+    pcs = rng.randint(1, 3)
+    total = int(
+        Decimal(grams) * pcs * PRICE_PER_GRAM[asset] * Decimal(rng.uniform(0.95, 1.05)),
+    )
+    words = [rng.choice(TX_SIDES), asset, rng.choice(TX_PRODUCTS)]
+    words += [f"{grams}gr", f"{pcs}pcs", f"total {total:,}".replace(",", ".")]
+    return " ".join(w for w in words if w) + rng.choice(TX_NOTES)
+
+
+def synthetic_text(rng: random.Random, tx_ratio: float) -> str:
+    if rng.random() < tx_ratio:
+        return transaction_text(rng)
+    return rng.choices(list(COMMAND_MIX), weights=list(COMMAND_MIX.values()))[0]
+
+
+async def asgi_post(
+    app,
+    path: str,
+    body: bytes,
+    *,
+    host: str = "localhost",
+    headers: tuple = (),
+) -> int:
+    """POST in-process ke aplikasi ASGI, kembalikan status HTTP."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", host.encode()),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": (host, 80),
+    }
+    delivered = asyncio.Event()
+    status = []
+
+    async def receive():
+        if not delivered.is_set():
+            delivered.set()
+            return {"type": "http.request", "body": body, "more_body": False}
+        # jangan kirim disconnect: handler Django mendengarkan receive()
+        await asyncio.Event().wait()
+        return None
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+def percentile(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def latency_stats(samples: list[float]) -> str:
+    return (
+        f"p50 {statistics.median(samples):7.2f} ms  "
+        f"p95 {percentile(samples, 0.95):7.2f} ms  "
+        f"p99 {percentile(samples, 0.99):7.2f} ms  "
+        f"rata2 {statistics.fmean(samples):7.2f} ms"
+    )
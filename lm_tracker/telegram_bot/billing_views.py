@@ -1,3 +1,4 @@
+import re
 import secrets
 from datetime import timedelta
 
@@ -8,20 +9,25 @@ from django.utils import timezone
 
 from .models import ActivationToken
 
+# id Telegram muat di 52 bit; chat grup / supergroup negatif (-100...)
+TG_ID_RE = re.compile(r"-?\d{1,16}")
+
 
 def checkout(request):
     """
     Simulasi: user klik link /billing/checkout/?tg=<telegram_user_id>
+    (id chat negatif untuk ledger grup).
     Anggap "sudah bayar", langsung buat activation token lalu redirect ke success.
     """
     tg = request.GET.get("tg", "")
-    if not tg.isdigit():
+    if not TG_ID_RE.fullmatch(tg):
         return HttpResponse("invalid")
 
     token = secrets.token_urlsafe(24)
     ActivationToken.objects.create(
         token=token,
         plan="PRO",
+        telegram_user_id=int(tg),
         expires_at=timezone.now() + timedelta(hours=2),
     )
     return redirect(f"{settings.APP_BASE_URL}/billing/success/?token={token}")
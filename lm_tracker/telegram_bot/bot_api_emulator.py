@@ -0,0 +1,456 @@
+"""
+Emulator Bot API Telegram lokal untuk test / benchmark tanpa network.
+
+Aplikasi ASGI (dijalankan lewat `manage.py run_bot_api_emulator` atau
+running_emulator() di thread untuk test), cukup untuk send_telegram /
+send_telegram_batch dan Application PTB:
+
+  /bot<token>/getMe, sendMessage, sendDocument, sendPhoto, editMessageText,
+  answerCallbackQuery, setWebhook, deleteWebhook, getWebhookInfo, getUpdates
+
+Arahkan kedua klien dengan TELEGRAM_API_BASE_URL=http://127.0.0.1:8081.
+
+Perilaku yang bisa diatur (EmulatorConfig, juga lewat POST /emulator/config):
+  - latency_ms + jitter_ms : jeda sebelum tiap jawaban method Bot API
+  - rate_limit             : maksimal pesan keluar per detik (0 = tanpa batas);
+                             lewat batas -> 429 + parameters.retry_after
+  - flood_ratio            : peluang 429 acak per pesan keluar (0..1)
+
+Endpoint kontrol:
+  POST /emulator/updates   : update masuk (dict / list update, atau singkat
+                             {"chat_id": .., "text": ..}); dikirim ke webhook
+                             kalau setWebhook aktif, selain itu antre untuk
+                             getUpdates
+  GET  /emulator/stats     : jumlah panggilan per method, 429, webhook
+  GET  /emulator/messages  : pesan terkirim (?chat_id=..)
+  POST /emulator/reset     : kosongkan state
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import email.parser
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections import deque
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import fields
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl
+
+import httpx
+import uvicorn
+
+from .bench import BOT_USER
+from .bench import update_payload
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+METHOD_PATH_RE = re.compile(r"^/bot[^/]+/(\w+)$")
+API_METHODS = {
+    "getMe": "_get_me",
+    "sendMessage": "_send_message",
+    "sendDocument": "_send_document",
+    "sendPhoto": "_send_photo",
+    "editMessageText": "_edit_message_text",
+    "answerCallbackQuery": "_answer_callback_query",
+    "setWebhook": "_set_webhook",
+    "deleteWebhook": "_delete_webhook",
+    "getWebhookInfo": "_get_webhook_info",
+    "getUpdates": "_get_updates",
+}
+# pesan keluar yang kena rate limit / 429
+SEND_METHODS = {"sendMessage", "sendDocument", "sendPhoto", "editMessageText"}
+MAX_MESSAGES = 10_000
+MAX_GET_UPDATES = 100
+WEBHOOK_TIMEOUT = 10
+
+
+@dataclass
+class EmulatorConfig:
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    rate_limit: int = 0
+    flood_ratio: float = 0
+    retry_after: int = 1
+    seed: int | None = None
+
+
+class BotApiEmulator:
+    def __init__(self, config: EmulatorConfig | None = None):
+        self.config = config or EmulatorConfig()
+        self.rng = random.Random(self.config.seed)  # noqa: S311
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.throttled = 0
+        self.messages: deque[dict] = deque(maxlen=MAX_MESSAGES)
+        self.message_id = 0
+        self.update_id = 0
+        self.updates: list[dict] = []
+        self.webhook: dict = {"url": "", "secret_token": None}
+        self.webhook_deliveries: Counter[str] = Counter()
+        self._sent_at: deque[float] = deque()
+        self._new_update = asyncio.Event()
+
+    # ---- ASGI ----
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await _lifespan(receive, send)
+            return
+        body = await _read_body(receive)
+        path = scope["path"]
+        if path.startswith("/emulator/"):
+            status, payload = await self._control(scope, path, body)
+        else:
+            match = METHOD_PATH_RE.match(path)
+            if match is None:
+                status, payload = _error(404, "Not Found")
+            else:
+                params = _parse_params(dict(scope["headers"]), body)
+                params.update(parse_qsl(scope["query_string"].decode()))
+                status, payload = await self._api(match.group(1), params)
+        await _respond(send, status, payload)
+
+    # ---- Bot API ----
+
+    async def _api(self, method: str, params: dict) -> tuple[int, dict]:
+        self.calls[method] += 1
+        delay = self.config.latency_ms + self.rng.uniform(0, self.config.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        if method in SEND_METHODS and self._throttle():
+            self.throttled += 1
+            retry_after = self.config.retry_after
+            return _error(
+                429,
+                f"Too Many Requests: retry after {retry_after}",
+                parameters={"retry_after": retry_after},
+            )
+
+        handler = API_METHODS.get(method)
+        if handler is None:
+            return _error(404, "Not Found: method not found")
+        return await getattr(self, handler)(params)
+
+    def _throttle(self) -> bool:
+        if self.config.flood_ratio and self.rng.random() < self.config.flood_ratio:
+            return True
+        if not self.config.rate_limit:
+            return False
+        now = time.monotonic()
+        while self._sent_at and now - self._sent_at[0] >= 1:
+            self._sent_at.popleft()
+        if len(self._sent_at) >= self.config.rate_limit:
+            return True
+        self._sent_at.append(now)
+        return False
+
+    def _message(self, params: dict, **content) -> dict:
+        self.message_id += 1
+        message = {
+            "message_id": self.message_id,
+            "date": int(time.time()),
+            "chat": _chat(params.get("chat_id")),
+            "from": BOT_USER,
+            **content,
+        }
+        self.messages.append(message)
+        return message
+
+    async def _get_me(self, params):
+        return _ok(BOT_USER)
+
+    async def _send_message(self, params):
+        if not params.get("text"):
+            return _error(400, "Bad Request: message text is empty")
+        return _ok(self._message(params, text=params["text"]))
+
+    async def _send_document(self, params):
+        document = params.get("document") or {}
+        file_id = f"doc{self.message_id + 1}"
+        return _ok(
+            self._message(
+                params,
+                caption=params.get("caption", ""),
+                document={
+                    "file_id": file_id,
+                    "file_unique_id": file_id,
+                    "file_name": document.get("filename", "document"),
+                    "file_size": document.get("size", 0),
+                },
+            ),
+        )
+
+    async def _send_photo(self, params):
+        photo = params.get("photo") or {}
+        file_id = f"photo{self.message_id + 1}"
+        size = {
+            "file_id": file_id,
+            "file_unique_id": file_id,
+            "width": 1280,
+            "height": 720,
+            "file_size": photo.get("size", 0),
+        }
+        return _ok(
+            self._message(params, caption=params.get("caption", ""), photo=[size]),
+        )
+
+    async def _edit_message_text(self, params):
+        if "inline_message_id" in params:
+            return _ok(result=True)
+        message = self._message(params, text=params.get("text", ""))
+        message["message_id"] = int(params.get("message_id") or message["message_id"])
+        message["edit_date"] = message["date"]
+        return _ok(message)
+
+    async def _answer_callback_query(self, params):
+        return _ok(result=True)
+
+    async def _set_webhook(self, params):
+        self.webhook = {
+            "url": params.get("url", ""),
+            "secret_token": params.get("secret_token"),
+        }
+        return _ok(result=True)
+
+    async def _delete_webhook(self, params):
+        self.webhook = {"url": "", "secret_token": None}
+        if str(params.get("drop_pending_updates")).lower() == "true":
+            self.updates.clear()
+        return _ok(result=True)
+
+    async def _get_webhook_info(self, params):
+        return _ok(
+            {
+                "url": self.webhook["url"],
+                "has_custom_certificate": False,
+                "pending_update_count": len(self.updates),
+            },
+        )
+
+    async def _get_updates(self, params):
+        if self.webhook["url"]:
+            return _error(
+                409,
+                "Conflict: can't use getUpdates method while webhook is active",
+            )
+        offset = int(params.get("offset") or 0)
+        limit = min(int(params.get("limit") or MAX_GET_UPDATES), MAX_GET_UPDATES)
+        timeout = float(params.get("timeout") or 0)
+        # offset mengonfirmasi update sebelumnya
+        self.updates = [u for u in self.updates if u["update_id"] >= offset]
+        if not self.updates and timeout:
+            self._new_update.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._new_update.wait(), timeout)
+        return _ok(self.updates[:limit])
+
+    # ---- kontrol ----
+
+    async def _control(self, scope, path: str, body: bytes) -> tuple[int, dict]:
+        action = path.removeprefix("/emulator/").strip("/")
+        if action == "stats":
+            return 200, self.stats()
+        if action == "messages":
+            query = dict(parse_qsl(scope["query_string"].decode()))
+            return 200, {"messages": self.sent_messages(query.get("chat_id"))}
+        if scope["method"] != "POST" or action not in {"reset", "config", "updates"}:
+            return _error(404, "Not Found")
+
+        data = json.loads(body or b"{}")
+        try:
+            if action == "reset":
+                self.reset()
+                result = True
+            elif action == "config":
+                self.configure(**data)
+                result = asdict(self.config)
+            else:
+                result = [await self.push_update(u) for u in _as_list(data)]
+        except (ValueError, TypeError, KeyError) as err:
+            return _error(400, f"Bad Request: {err}")
+        return _ok(result)
+
+    def sent_messages(self, chat_id: str | None = None) -> list[dict]:
+        return [
+            m
+            for m in self.messages
+            if chat_id is None or str(m["chat"]["id"]) == str(chat_id)
+        ]
+
+    def configure(self, **options) -> None:
+        names = {f.name for f in fields(EmulatorConfig)}
+        for name, value in options.items():
+            if name not in names:
+                msg = f"opsi emulator tidak dikenal: {name}"
+                raise ValueError(msg)
+            setattr(self.config, name, value)
+
+    async def push_update(self, data: dict) -> int:
+        """Update masuk dari "user"; return update_id."""
+        if "chat_id" in data and "text" in data:
+            self.update_id += 1
+            data = update_payload(self.update_id, int(data["chat_id"]), data["text"])
+        elif "update_id" not in data:
+            self.update_id += 1
+            data = {**data, "update_id": self.update_id}
+        else:
+            self.update_id = max(self.update_id, data["update_id"])
+
+        if self.webhook["url"]:
+            await self._deliver(data)
+        else:
+            self.updates.append(data)
+            self._new_update.set()
+        return data["update_id"]
+
+    async def _deliver(self, data: dict) -> None:
+        headers = {}
+        if self.webhook["secret_token"]:
+            headers["X-Telegram-Bot-Api-Secret-Token"] = self.webhook["secret_token"]
+        try:
+            async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT) as client:
+                r = await client.post(self.webhook["url"], json=data, headers=headers)
+        except httpx.HTTPError:
+            self.webhook_deliveries["error"] += 1
+            return
+        self.webhook_deliveries[str(r.status_code)] += 1
+
+    def stats(self) -> dict:
+        return {
+            "calls": dict(self.calls),
+            "throttled": self.throttled,
+            "messages": len(self.messages),
+            "pending_updates": len(self.updates),
+            "webhook": {
+                "url": self.webhook["url"],
+                "deliveries": dict(self.webhook_deliveries),
+            },
+            "config": asdict(self.config),
+        }
+
+
+def _ok(result) -> tuple[int, dict]:
+    return 200, {"ok": True, "result": result}
+
+
+def _error(code: int, description: str, **extra) -> tuple[int, dict]:
+    return code, {"ok": False, "error_code": code, "description": description, **extra}
+
+
+def _as_list(data) -> list:
+    return data if isinstance(data, list) else [data]
+
+
+def _chat(chat_id) -> dict:
+    value = str(chat_id or "")
+    if value.lstrip("-").isdigit():
+        chat = int(value)
+        return {"id": chat, "type": "private" if chat > 0 else "supergroup"}
+    # "@channel"
+    return {"id": -1_000_000_000_000, "type": "channel", "username": value.lstrip("@")}
+
+
+def _parse_params(headers: dict, body: bytes) -> dict:
+    """Body JSON (requests), form-urlencoded / multipart (PTB)."""
+    content_type = headers.get(b"content-type", b"").decode()
+    if not body:
+        return {}
+    if content_type.startswith("application/json"):
+        return json.loads(body)
+    if content_type.startswith("multipart/form-data"):
+        return _parse_multipart(content_type, body)
+    return dict(parse_qsl(body.decode()))
+
+
+def _parse_multipart(content_type: str, body: bytes) -> dict:
+    message = email.parser.BytesParser().parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body,
+    )
+    params = {}
+    for part in message.get_payload():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True) or b""
+        filename = part.get_filename()
+        if filename:
+            params[name] = {"filename": filename, "size": len(payload)}
+        else:
+            params[name] = payload.decode()
+    # PTB: file dilampirkan sebagai "attach://<name>"
+    for key, value in list(params.items()):
+        if isinstance(value, str) and value.startswith("attach://"):
+            params[key] = params.get(value.removeprefix("attach://"), {})
+    return params
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    more = True
+    while more:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def _respond(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        },
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+@contextlib.contextmanager
+def running_emulator(
+    emulator: BotApiEmulator | None = None,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> Iterator[tuple[BotApiEmulator, str]]:
+    """Jalankan emulator di thread (untuk test); yield (emulator, base_url)."""
+    emulator = emulator or BotApiEmulator()
+    server = uvicorn.Server(
+        uvicorn.Config(emulator, host=host, port=port, log_level="warning"),
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            msg = "emulator Bot API gagal start"
+            raise RuntimeError(msg)
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield emulator, f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
@@ -0,0 +1,102 @@
+"""
+Health check + metrik pool koneksi DB (psycopg3 pool).
+
+GET /health/ -> 200 {"status": "ok", "db": {...}, "pools": {...}} atau 503
+kalau DB tidak bisa di-query. Metrik pool per proses (tiap worker web /
+celery punya pool sendiri), dari ConnectionPool.get_stats():
+  - checked_out : koneksi sedang dipakai (pool_size - pool_available)
+  - waiting     : request yang sedang antre koneksi
+  - wait_ms_avg : rata-rata waktu tunggu request yang sempat antre
+  - timeouts    : request yang gagal dapat koneksi (PoolTimeout)
+
+GET /metrics/ -> metrik Prometheus (latensi handler bot, lihat
+instrumentation.py); dilindungi METRICS_TOKEN kalau diisi.
+"""
+
+from __future__ import annotations
+
+import hmac
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import connections
+from django.db import transaction
+from django.http import HttpResponse
+from django.http import HttpResponseForbidden
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from .instrumentation import metrics_payload
+
+
+def _pool_stats(pool) -> dict:
+    stats = pool.get_stats()
+    queued = stats.get("requests_queued", 0)
+    # pool dibuka Django saat koneksi pertama; sebelum itu belum ada koneksi
+    size = 0 if pool.closed else stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    return {
+        "name": pool.name,
+        "open": not pool.closed,
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "size": size,
+        "available": available,
+        "checked_out": max(0, size - available),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "queued": queued,
+        "wait_ms_avg": (
+            round(stats.get("requests_wait_ms", 0) / queued, 1) if queued else 0.0
+        ),
+        "timeouts": stats.get("requests_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+def db_pool_stats() -> dict:
+    """Metrik pool per alias DB; alias tanpa pool (SQLite, CONN_MAX_AGE) dilewati."""
+    pools = {}
+    for conn in connections.all():
+        pool = getattr(conn, "pool", None)
+        if pool is not None:
+            pools[conn.alias] = _pool_stats(pool)
+    return pools
+
+
+def _db_ping() -> dict:
+    start = time.perf_counter()
+    with connections["default"].cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return {"ok": True, "ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+@require_GET
+@transaction.non_atomic_requests
+def health(request):
+    try:
+        db = _db_ping()
+    except DatabaseError as err:
+        db = {"ok": False, "error": str(err)}
+    return JsonResponse(
+        {
+            "status": "ok" if db["ok"] else "error",
+            "db": db,
+            "pools": db_pool_stats(),
+        },
+        status=200 if db["ok"] else 503,
+    )
+
+
+@require_GET
+@transaction.non_atomic_requests
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""),
+        f"Bearer {token}",
+    ):
+        return HttpResponseForbidden("invalid token")
+    return HttpResponse(metrics_payload(), content_type=CONTENT_TYPE_LATEST)
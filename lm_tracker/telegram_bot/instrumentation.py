@@ -0,0 +1,248 @@
+"""
+Instrumentasi per handler bot: latensi, query DB, waktu Bot API, waktu parse.
+
+instrument_handlers(app) (dipanggil build_app) membungkus callback semua
+handler. Selama handler jalan, HandlerStats di contextvar diisi oleh:
+  - query DB : execute_wrapper di tiap koneksi (signal connection_created);
+               contextvar ikut ke thread sync_to_async / async ORM
+  - Bot API  : InstrumentedRequest, pembungkus request HTTP PTB (pesan yang
+               masuk antrean balasan dikirim di luar handler, tidak dihitung)
+  - parse    : parse_timer() di sekitar parser teks transaksi / /find
+
+Hasilnya:
+  - histogram Prometheus per handler (GET /metrics/ di web, --metrics-port di
+    run_tx_telegram_bot). Gunicorn multi-worker: set PROMETHEUS_MULTIPROC_DIR.
+  - span Sentry "telegram.handler" (transaction baru, atau child span kalau
+    sudah ada transaction request Django) + child span per panggilan Bot API
+    dan parse. Span query DB dibuat DjangoIntegration. Hanya terkirim kalau
+    SENTRY_TRACES_SAMPLE_RATE > 0.
+  - log warning untuk handler lebih lambat dari TELEGRAM_SLOW_HANDLER_MS.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import sentry_sdk
+from django.conf import settings
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+from telegram.ext import ApplicationHandlerStop
+from telegram.request import BaseRequest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HANDLER_SECONDS = Histogram(
+    "telegram_handler_duration_seconds",
+    "Waktu total handler bot",
+    ["handler", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+HANDLER_DB_QUERIES = Histogram(
+    "telegram_handler_db_queries",
+    "Jumlah query DB per pemanggilan handler",
+    ["handler"],
+    buckets=QUERY_BUCKETS,
+)
+HANDLER_DB_SECONDS = Histogram(
+    "telegram_handler_db_duration_seconds",
+    "Waktu query DB per pemanggilan handler",
+    ["handler"],
+    buckets=LATENCY_BUCKETS,
+)
+HANDLER_API_SECONDS = Histogram(
+    "telegram_handler_api_duration_seconds",
+    "Waktu panggilan Bot API per pemanggilan handler",
+    ["handler"],
+    buckets=LATENCY_BUCKETS,
+)
+HANDLER_PARSE_SECONDS = Histogram(
+    "telegram_handler_parse_duration_seconds",
+    "Waktu parse teks per pemanggilan handler",
+    ["handler"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+API_REQUEST_SECONDS = Histogram(
+    "telegram_api_request_duration_seconds",
+    "Waktu request HTTP Bot API per method",
+    ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@dataclass
+class HandlerStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    api_calls: int = 0
+    api_seconds: float = 0.0
+    parse_seconds: float = 0.0
+
+
+_stats: ContextVar[HandlerStats | None] = ContextVar("handler_stats", default=None)
+
+
+def current_stats() -> HandlerStats | None:
+    return _stats.get()
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+def install_db_wrapper(sender, connection, **kwargs) -> None:
+    # connection_created terkirim tiap connect (juga dari pool) pada objek
+    # DatabaseWrapper yang sama -> jangan dobel
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+@contextlib.contextmanager
+def parse_timer() -> Iterator[None]:
+    stats = _stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    with sentry_sdk.start_span(op="telegram.parse", name="parse"):
+        try:
+            yield
+        finally:
+            stats.parse_seconds += time.perf_counter() - start
+
+
+class InstrumentedRequest(BaseRequest):
+    """Pembungkus request Bot API: catat waktu per method + span Sentry."""
+
+    def __init__(self, request: BaseRequest):
+        self._request = request
+
+    @property
+    def read_timeout(self):
+        return self._request.read_timeout
+
+    async def initialize(self):
+        await self._request.initialize()
+
+    async def shutdown(self):
+        await self._request.shutdown()
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        api_method = url.rsplit("/", 1)[-1]
+        start = time.perf_counter()
+        try:
+            with sentry_sdk.start_span(op="telegram.api", name=api_method):
+                return await self._request.do_request(
+                    url,
+                    method,
+                    request_data,
+                    **kwargs,
+                )
+        finally:
+            elapsed = time.perf_counter() - start
+            API_REQUEST_SECONDS.labels(api_method).observe(elapsed)
+            stats = _stats.get()
+            if stats is not None:
+                stats.api_calls += 1
+                stats.api_seconds += elapsed
+
+
+def _handler_span(name: str):
+    if sentry_sdk.get_current_span() is not None:
+        return sentry_sdk.start_span(op="telegram.handler", name=name)
+    return sentry_sdk.start_transaction(op="telegram.handler", name=name)
+
+
+def _record(name: str, outcome: str, seconds: float, stats: HandlerStats) -> None:
+    HANDLER_SECONDS.labels(name, outcome).observe(seconds)
+    HANDLER_DB_QUERIES.labels(name).observe(stats.db_queries)
+    HANDLER_DB_SECONDS.labels(name).observe(stats.db_seconds)
+    HANDLER_API_SECONDS.labels(name).observe(stats.api_seconds)
+    HANDLER_PARSE_SECONDS.labels(name).observe(stats.parse_seconds)
+
+    fields = {
+        "handler": name,
+        "outcome": outcome,
+        "ms": round(seconds * 1000, 2),
+        "db_queries": stats.db_queries,
+        "db_ms": round(stats.db_seconds * 1000, 2),
+        "api_calls": stats.api_calls,
+        "api_ms": round(stats.api_seconds * 1000, 2),
+        "parse_ms": round(stats.parse_seconds * 1000, 3),
+    }
+    if seconds * 1000 >= settings.TELEGRAM_SLOW_HANDLER_MS:
+        logger.warning("handler lambat %s", fields, extra=fields)
+    else:
+        logger.debug("handler %s", fields, extra=fields)
+
+
+def instrument(callback, name: str):
+    @functools.wraps(callback)
+    async def wrapper(update, context):
+        stats = HandlerStats()
+        token = _stats.set(stats)
+        outcome = "ok"
+        start = time.perf_counter()
+        # scope sendiri supaya span handler update lain tidak tertukar
+        with sentry_sdk.new_scope(), _handler_span(name) as span:
+            try:
+                return await callback(update, context)
+            except ApplicationHandlerStop:
+                outcome = "stop"
+                raise
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                _stats.reset(token)
+                span.set_data("db.queries", stats.db_queries)
+                span.set_data("db.ms", round(stats.db_seconds * 1000, 2))
+                span.set_data("telegram.api_ms", round(stats.api_seconds * 1000, 2))
+                span.set_data("parse.ms", round(stats.parse_seconds * 1000, 3))
+                _record(name, outcome, seconds, stats)
+
+    return wrapper
+
+
+def instrument_handlers(app: Application) -> None:
+    """Bungkus callback semua handler yang sudah terdaftar di app."""
+    for handlers in app.handlers.values():
+        for handler in handlers:
+            callback = handler.callback
+            handler.callback = instrument(callback, callback.__name__)
+
+
+def metrics_payload() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # gabungan semua worker gunicorn
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,280 @@
+import asyncio
+import contextlib
+import json
+import random
+import statistics
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from telegram import Update
+
+from config import asgi
+from lm_tracker.telegram_bot import webhook
+from lm_tracker.telegram_bot.bench import BENCH_SECRET
+from lm_tracker.telegram_bot.bench import BENCH_TOKEN
+from lm_tracker.telegram_bot.bench import BENCH_WEBHOOK_PATH
+from lm_tracker.telegram_bot.bench import CannedBotApi
+from lm_tracker.telegram_bot.bench import asgi_post
+from lm_tracker.telegram_bot.bench import percentile
+from lm_tracker.telegram_bot.bench import synthetic_text
+from lm_tracker.telegram_bot.bench import update_payload
+from lm_tracker.telegram_bot.bot_api_emulator import BotApiEmulator
+from lm_tracker.telegram_bot.bot_api_emulator import EmulatorConfig
+from lm_tracker.telegram_bot.bot_api_emulator import running_emulator
+from lm_tracker.telegram_bot.models import TelegramUser
+from lm_tracker.telegram_bot.telegram_app import build_app
+
+TARGETS = ("webhook", "django", "polling")
+
+# penghitung query DB milik update yang sedang diproses (per task)
+_update_queries: ContextVar[list[int] | None] = ContextVar(
+    "bench_update_queries",
+    default=None,
+)
+
+
+def _count_queries(execute, sql, params, many, context):
+    counter = _update_queries.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def _install_counter(sender, connection, **kwargs):
+    if _count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_queries)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test bot: update sintetis (command + teks transaksi) dari banyak "
+        "user simultan ke route webhook (ASGI ringan via config.asgi), handler "
+        "Django (telegram_webhook + middleware) dan handler polling in-process. "
+        "Bot API ditiru in-process, atau --bot-api emulator: HTTP sungguhan ke "
+        "emulator lokal (latensi / 429 bisa diatur). Laporan: throughput, latensi "
+        "p50/p95/p99, query DB per update. Membuat TelegramUser + Transaction "
+        "mulai dari --chat-id di DB (hapus lagi dengan --cleanup)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--targets",
+            nargs="+",
+            choices=TARGETS,
+            default=list(TARGETS),
+        )
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--per-user", type=int, default=10)
+        parser.add_argument(
+            "--tx-ratio",
+            type=float,
+            default=0.4,
+            help="porsi teks transaksi (sisanya command read-only)",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--bot-api",
+            choices=("canned", "emulator"),
+            default="canned",
+        )
+        parser.add_argument(
+            "--api-latency-ms",
+            type=float,
+            default=0,
+            help="latensi emulator per method (--bot-api emulator)",
+        )
+        parser.add_argument(
+            "--api-rate-limit",
+            type=int,
+            default=0,
+            help="pesan/detik emulator sebelum 429 (--bot-api emulator)",
+        )
+        parser.add_argument("--chat-id", type=int, default=920_000_000)
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument(
+            "--reply-queue",
+            action="store_true",
+            help="pakai antrean balasan per chat (jatah pesan Telegram) seperti "
+            "produksi",
+        )
+        parser.add_argument(
+            "--cleanup",
+            action="store_true",
+            help="hapus TelegramUser (dan transaksinya) yang dibuat benchmark",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="cetak hasil sebagai JSON",
+        )
+
+    def handle(self, *args, **options):
+        connection_created.connect(_install_counter, weak=False)
+        try:
+            with contextlib.ExitStack() as stack:
+                overrides = {
+                    "TELEGRAM_BOT_TOKEN": settings.TELEGRAM_BOT_TOKEN or BENCH_TOKEN,
+                    "TELEGRAM_WEBHOOK_SECRET_TOKEN": BENCH_SECRET,
+                    # yang diukur kapasitas bot, bukan limiter
+                    "TELEGRAM_RATE_LIMIT_BACKEND": "off",
+                    "TELEGRAM_REPLY_QUEUE": options["reply_queue"],
+                }
+                self.emulator = None
+                if options["bot_api"] == "emulator":
+                    self.emulator, base_url = stack.enter_context(
+                        running_emulator(
+                            BotApiEmulator(
+                                EmulatorConfig(
+                                    latency_ms=options["api_latency_ms"],
+                                    rate_limit=options["api_rate_limit"],
+                                ),
+                            ),
+                        ),
+                    )
+                    overrides["TELEGRAM_API_BASE_URL"] = base_url
+                stack.enter_context(override_settings(**overrides))
+                asyncio.run(self._run(options))
+        finally:
+            connection_created.disconnect(_install_counter)
+
+    async def _run(self, options):
+        # emulator: HTTPXRequest biasa ke TELEGRAM_API_BASE_URL
+        app = build_app(request=None if self.emulator else CannedBotApi())
+        app.add_error_handler(self._on_error)
+        await app.initialize()
+        webhook.set_application(app)
+        self.update_id = 0
+        self.handler_errors = 0
+        self.last_error = None
+        chat_ids = [options["chat_id"] + i for i in range(options["users"])]
+        results = []
+        # koneksi thread sync_to_async bersama (jalur polling) mungkin sudah
+        # terbuka sebelum signal terpasang
+        await sync_to_async(_install_counter)(None, connection)
+        try:
+            # user + subscription dibuat dulu (serial), tidak ikut diukur
+            for chat_id in chat_ids:
+                await self._send_polling(app, self._payload(chat_id, "/start"))
+
+            rng = random.Random(options["seed"])  # noqa: S311 (workload bisa diulang)
+            for target in options["targets"]:
+                workload = {
+                    chat_id: [
+                        synthetic_text(rng, options["tx_ratio"])
+                        for _ in range(options["per_user"])
+                    ]
+                    for chat_id in chat_ids
+                }
+                results.append(await self._run_target(target, app, workload, options))
+        finally:
+            webhook.set_application(None)
+            await app.shutdown()
+            if options["cleanup"]:
+                await TelegramUser.objects.filter(
+                    telegram_user_id__in=chat_ids,
+                ).adelete()
+
+        api_stats = self.emulator.stats() if self.emulator else None
+        if options["json"]:
+            self.stdout.write(json.dumps({"results": results, "bot_api": api_stats}))
+            return
+        self.stdout.write(
+            f"{options['users']} user x {options['per_user']} update, "
+            f"teks transaksi {options['tx_ratio']:.0%}",
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['target']:>7}  {row['throughput']:8.1f} update/s  "
+                f"p50 {row['p50_ms']:7.2f} ms  p95 {row['p95_ms']:7.2f} ms  "
+                f"p99 {row['p99_ms']:7.2f} ms  query/update {row['queries_avg']:.1f} "
+                f"(maks {row['queries_max']})  gagal http {row['http_errors']} "
+                f"handler {row['handler_errors']}",
+            )
+        if api_stats:
+            self.stdout.write(
+                f"emulator: {api_stats['calls']}  429: {api_stats['throttled']}",
+            )
+        if self.last_error:
+            self.stderr.write(f"error handler terakhir: {self.last_error}")
+
+    async def _on_error(self, update, context):
+        # exception handler tidak mengubah status HTTP webhook -> hitung di sini
+        self.handler_errors += 1
+        self.last_error = repr(context.error)
+
+    def _payload(self, chat_id: int, text: str) -> dict:
+        self.update_id += 1
+        return update_payload(self.update_id, chat_id, text)
+
+    async def _send_polling(self, app, data: dict) -> bool:
+        # jalur run_polling: Application.process_update langsung
+        await app.process_update(Update.de_json(data, app.bot))
+        return True
+
+    async def _send_asgi(self, route, data: dict, host: str) -> bool:
+        status = await asgi_post(
+            route,
+            BENCH_WEBHOOK_PATH,
+            json.dumps(data).encode(),
+            host=host,
+            headers=((webhook.SECRET_HEADER, BENCH_SECRET.encode()),),
+        )
+        return status == 200  # noqa: PLR2004
+
+    async def _run_target(self, target, app, workload, options) -> dict:
+        if target == "polling":
+
+            async def send(data):
+                return await self._send_polling(app, data)
+        else:
+            route = asgi.application if target == "webhook" else ASGIHandler()
+
+            async def send(data):
+                return await self._send_asgi(route, data, options["host"])
+
+        latencies = []
+        queries = []
+        errors = 0
+        self.handler_errors = 0
+
+        async def user_session(chat_id: int, texts: list[str]):
+            nonlocal errors
+            # update dari satu chat berurutan, antar chat bersamaan
+            for text in texts:
+                data = self._payload(chat_id, text)
+                counter = [0]
+                token = _update_queries.set(counter)
+                start = time.perf_counter()
+                try:
+                    ok = await send(data)
+                finally:
+                    _update_queries.reset(token)
+                latencies.append((time.perf_counter() - start) * 1000)
+                queries.append(counter[0])
+                errors += not ok
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(user_session(chat_id, texts) for chat_id, texts in workload.items()),
+        )
+        seconds = time.perf_counter() - start
+        return {
+            "target": target,
+            "updates": len(latencies),
+            "seconds": round(seconds, 3),
+            "throughput": round(len(latencies) / seconds, 1),
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "queries_avg": round(statistics.fmean(queries), 2),
+            "queries_max": max(queries),
+            "http_errors": errors,
+            "handler_errors": self.handler_errors,
+        }
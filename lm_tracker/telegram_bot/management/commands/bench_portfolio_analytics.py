@@ -0,0 +1,126 @@
+import random
+import time
+from datetime import date
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from lm_tracker.telegram_bot import analytics
+
+PRODUCTS = ("ANTAM", "UBS", "GALERI24", "")
+WEIGHTS = [Decimal(w) for w in ("0.5", "1", "2", "5", "10", "25", "50", "100")]
+SIDE_WEIGHTS = (70, 15, 12, 3)  # BUY, SELL, BUYBACK, FEE
+
+
+def _synthetic_rows(n: int, seed: int = 0) -> list[tuple]:
+    # baris "model" lama: (tanggal, asset, side, produk, berat Decimal, pcs, nominal)
+    rnd = random.Random(seed)  # noqa: S311
+    first = date(2020, 1, 1)
+    sides = rnd.choices(analytics.SIDES, weights=SIDE_WEIGHTS, k=n)
+    rows = []
+    for side in sides:
+        weight = rnd.choice(WEIGHTS) if side != "FEE" else None
+        pcs = rnd.randint(1, 3)
+        amount = int((weight or 1) * pcs * 1_500_000)
+        rows.append(
+            (
+                first + timedelta(days=rnd.randrange(2000)),
+                rnd.choice(analytics.ASSETS),
+                side,
+                rnd.choice(PRODUCTS),
+                weight,
+                pcs,
+                amount,
+            ),
+        )
+    return rows
+
+
+def _loop_report(rows: list[tuple]) -> dict:
+    # cara lama: loop per baris + akumulasi Decimal
+    totals, stock = {}, {"GOLD": Decimal(0), "SILVER": Decimal(0)}
+    buy_grams, buy_cost = {}, {}
+    by_month, by_product = {}, {}
+    for day, asset, side, product, weight, pcs, amount in rows:
+        totals[side] = totals.get(side, 0) + amount
+        month = by_month.setdefault(day.replace(day=1), {})
+        month[side] = month.get(side, 0) + amount
+        if weight is None:
+            continue
+        grams = Decimal(weight) * Decimal(pcs)
+        key = (asset, product)
+        if side == "BUY":
+            stock[asset] += grams
+            buy_grams[asset] = buy_grams.get(asset, 0) + grams
+            buy_cost[asset] = buy_cost.get(asset, 0) + amount
+            by_product[key] = by_product.get(key, 0) + grams
+        elif side in ("SELL", "BUYBACK"):
+            stock[asset] -= grams
+            by_product[key] = by_product.get(key, 0) - grams
+    return {"totals": totals, "stock": stock, "by_month": by_month}
+
+
+def _columnar_rows(rows: list[tuple]) -> list[tuple]:
+    # bentuk values_list(*LEDGER_COLUMNS): gram (berat x pcs) sudah float dari DB
+    return [
+        (day, asset, side, product, float(weight or 0) * pcs, amount)
+        for day, asset, side, product, weight, pcs, amount in rows
+    ]
+
+
+def _numpy_report(rows: list[tuple]) -> dict:
+    ledger = analytics.ledger_from_rows(rows)
+    return _numpy_compute(ledger)
+
+
+def _numpy_compute(ledger) -> dict:
+    return {
+        "totals": analytics.side_totals(ledger),
+        "stock": analytics.holdings(ledger),
+        "avg_cost": analytics.average_cost(ledger),
+        "by_month": analytics.cash_flow_by_period(ledger, "month"),
+        "products": analytics.product_breakdown(ledger),
+    }
+
+
+def _timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark analitik ledger: loop per baris (Decimal) vs kolom NumPy, "
+        "pakai ledger sintetis"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1_000, 100_000, 1_000_000],
+        )
+
+    def handle(self, *args, **options):
+        for n in options["rows"]:
+            rows = _synthetic_rows(n)
+            values = _columnar_rows(rows)
+            loop_ms, loop = _timed(_loop_report, rows)
+            numpy_ms, result = _timed(_numpy_report, values)
+            load_ms, ledger = _timed(analytics.ledger_from_rows, values)
+            compute_ms, _ = _timed(_numpy_compute, ledger)
+
+            self.stdout.write(
+                f"{n:>9} baris  loop {loop_ms:9.1f} ms  "
+                f"numpy {numpy_ms:9.1f} ms "
+                f"(kolom {load_ms:.1f} ms + hitung {compute_ms:.1f} ms)  "
+                f"speedup {loop_ms / numpy_ms:.1f}x",
+            )
+            if loop["totals"] != result["totals"]:
+                self.stderr.write("  TOTAL BERBEDA antara loop dan numpy!")
+            for asset, grams in loop["stock"].items():
+                if abs(float(grams) - result["stock"][asset]) > 1e-6 * n:
+                    self.stderr.write(f"  STOK {asset} BERBEDA antara loop dan numpy!")
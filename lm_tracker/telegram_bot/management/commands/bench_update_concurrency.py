@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+
+from lm_tracker.telegram_bot import webhook
+from lm_tracker.telegram_bot.bench import BENCH_TOKEN
+from lm_tracker.telegram_bot.bench import CannedBotApi
+from lm_tracker.telegram_bot.bench import update_payload
+from lm_tracker.telegram_bot.telegram_app import build_app
+
+MODES = {
+    "bersama": False,  # satu executor thread-sensitive untuk semua update
+    "per-update": True,  # ThreadSensitiveContext per update
+}
+
+
+def _rtt_wrapper(seconds: float):
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    return wrapper
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark throughput update bot (update/detik) saat user simultan naik "
+        "dari 1 ke 500. Bot API ditiru (tanpa network); membuat TelegramUser "
+        "mulai dari --chat-id di DB."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            nargs="+",
+            default=[1, 10, 50, 100, 250, 500],
+        )
+        parser.add_argument("--per-user", type=int, default=4)
+        parser.add_argument("--text", default="/today")
+        parser.add_argument("--chat-id", type=int, default=910_000_000)
+        parser.add_argument(
+            "--db-rtt-ms",
+            type=float,
+            default=0,
+            help="simulasi round-trip DB per query (DB lokal / SQLite ~0 ms)",
+        )
+
+    def handle(self, *args, **options):
+        wrapper = _rtt_wrapper(options["db_rtt_ms"] / 1000)
+
+        def add_rtt(sender, connection, **kwargs):
+            connection.execute_wrappers.append(wrapper)
+
+        if options["db_rtt_ms"]:
+            connection_created.connect(add_rtt, weak=False)
+        try:
+            with override_settings(
+                TELEGRAM_BOT_TOKEN=settings.TELEGRAM_BOT_TOKEN or BENCH_TOKEN,
+                TELEGRAM_RATE_LIMIT_BACKEND="off",
+                TELEGRAM_REPLY_QUEUE=False,
+            ):
+                asyncio.run(self._run(options))
+        finally:
+            connection_created.disconnect(add_rtt)
+
+    async def _run(self, options):
+        app = build_app(request=CannedBotApi())
+        await app.initialize()
+        webhook.set_application(app)
+        self.update_id = 0
+        try:
+            # user + subscription dibuat dulu (serial) supaya yang diukur jalur baca
+            await self._burst(max(options["users"]), 1, options, isolate=False)
+            self.stdout.write(
+                f"concurrency slot: {settings.TELEGRAM_UPDATE_CONCURRENCY}",
+            )
+            for users in options["users"]:
+                line = [f"{users:>4} user"]
+                for mode, isolate in MODES.items():
+                    seconds = await self._burst(
+                        users,
+                        options["per_user"],
+                        options,
+                        isolate=isolate,
+                    )
+                    rate = users * options["per_user"] / seconds
+                    line.append(f"{mode} {rate:8.1f} update/s")
+                self.stdout.write("  ".join(line))
+        finally:
+            webhook.set_application(None)
+            await app.shutdown()
+
+    async def _burst(self, users, per_user, options, *, isolate) -> float:
+        async def user_session(chat_id: int):
+            # update dari satu chat berurutan, antar chat bersamaan
+            for _ in range(per_user):
+                self.update_id += 1
+                data = update_payload(self.update_id, chat_id, options["text"])
+                await webhook.process_update_json(data, isolate=isolate)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(user_session(options["chat_id"] + i) for i in range(users)),
+        )
+        return time.perf_counter() - start
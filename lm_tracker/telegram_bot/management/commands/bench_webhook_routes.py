@@ -0,0 +1,83 @@
+import asyncio
+import json
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from lm_tracker.telegram_bot import webhook
+from lm_tracker.telegram_bot.bench import BENCH_SECRET
+from lm_tracker.telegram_bot.bench import BENCH_TOKEN
+from lm_tracker.telegram_bot.bench import BENCH_WEBHOOK_PATH
+from lm_tracker.telegram_bot.bench import CannedBotApi
+from lm_tracker.telegram_bot.bench import asgi_post
+from lm_tracker.telegram_bot.bench import latency_stats
+from lm_tracker.telegram_bot.bench import update_payload
+from lm_tracker.telegram_bot.telegram_app import build_app
+
+
+async def _call(app, host: str, body: bytes) -> tuple[int, float]:
+    start = time.perf_counter()
+    status = await asgi_post(
+        app,
+        BENCH_WEBHOOK_PATH,
+        body,
+        host=host,
+        headers=((webhook.SECRET_HEADER, BENCH_SECRET.encode()),),
+    )
+    return status, (time.perf_counter() - start) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark latensi webhook: handler Django (middleware penuh) vs route "
+        "ASGI ringan. Bot API ditiru (tanpa network); membuat TelegramUser "
+        "dengan --chat-id di DB."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--text", default="/today")
+        parser.add_argument("--chat-id", type=int, default=900_000_001)
+        parser.add_argument("--host", default="localhost")
+
+    def handle(self, *args, **options):
+        with override_settings(
+            TELEGRAM_BOT_TOKEN=settings.TELEGRAM_BOT_TOKEN or BENCH_TOKEN,
+            TELEGRAM_WEBHOOK_SECRET_TOKEN=BENCH_SECRET,
+            # satu chat mengirim ratusan update; yang diukur route, bukan limiter
+            TELEGRAM_RATE_LIMIT_BACKEND="off",
+            TELEGRAM_REPLY_QUEUE=False,
+        ):
+            asyncio.run(self._run(options))
+
+    async def _run(self, options):
+        app = build_app(request=CannedBotApi())
+        await app.initialize()
+        webhook.set_application(app)
+        routes = {
+            "django": ASGIHandler(),
+            "ringan": webhook.telegram_webhook_app,
+        }
+        update_id = 0
+        try:
+            for name, route in routes.items():
+                samples = []
+                for i in range(options["warmup"] + options["requests"]):
+                    update_id += 1
+                    body = json.dumps(
+                        update_payload(update_id, options["chat_id"], options["text"]),
+                    ).encode()
+                    status, ms = await _call(route, options["host"], body)
+                    if status != 200:  # noqa: PLR2004
+                        self.stderr.write(f"{name}: HTTP {status}")
+                        return
+                    if i >= options["warmup"]:
+                        samples.append(ms)
+                self.stdout.write(f"{name:>7}  {latency_stats(samples)}")
+        finally:
+            webhook.set_application(None)
+            await app.shutdown()
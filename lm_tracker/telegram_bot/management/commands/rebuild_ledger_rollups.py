@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from lm_tracker.telegram_bot.models import TelegramUser
+from lm_tracker.telegram_bot.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang rekap harian ledger (DailyLedgerRollup) dari transaksi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            help="telegram_user_id (default: semua user)",
+        )
+
+    def handle(self, *args, **options):
+        users = TelegramUser.objects.order_by("id")
+        if options["user"]:
+            users = users.filter(telegram_user_id__in=options["user"])
+
+        total_users = total_days = 0
+        for telegram_user in users.iterator():
+            with transaction.atomic():
+                total_days += rebuild_rollups(telegram_user)
+            total_users += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"{total_users} user, {total_days} hari direkap"),
+        )
@@ -0,0 +1,51 @@
+import uvicorn
+from django.core.management.base import BaseCommand
+
+from lm_tracker.telegram_bot.bot_api_emulator import BotApiEmulator
+from lm_tracker.telegram_bot.bot_api_emulator import EmulatorConfig
+
+
+class Command(BaseCommand):
+    help = (
+        "Jalankan emulator Bot API Telegram lokal (tanpa network) untuk test / "
+        "benchmark. Arahkan bot dengan TELEGRAM_API_BASE_URL=http://<host>:<port>; "
+        "update masuk dikirim lewat POST /emulator/updates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8081)
+        parser.add_argument("--latency-ms", type=float, default=0)
+        parser.add_argument("--jitter-ms", type=float, default=0)
+        parser.add_argument(
+            "--rate-limit",
+            type=int,
+            default=0,
+            help="pesan keluar per detik sebelum 429 (0 = tanpa batas)",
+        )
+        parser.add_argument(
+            "--flood-ratio",
+            type=float,
+            default=0,
+            help="peluang 429 acak per pesan keluar (0..1)",
+        )
+        parser.add_argument("--retry-after", type=int, default=1)
+        parser.add_argument("--seed", type=int)
+
+    def handle(self, *args, **options):
+        emulator = BotApiEmulator(
+            EmulatorConfig(
+                latency_ms=options["latency_ms"],
+                jitter_ms=options["jitter_ms"],
+                rate_limit=options["rate_limit"],
+                flood_ratio=options["flood_ratio"],
+                retry_after=options["retry_after"],
+                seed=options["seed"],
+            ),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Bot API emulator di http://{options['host']}:{options['port']}",
+            ),
+        )
+        uvicorn.run(emulator, host=options["host"], port=options["port"])
@@ -1,12 +1,112 @@
+import asyncio
+import contextlib
+import json
+import signal
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from prometheus_client import start_http_server
+from telegram import Bot
 
+from lm_tracker.telegram_bot import update_stream
+from lm_tracker.telegram_bot import webhook
+from lm_tracker.telegram_bot.telegram_app import api_base_urls
 from lm_tracker.telegram_bot.telegram_app import build_app
 
+MODES = ("polling", "fetcher", "consumer", "stats")
+
 
 class Command(BaseCommand):
-    help = "Run Telegram bot untuk pencatatan transaksi emas/perak"
+    help = (
+        "Run Telegram bot untuk pencatatan transaksi emas/perak. "
+        "--mode polling: satu proses (default); fetcher + consumer: getUpdates "
+        "dibagi ke N proses consumer lewat Redis stream (shard per user); "
+        "stats: lag / pending per shard"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=MODES, default="polling")
+        parser.add_argument("--batch", type=int, default=50)
+        parser.add_argument("--name", help="nama consumer (default host-pid)")
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            help="expose metrik Prometheus handler di http://0.0.0.0:<port>/",
+        )
 
     def handle(self, *args, **options):
-        application = build_app()
-        self.stdout.write(self.style.SUCCESS("Bot running (polling). Ctrl+C to stop."))
-        application.run_polling()
+        mode = options["mode"]
+        if options["metrics_port"]:
+            start_http_server(options["metrics_port"])
+        if mode == "polling":
+            application = build_app()
+            self.stdout.write(
+                self.style.SUCCESS("Bot running (polling). Ctrl+C to stop."),
+            )
+            application.run_polling()
+            return
+        asyncio.run(getattr(self, f"_run_{mode}")(options))
+
+    def _stop_event(self) -> asyncio.Event:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        return stop
+
+    async def _run_fetcher(self, options):
+        stop = self._stop_event()
+        redis = update_stream.redis_client()
+        async with Bot(settings.TELEGRAM_BOT_TOKEN, **api_base_urls()) as bot:
+            # getUpdates ditolak selama webhook aktif
+            await bot.delete_webhook(drop_pending_updates=False)
+            fetcher = asyncio.create_task(
+                update_stream.run_fetcher(
+                    redis,
+                    bot,
+                    shards=settings.TELEGRAM_UPDATE_SHARDS,
+                    maxlen=settings.TELEGRAM_UPDATE_STREAM_MAXLEN,
+                ),
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Fetcher running ({settings.TELEGRAM_UPDATE_SHARDS} shard).",
+                ),
+            )
+            waiter = asyncio.create_task(stop.wait())
+            await asyncio.wait({fetcher, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            # offset disimpan bareng XADD, jadi aman dibatalkan di tengah long-poll
+            fetcher.cancel()
+            waiter.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await fetcher
+        await redis.aclose()
+
+    async def _run_consumer(self, options):
+        stop = self._stop_event()
+        redis = update_stream.redis_client()
+        app = await webhook.get_application()
+        consumer = update_stream.ShardConsumer(
+            redis,
+            webhook.process_update_json,
+            shards=settings.TELEGRAM_UPDATE_SHARDS,
+            batch=options["batch"],
+            name=options["name"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Consumer {consumer.name} running."))
+        try:
+            await consumer.run(stop)
+        finally:
+            await app.shutdown()
+            await redis.aclose()
+
+    async def _run_stats(self, options):
+        redis = update_stream.redis_client()
+        try:
+            stats = await update_stream.stream_stats(
+                redis,
+                settings.TELEGRAM_UPDATE_SHARDS,
+            )
+        finally:
+            await redis.aclose()
+        self.stdout.write(json.dumps(stats, indent=2))
@@ -1,13 +1,16 @@
+import asyncio
+
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from telegram import Bot
 
+from lm_tracker.telegram_bot.telegram_app import api_base_urls
+
 
 class Command(BaseCommand):
     help = "Set Telegram webhook to Django endpoint"
 
     def handle(self, *args, **options):
-        bot = Bot(settings.TELEGRAM_BOT_TOKEN)
         url = settings.PUBLIC_WEBHOOK_URL
         secret = settings.TELEGRAM_WEBHOOK_SECRET_TOKEN
 
@@ -15,5 +18,10 @@ class Command(BaseCommand):
             self.stderr.write("PUBLIC_WEBHOOK_URL is empty")
             return
 
-        bot.set_webhook(url=url, secret_token=secret or None)
+        asyncio.run(self._set_webhook(url, secret))
         self.stdout.write(f"Webhook set: {url}")
+
+    async def _set_webhook(self, url: str, secret: str) -> None:
+        # Bot PTB async: set_webhook harus di-await
+        async with Bot(settings.TELEGRAM_BOT_TOKEN, **api_base_urls()) as bot:
+            await bot.set_webhook(url=url, secret_token=secret or None)
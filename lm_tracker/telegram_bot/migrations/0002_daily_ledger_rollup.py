@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyLedgerRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('tx_count', models.IntegerField(default=0)),
+                ('buy_amount', models.BigIntegerField(default=0)),
+                ('sell_amount', models.BigIntegerField(default=0)),
+                ('buyback_amount', models.BigIntegerField(default=0)),
+                ('fee_amount', models.BigIntegerField(default=0)),
+                ('gold_grams_in', models.DecimalField(decimal_places=3, default=0, max_digits=18)),
+                ('gold_grams_out', models.DecimalField(decimal_places=3, default=0, max_digits=18)),
+                ('silver_grams_in', models.DecimalField(decimal_places=3, default=0, max_digits=18)),
+                ('silver_grams_out', models.DecimalField(decimal_places=3, default=0, max_digits=18)),
+                ('telegram_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='telegram_bot.telegramuser')),
+            ],
+            options={
+                'ordering': ['telegram_user', '-day'],
+                'constraints': [models.UniqueConstraint(fields=('telegram_user', 'day'), name='uniq_daily_ledger_rollup_user_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_bot', '0003_user_timezone_tx_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['telegram_user', 'tx_date', 'id'], name='tx_user_date_id_idx'),
+        ),
+    ]
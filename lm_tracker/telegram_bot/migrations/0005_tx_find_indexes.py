@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:13
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_bot', '0004_tx_user_date_id_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['telegram_user', 'product'], name='tx_user_product_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('note'), name='gin_trgm_ops'), name='tx_note_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('product'), name='gin_trgm_ops'), name='tx_product_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_bot', '0005_tx_find_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='telegramuser',
+            name='is_chat',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='telegramuser',
+            name='shared_ledger',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='recorded_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recorded_transactions', to='telegram_bot.telegramuser'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_bot', '0006_chat_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='reminded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
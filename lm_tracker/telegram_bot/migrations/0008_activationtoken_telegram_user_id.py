@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('telegram_bot', '0007_subscription_reminded_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activationtoken',
+            name='telegram_user_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,12 +1,22 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from model_utils.models import TimeStampedModel
 
 
 class TelegramUser(TimeStampedModel):
+    # user: id user Telegram (positif); akun grup: chat id (negatif)
     telegram_user_id = models.BigIntegerField(unique=True)
     username = models.CharField(max_length=64, blank=True, default="")
     name = models.CharField(max_length=128, blank=True, default="")
+    # nama IANA (mis. Asia/Makassar); kosong = settings.TIME_ZONE
+    timezone = models.CharField(max_length=64, blank=True, default="")
+
+    # akun ledger level chat (grup): transaksi semua anggota masuk ke sini
+    is_chat = models.BooleanField(default=False)
+    shared_ledger = models.BooleanField(default=False)
 
     def __str__(self):
         return f"{self.telegram_user_id} @{self.username}"
@@ -38,6 +48,8 @@ class Subscription(TimeStampedModel):
         default=STATUS_ACTIVE,
     )
     current_period_end = models.DateTimeField(null=True, blank=True)
+    # pengingat perpanjangan periode ini sudah dikirim (reset saat aktivasi)
+    reminded_at = models.DateTimeField(null=True, blank=True)
 
     def is_pro_active(self) -> bool:
         if self.plan != self.PLAN_PRO or self.status != self.STATUS_ACTIVE:
@@ -50,6 +62,9 @@ class Subscription(TimeStampedModel):
 class ActivationToken(TimeStampedModel):
     token = models.CharField(max_length=64, unique=True)
     plan = models.CharField(max_length=10, default=Subscription.PLAN_PRO)
+    # akun yang dibayar (?tg= checkout): user, atau id chat (negatif) untuk
+    # ledger grup; kosong = akun yang membuka link aktivasi
+    telegram_user_id = models.BigIntegerField(null=True, blank=True)
     expires_at = models.DateTimeField()
     used_at = models.DateTimeField(null=True, blank=True)
 
@@ -99,9 +114,86 @@ class Transaction(TimeStampedModel):
 
     chat_id = models.BigIntegerField(null=True, blank=True)
     message_id = models.BigIntegerField(null=True, blank=True)
+    # anggota yang mencatat (ledger grup); null = pemilik ledger sendiri
+    recorded_by = models.ForeignKey(
+        TelegramUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="recorded_transactions",
+    )
+
+    class Meta:
+        indexes = [
+            # range scan periode (periods.Period.q) per user
+            models.Index(
+                fields=["telegram_user", "created"],
+                name="tx_user_created_idx",
+            ),
+            # keyset pagination /list: (tx_date, id) per user
+            models.Index(
+                fields=["telegram_user", "tx_date", "id"],
+                name="tx_user_date_id_idx",
+            ),
+            # /find: filter produk persis per user
+            models.Index(
+                fields=["telegram_user", "product"],
+                name="tx_user_product_idx",
+            ),
+            # /find teks bebas: icontains = UPPER(kolom) LIKE '%..%' di Postgres,
+            # jadi index trigram (pg_trgm) dibuat di atas UPPER(kolom)
+            GinIndex(
+                OpClass(Upper("note"), name="gin_trgm_ops"),
+                name="tx_note_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("product"), name="gin_trgm_ops"),
+                name="tx_product_trgm_idx",
+            ),
+        ]
 
     @property
     def total_weight(self):
         if self.weight_gram is None:
             return None
         return self.weight_gram * self.pcs
+
+
+class DailyLedgerRollup(models.Model):
+    """
+    Rekap transaksi per user per hari (tx_date), di-update saat transaksi
+    dibuat / dihapus. Laporan periode (/week, /month, /report) cukup SUM
+    baris di rentang tanggal: maksimal ~365 baris per tahun per user.
+    """
+
+    telegram_user = models.ForeignKey(
+        TelegramUser,
+        on_delete=models.CASCADE,
+        related_name="daily_rollups",
+    )
+    day = models.DateField()
+    tx_count = models.IntegerField(default=0)
+
+    # cashflow per side (IDR)
+    buy_amount = models.BigIntegerField(default=0)
+    sell_amount = models.BigIntegerField(default=0)
+    buyback_amount = models.BigIntegerField(default=0)
+    fee_amount = models.BigIntegerField(default=0)
+
+    # gram masuk (BUY) / keluar (SELL + BUYBACK) per asset
+    gold_grams_in = models.DecimalField(max_digits=18, decimal_places=3, default=0)
+    gold_grams_out = models.DecimalField(max_digits=18, decimal_places=3, default=0)
+    silver_grams_in = models.DecimalField(max_digits=18, decimal_places=3, default=0)
+    silver_grams_out = models.DecimalField(max_digits=18, decimal_places=3, default=0)
+
+    class Meta:
+        ordering = ["telegram_user", "-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["telegram_user", "day"],
+                name="uniq_daily_ledger_rollup_user_day",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.telegram_user_id} {self.day}"
@@ -70,7 +70,7 @@ def _is_alnum_brand(tok: str) -> bool:
     return re.fullmatch(r"[A-Za-z][A-Za-z0-9]*", tok) is not None
 
 
-def _norm_amount(s: str) -> int:
+def norm_amount(s: str) -> int:
     s = s.lower().replace("rp", "").replace(" ", "")
     s = s.replace(".", "")
     s = s.replace(",", "")  # kalau user pakai koma sebagai ribuan
@@ -78,7 +78,7 @@ def _norm_amount(s: str) -> int:
     return int(digits) if digits else 0
 
 
-def _note_raw_text(raw: str) -> tuple[str, str, str]:
+def note_raw_text(raw: str) -> tuple[str, str, str]:
     lower = raw.lower()
     m_note = re.search(
         r"(note|catatan|penjual|pembeli)\s*[:=]\s*(.+)$",
@@ -103,7 +103,7 @@ def parse_transaction(text: str) -> ParsedTxn | None:
         return None
 
     # NOTE
-    note, raw_wo_note, lower_wo_note = _note_raw_text(raw)
+    note, raw_wo_note, lower_wo_note = note_raw_text(raw)
 
     # SIDE
     first_word = lower_wo_note.split()[0] if lower_wo_note.split() else ""
@@ -145,12 +145,12 @@ def parse_transaction(text: str) -> ParsedTxn | None:
     total_amount = 0
     m_t = re.search(r"total\s*[:=]?\s*(rp\s*)?([\d.,]+)", lower_wo_note)
     if m_t:
-        total_amount = _norm_amount(m_t.group(2))
+        total_amount = norm_amount(m_t.group(2))
     else:
         # fallback: ambil angka terbesar
         nums = re.findall(r"[\d][\d.,]+", lower_wo_note)
         if nums:
-            total_amount = max(_norm_amount(x) for x in nums)
+            total_amount = max(norm_amount(x) for x in nums)
 
     if total_amount <= 0:
         return None
@@ -0,0 +1,118 @@
+"""
+Batas periode (hari / minggu / bulan / rentang tanggal) per user.
+
+Semua laporan, kuota dan export memakai Period yang sama: rentang half-open
+[start, end) dalam UTC, dihitung dari tengah malam di timezone user
+(default settings.TIME_ZONE = Asia/Jakarta). Query cukup
+`created__gte=start, created__lt=end` (index telegram_user + created), rekap
+harian cukup `day__gte=first_day, day__lt=end_day`, dan cache key periode
+ikut `Period.key` supaya semuanya selaras.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+from zoneinfo import ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from .models import TelegramUser
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIOD_RANGE = "range"
+
+
+@dataclass(frozen=True)
+class Period:
+    kind: str
+    first_day: date  # tanggal lokal pertama (inklusif)
+    end_day: date  # tanggal lokal sesudah periode (eksklusif)
+    start: datetime  # UTC, inklusif
+    end: datetime  # UTC, eksklusif
+
+    @property
+    def last_day(self) -> date:
+        return self.end_day - timedelta(days=1)
+
+    @property
+    def key(self) -> str:
+        # sama untuk semua user dengan timezone yang sama
+        return f"{self.kind}:{self.start:%Y%m%dT%H%M}:{self.end:%Y%m%dT%H%M}"
+
+    def q(self, field: str = "created") -> Q:
+        return Q(**{f"{field}__gte": self.start, f"{field}__lt": self.end})
+
+    def day_q(self, field: str = "day") -> Q:
+        return Q(**{f"{field}__gte": self.first_day, f"{field}__lt": self.end_day})
+
+
+def valid_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def user_tz(telegram_user: TelegramUser | None) -> ZoneInfo:
+    name = getattr(telegram_user, "timezone", "") or settings.TIME_ZONE
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.TIME_ZONE)
+
+
+def local_today(telegram_user: TelegramUser | None) -> date:
+    return timezone.now().astimezone(user_tz(telegram_user)).date()
+
+
+def _midnight_utc(day: date, tz: ZoneInfo) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=tz).astimezone(UTC)
+
+
+def date_range(
+    telegram_user: TelegramUser | None,
+    first_day: date,
+    end_day: date,
+    kind: str = PERIOD_RANGE,
+) -> Period:
+    """Periode tanggal lokal first_day..end_day (end_day eksklusif)."""
+    tz = user_tz(telegram_user)
+    return Period(
+        kind=kind,
+        first_day=first_day,
+        end_day=end_day,
+        start=_midnight_utc(first_day, tz),
+        end=_midnight_utc(end_day, tz),
+    )
+
+
+def day_period(telegram_user: TelegramUser | None, day: date | None = None) -> Period:
+    day = day or local_today(telegram_user)
+    return date_range(telegram_user, day, day + timedelta(days=1), PERIOD_DAY)
+
+
+def week_period(telegram_user: TelegramUser | None, day: date | None = None) -> Period:
+    # minggu Senin - Minggu
+    day = day or local_today(telegram_user)
+    first = day - timedelta(days=day.weekday())
+    return date_range(telegram_user, first, first + timedelta(days=7), PERIOD_WEEK)
+
+
+def month_period(telegram_user: TelegramUser | None, day: date | None = None) -> Period:
+    day = day or local_today(telegram_user)
+    first = day.replace(day=1)
+    end = (first + timedelta(days=32)).replace(day=1)
+    return date_range(telegram_user, first, end, PERIOD_MONTH)
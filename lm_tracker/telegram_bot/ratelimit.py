@@ -0,0 +1,211 @@
+"""
+Rate limit per user (token bucket) sebelum handler bot mana pun jalan.
+
+Dipasang di build_app() sebagai TypeHandler group -1: update yang melewati
+batas dihentikan (ApplicationHandlerStop) sebelum ada query DB, dan user cukup
+diberi tahu sekali per banjir pesan. Yang dihitung hanya update yang memang
+diproses handler (command / callback bot ini, teks yang terbaca sebagai
+transaksi); obrolan biasa di grup tidak memakan jatah. Teks cukup di-parse
+sekali per update: hasilnya disimpan di context dan dipakai ulang msg_text
+(update_transaction).
+
+Bucket disimpan sebagai GCRA (setara token bucket, cukup satu timestamp
+"theoretical arrival time" per user): isi ulang TELEGRAM_RATE_LIMIT_RATE token
+per detik, kapasitas TELEGRAM_RATE_LIMIT_BURST. Biaya per command di
+TELEGRAM_RATE_LIMIT_COSTS (default 1).
+
+Backend "memory" per proses; "redis" dibagi antar worker / consumer (kalau
+Redis error, jatuh ke bucket memory supaya bot tetap jalan).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from functools import cache
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from redis.exceptions import RedisError
+from redis.exceptions import WatchError
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop
+from telegram.ext import TypeHandler
+
+from .instrumentation import parse_timer
+from .parser import parse_transaction
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from telegram.error import RetryAfter
+    from telegram.ext import ContextTypes
+
+    from .parser import ParsedTxn
+
+logger = logging.getLogger(__name__)
+
+RATE_KEY = "telegram_bot:ratelimit:{user_id}"
+# hasil parse teks di CallbackContext (satu context per update, dipakai semua group)
+PARSED_TXN_ATTR = "parsed_txn"
+CALLBACK_COST_KEY = "callback"
+MAX_MEMORY_KEYS = 50_000
+WATCH_RETRIES = 3
+
+
+def retry_after_seconds(err: RetryAfter) -> float:
+    """Lama tunggu 429 dari Bot API (int detik, atau timedelta di PTB baru)."""
+    retry_after = err.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class MemoryBuckets:
+    def __init__(self, rate: float, burst: int):
+        self.burst = burst
+        self.interval = 1 / rate
+        self.tolerance = burst * self.interval
+        self._tat: dict[int, float] = {}
+
+    async def take(self, user_id: int, cost: int) -> float:
+        """0 kalau boleh, selain itu detik sampai cukup token."""
+        # command yang lebih mahal dari kapasitas tetap bisa jalan saat bucket penuh
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        tat = max(self._tat.get(user_id, now), now)
+        new_tat = tat + cost * self.interval
+        wait = new_tat - now - self.tolerance
+        if wait > 0:
+            return wait
+        self._tat[user_id] = new_tat
+        if len(self._tat) > MAX_MEMORY_KEYS:
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        # bucket yang sudah penuh lagi sama dengan user baru -> buang
+        self._tat = {k: t for k, t in self._tat.items() if t > now}
+
+
+class RedisBuckets:
+    def __init__(self, redis: Redis, rate: float, burst: int):
+        self.redis = redis
+        self.burst = burst
+        self.interval = 1 / rate
+        self.tolerance = burst * self.interval
+        self.fallback = MemoryBuckets(rate, burst)
+
+    async def take(self, user_id: int, cost: int) -> float:
+        cost = min(cost, self.burst)
+        try:
+            return await self._take(RATE_KEY.format(user_id=user_id), cost)
+        except RedisError:
+            logger.warning("rate limit Redis gagal, pakai bucket memory")
+            return await self.fallback.take(user_id, cost)
+
+    async def _take(self, key: str, cost: int) -> float:
+        for _ in range(WATCH_RETRIES):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key)
+                    now = time.time()
+                    tat = max(float(await pipe.get(key) or now), now)
+                    new_tat = tat + cost * self.interval
+                    wait = new_tat - now - self.tolerance
+                    if wait > 0:
+                        return wait
+                    pipe.multi()
+                    pipe.set(key, new_tat, px=int((new_tat - now) * 1000) + 1)
+                    await pipe.execute()
+                except WatchError:
+                    continue
+                return 0.0
+        # update bersamaan dari user yang sama terus-menerus: anggap banjir
+        return cost * self.interval
+
+
+@cache
+def get_buckets() -> MemoryBuckets | RedisBuckets:
+    rate = settings.TELEGRAM_RATE_LIMIT_RATE
+    burst = settings.TELEGRAM_RATE_LIMIT_BURST
+    if settings.TELEGRAM_RATE_LIMIT_BACKEND == "redis":
+        from .update_stream import redis_client  # noqa: PLC0415
+
+        return RedisBuckets(redis_client(), rate, burst)
+    return MemoryBuckets(rate, burst)
+
+
+def update_cost(update: Update) -> int:
+    costs = settings.TELEGRAM_RATE_LIMIT_COSTS
+    if update.callback_query is not None:
+        return costs.get(CALLBACK_COST_KEY, costs.get("default", 1))
+    text = (update.effective_message and update.effective_message.text) or ""
+    if text.startswith("/"):
+        command = text.split(maxsplit=1)[0][1:].split("@", 1)[0].lower()
+        return costs.get(command, costs.get("default", 1))
+    return costs.get("default", 1)
+
+
+_notified_until: dict[int, float] = {}
+
+
+def _should_notify(user_id: int, wait: float) -> bool:
+    # satu pemberitahuan per banjir, bukan per pesan
+    now = time.monotonic()
+    if _notified_until.get(user_id, 0) > now:
+        return False
+    if len(_notified_until) > MAX_MEMORY_KEYS:
+        _notified_until.clear()
+    _notified_until[user_id] = now + wait
+    return True
+
+
+def update_transaction(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+) -> ParsedTxn | None:
+    """parse_transaction teks update, sekali per update (guard lalu msg_text)."""
+    if hasattr(context, PARSED_TXN_ATTR):
+        return getattr(context, PARSED_TXN_ATTR)
+    text = (update.effective_message and update.effective_message.text) or ""
+    with parse_timer():
+        parsed = parse_transaction(text) if text else None
+    setattr(context, PARSED_TXN_ATTR, parsed)
+    return parsed
+
+
+def is_handled(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+    """Apakah update ini akan diproses salah satu handler bot (bukan guard)."""
+    text = (update.effective_message and update.effective_message.text) or ""
+    if update.callback_query is None and not text.startswith("/"):
+        # teks biasa: hanya yang dibaca msg_text sebagai transaksi
+        return bool(text) and update_transaction(update, context) is not None
+    # command / callback: harus cocok handler terdaftar (bukan /cmd@bot_lain)
+    return any(
+        handler.check_update(update)
+        for group, handlers in context.application.handlers.items()
+        if group >= 0
+        for handler in handlers
+    )
+
+
+async def rate_limit_guard(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    user = update.effective_user
+    if user is None or not is_handled(update, context):
+        return
+    wait = await get_buckets().take(user.id, update_cost(update))
+    if wait <= 0:
+        return
+
+    if _should_notify(user.id, wait):
+        text = f"⏳ Terlalu banyak pesan. Coba lagi dalam {max(1, round(wait))} detik."
+        if update.callback_query is not None:
+            await update.callback_query.answer(text)
+        elif update.effective_message is not None:
+            await update.effective_message.reply_text(text)
+    raise ApplicationHandlerStop
+
+
+def rate_limit_handler() -> TypeHandler:
+    return TypeHandler(Update, rate_limit_guard)
@@ -0,0 +1,227 @@
+"""
+Antrean balasan keluar per chat: pacing rate limit Telegram + penggabungan.
+
+Dipasang di build_app() sebagai rate limiter PTB (ExtBot memanggil
+process_request untuk setiap request Bot API), jadi handler tetap memakai
+reply_text / edit_message_text biasa:
+
+  - pesan ke chat (QUEUED_ENDPOINTS) masuk antrean FIFO per chat dan handler
+    langsung lanjut (fire-and-forget): update slot webhook / consumer dan
+    koneksi DB-nya tidak ikut tertahan pacing, dan webhook langsung dijawab
+    (Telegram tidak mengirim ulang update yang sudah dicatat). Hasil yang
+    diterima handler hanya Message pengganti (message_id 0); gagal kirim
+    dicatat di log, bukan dilempar ke handler.
+  - tiap antrean dikirim berurutan dengan jatah Telegram: chat pribadi
+    ~1 pesan/detik (burst kecil), grup 20 pesan/menit, total bot 30 pesan/detik
+    (GCRA, sama dengan ratelimit.MemoryBuckets). Chat yang idle langsung
+    dikirim tanpa menunggu.
+  - selama satu chat menunggu giliran, sendMessage teks biasa berturut-turut
+    (opsi sama, tanpa keyboard) digabung jadi satu pesan (maks 4096 karakter);
+    editMessageText ke pesan yang sama cukup dikirim versi terakhirnya.
+  - 429 (RetryAfter) ditunggu lalu dicoba ulang di antrean chat tersebut.
+
+Request lain (getChatMember, answerCallbackQuery, setWebhook, ...) langsung
+dikirim. Antrean & bucket per proses: dengan beberapa worker webhook satu chat
+bisa dilayani lebih dari satu proses, jadi jatah per chat hanya perkiraan
+(429 tetap ditangani lewat retry). Koneksi HTTP keep-alive dipakai bersama
+lewat HTTPXRequest Application.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+
+from telegram.constants import MessageLimit
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from .ratelimit import MemoryBuckets
+from .ratelimit import retry_after_seconds
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Coroutine
+
+logger = logging.getLogger(__name__)
+
+PRIVATE_CHAT_RATE = 1.0  # pesan / detik
+PRIVATE_CHAT_BURST = 3
+GROUP_CHAT_RATE = 20 / 60
+GROUP_CHAT_BURST = 5
+GLOBAL_RATE = 30.0
+GLOBAL_BURST = 30
+MAX_RETRIES = 3
+MESSAGE_SEPARATOR = "\n\n"
+# method yang mengirim / mengubah pesan di chat (kena jatah pesan Telegram)
+QUEUED_ENDPOINTS = {"sendMessage", "sendPhoto", "sendDocument", "editMessageText"}
+# sendMessage dengan opsi di luar ini (keyboard, entities, reply) tidak digabung
+MERGEABLE_KEYS = {
+    "chat_id",
+    "text",
+    "parse_mode",
+    "disable_notification",
+    "link_preview_options",
+    "message_thread_id",
+}
+
+
+@dataclass
+class _Request:
+    callback: Callable[..., Coroutine[Any, Any, Any]]
+    endpoint: str
+    data: dict
+    kwargs: dict
+    merged: int = 0  # request lain yang ikut digabung ke sini
+
+    def merge_key(self) -> tuple | None:
+        if self.endpoint == "sendMessage" and set(self.data) <= MERGEABLE_KEYS:
+            return tuple(sorted((k, v) for k, v in self.data.items() if k != "text"))
+        return None
+
+    def edit_key(self) -> tuple | None:
+        if self.endpoint == "editMessageText" and "message_id" in self.data:
+            return (self.data.get("chat_id"), self.data["message_id"])
+        return None
+
+
+def _placeholder_message(chat_id: int | str, data: dict) -> dict:
+    # pengganti hasil Bot API untuk pengirim yang tidak menunggu antrean
+    is_private = isinstance(chat_id, int) and chat_id > 0
+    message = {
+        "message_id": 0,
+        "date": int(time.time()),
+        "chat": {"id": chat_id, "type": "private" if is_private else "group"},
+    }
+    if isinstance(data.get("text"), str):
+        message["text"] = data["text"]
+    return message
+
+
+def _chat_id(data: dict) -> int | str | None:
+    chat_id = data.get("chat_id")
+    return chat_id if isinstance(chat_id, int | str) else None
+
+
+class ReplyLimiter(BaseRateLimiter):
+    def __init__(self):
+        self.private = MemoryBuckets(PRIVATE_CHAT_RATE, PRIVATE_CHAT_BURST)
+        self.group = MemoryBuckets(GROUP_CHAT_RATE, GROUP_CHAT_BURST)
+        self.overall = MemoryBuckets(GLOBAL_RATE, GLOBAL_BURST)
+        self._queues: dict[int | str, deque[_Request]] = {}
+        self._workers: dict[int | str, asyncio.Task] = {}
+        self.merged = 0  # request yang tidak jadi dikirim karena digabung
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        # kirim dulu sisa antrean
+        workers = list(self._workers.values())
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def process_request(  # noqa: PLR0913 (signature PTB)
+        self,
+        callback,
+        args,
+        kwargs,
+        endpoint,
+        data,
+        rate_limit_args,
+    ):
+        chat_id = _chat_id(data)
+        if chat_id is None or endpoint not in QUEUED_ENDPOINTS:
+            # getMe, getChatMember, answerCallbackQuery, edit pesan inline, ...
+            return await self._call(callback, endpoint, data, kwargs)
+
+        request = _Request(callback, endpoint, data, kwargs)
+        self._queues.setdefault(chat_id, deque()).append(request)
+        if chat_id not in self._workers:
+            # context kosong: worker hidup lebih lama dari handler pengirim
+            self._workers[chat_id] = asyncio.create_task(
+                self._drain(chat_id),
+                context=contextvars.Context(),
+            )
+        return _placeholder_message(chat_id, data)
+
+    async def _drain(self, chat_id: int | str) -> None:
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                await self._wait_turn(chat_id)
+                request = self._next_batch(queue)
+                try:
+                    await self._call(
+                        request.callback,
+                        request.endpoint,
+                        request.data,
+                        request.kwargs,
+                    )
+                except Exception:
+                    logger.exception(
+                        "gagal kirim %s ke chat %s (%s request digabung)",
+                        request.endpoint,
+                        chat_id,
+                        request.merged + 1,
+                    )
+        finally:
+            del self._workers[chat_id]
+            if not queue:
+                del self._queues[chat_id]
+
+    def _next_batch(self, queue: deque[_Request]) -> _Request:
+        head = queue.popleft()
+        if (edit_key := head.edit_key()) is not None:
+            # edit yang lebih baru ke pesan yang sama menggantikan yang lama
+            for request in [r for r in queue if r.edit_key() == edit_key]:
+                queue.remove(request)
+                head.data = request.data
+                head.merged += 1
+                self.merged += 1
+            return head
+
+        merge_key = head.merge_key()
+        if merge_key is None:
+            return head
+        texts = [head.data["text"]]
+        length = len(texts[0])
+        while queue and queue[0].merge_key() == merge_key:
+            text = queue[0].data["text"]
+            length += len(MESSAGE_SEPARATOR) + len(text)
+            if length > MessageLimit.MAX_TEXT_LENGTH:
+                break
+            texts.append(text)
+            queue.popleft()
+            head.merged += 1
+            self.merged += 1
+        if len(texts) > 1:
+            head.data = {**head.data, "text": MESSAGE_SEPARATOR.join(texts)}
+        return head
+
+    async def _wait_turn(self, chat_id: int | str) -> None:
+        is_private = isinstance(chat_id, int) and chat_id > 0
+        chat_buckets = self.private if is_private else self.group
+        for buckets, key in ((chat_buckets, chat_id), (self.overall, 0)):
+            # bucket memberi tahu lama tunggu; tidak ada event yang bisa ditunggu
+            while (wait := await buckets.take(key, 1)) > 0:  # noqa: ASYNC110
+                await asyncio.sleep(wait)
+
+    async def _call(self, callback, endpoint: str, data: dict, kwargs: dict):
+        retries = 0
+        while True:
+            try:
+                return await callback(endpoint, data, **kwargs)
+            except RetryAfter as err:
+                retries += 1
+                if retries > MAX_RETRIES:
+                    raise
+                delay = retry_after_seconds(err)
+                logger.info("%s kena 429, tunggu %.1f detik", endpoint, delay)
+                await asyncio.sleep(delay)
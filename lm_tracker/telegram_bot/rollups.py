@@ -0,0 +1,130 @@
+"""
+Rekap harian ledger per user (DailyLedgerRollup).
+
+apply_tx() dipanggil di transaksi DB yang sama dengan create / delete
+Transaction, jadi rekap selalu sinkron dengan ledger. rebuild_rollups()
+menghitung ulang dari nol (backfill / perbaikan) lewat satu GROUP BY per user.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from django.db.models import Count
+from django.db.models import DecimalField
+from django.db.models import F
+from django.db.models import Q
+from django.db.models import Sum
+
+from .models import DailyLedgerRollup
+from .models import Transaction
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from .models import TelegramUser
+    from .periods import Period
+
+SIDE_AMOUNT_FIELDS = {
+    Transaction.SIDE_BUY: "buy_amount",
+    Transaction.SIDE_SELL: "sell_amount",
+    Transaction.SIDE_BUYBACK: "buyback_amount",
+    Transaction.SIDE_FEE: "fee_amount",
+}
+GRAM_FIELDS = {
+    Transaction.ASSET_GOLD: ("gold_grams_in", "gold_grams_out"),
+    Transaction.ASSET_SILVER: ("silver_grams_in", "silver_grams_out"),
+}
+OUT_SIDES = (Transaction.SIDE_SELL, Transaction.SIDE_BUYBACK)
+ROLLUP_FIELDS = [
+    "tx_count",
+    *SIDE_AMOUNT_FIELDS.values(),
+    *(f for pair in GRAM_FIELDS.values() for f in pair),
+]
+
+
+def tx_day(tx: Transaction) -> date:
+    # default tx_date = timezone.now (datetime) sebelum di-reload dari DB;
+    # to_python menyamakan dengan nilai yang tersimpan
+    return Transaction._meta.get_field("tx_date").to_python(tx.tx_date)  # noqa: SLF001
+
+
+def _delta(tx: Transaction, sign: int) -> dict:
+    delta = {"tx_count": sign, SIDE_AMOUNT_FIELDS[tx.side]: sign * tx.total_amount}
+    if tx.weight_gram is not None and tx.side != Transaction.SIDE_FEE:
+        grams_in, grams_out = GRAM_FIELDS[tx.asset]
+        field = grams_out if tx.side in OUT_SIDES else grams_in
+        delta[field] = sign * Decimal(tx.weight_gram) * tx.pcs
+    return delta
+
+
+def apply_tx(tx: Transaction, sign: int = 1) -> None:
+    """Tambah (sign=1) / kurangi (sign=-1) satu transaksi ke rekap harinya."""
+    row, _ = DailyLedgerRollup.objects.get_or_create(
+        telegram_user_id=tx.telegram_user_id,
+        day=tx_day(tx),
+    )
+    rows = DailyLedgerRollup.objects.filter(pk=row.pk)
+    rows.update(**{f: F(f) + v for f, v in _delta(tx, sign).items()})
+    if sign < 0:
+        rows.filter(tx_count__lte=0).delete()
+
+
+def rebuild_rollups(telegram_user: TelegramUser) -> int:
+    """Hitung ulang seluruh rekap harian user dari ledger. Return jumlah hari."""
+    grams = F("weight_gram") * F("pcs")
+    gram_sum = {
+        "output_field": DecimalField(max_digits=18, decimal_places=3),
+        "default": Decimal(0),
+    }
+    annotations = {
+        "tx_count": Count("id"),
+        **{
+            field: Sum("total_amount", filter=Q(side=side), default=0)
+            for side, field in SIDE_AMOUNT_FIELDS.items()
+        },
+    }
+    for asset, (grams_in, grams_out) in GRAM_FIELDS.items():
+        annotations[grams_in] = Sum(
+            grams,
+            filter=Q(asset=asset, side=Transaction.SIDE_BUY),
+            **gram_sum,
+        )
+        annotations[grams_out] = Sum(
+            grams,
+            filter=Q(asset=asset, side__in=OUT_SIDES),
+            **gram_sum,
+        )
+
+    rows = (
+        Transaction.objects.filter(telegram_user=telegram_user)
+        .values("tx_date")
+        .annotate(**annotations)
+        .order_by()
+    )
+    rollups = [
+        DailyLedgerRollup(
+            telegram_user=telegram_user,
+            day=row["tx_date"],
+            **{f: row[f] for f in ROLLUP_FIELDS},
+        )
+        for row in rows
+    ]
+    DailyLedgerRollup.objects.filter(telegram_user=telegram_user).delete()
+    DailyLedgerRollup.objects.bulk_create(rollups)
+    return len(rollups)
+
+
+async def period_report(telegram_user: TelegramUser, period: Period) -> dict:
+    """Total rekap harian untuk tanggal lokal di dalam `period`."""
+    totals = await DailyLedgerRollup.objects.filter(
+        period.day_q(),
+        telegram_user=telegram_user,
+    ).aaggregate(days=Count("id"), **{f: Sum(f) for f in ROLLUP_FIELDS})
+    return {
+        "first_day": period.first_day,
+        "last_day": period.last_day,
+        "days": totals.pop("days"),
+        **{f: v or 0 for f, v in totals.items()},
+    }
@@ -0,0 +1,183 @@
+"""
+Filter /find untuk ledger transaksi.
+
+Contoh: /find beli emas produk:galeri 24 5gr >10jt note:hadiah
+  - side   : beli / jual / bb / fee (sama dengan parser transaksi)
+  - asset  : emas / perak
+  - produk : produk:ANTAM, produk:UBS, produk:GALERI 24 (persis, tanpa beda
+             "GALERI24" vs "GALERI 24")
+  - berat  : 5gr (berat per keping)
+  - nominal: >10jt, <=500rb, 1jt-5jt, 2.000.000-3.000.000
+  - note   : note:<teks> (contains)
+  - kata lain dicari di note atau produk (contains, index trigram)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from dataclasses import field
+from decimal import Decimal
+from decimal import InvalidOperation
+from typing import TYPE_CHECKING
+
+from django.db.models import Q
+
+from lm_tracker.bot_alert.services.formatting import fmt_int
+
+from .parser import SIDE_MAP
+from .parser import STOP_WORDS
+from .parser import norm_amount
+from .parser import note_raw_text
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from .models import Transaction
+
+AMOUNT_UNITS = {
+    "": 1,
+    "rb": 1_000,
+    "ribu": 1_000,
+    "k": 1_000,
+    "jt": 1_000_000,
+    "juta": 1_000_000,
+}
+_NUM = r"\d[\d.,]*"
+_UNIT = r"rb|ribu|k|jt|juta"
+AMOUNT_RE = re.compile(
+    rf"(?P<op>>=|<=|>|<)?(?P<a>{_NUM})(?P<ua>{_UNIT})?"
+    rf"(?:-(?P<b>{_NUM})(?P<ub>{_UNIT})?)?",
+)
+WEIGHT_RE = re.compile(r"(\d+(?:[.,]\d+)?)(gr|gram)")
+# nama produk 1 token, atau token + angka ("GALERI 24") yang bukan berat
+PRODUCT_RE = re.compile(
+    r"(?:produk|product)\s*[:=]\s*"
+    r"([A-Za-z][A-Za-z0-9]*(?:\s+\d{1,4}\b(?!\s*(?:gr|gram)))?)",
+    re.IGNORECASE,
+)
+ASSET_WORDS = {
+    "emas": "GOLD",
+    "gold": "GOLD",
+    "perak": "SILVER",
+    "silver": "SILVER",
+}
+
+
+@dataclass
+class TxSearch:
+    side: str | None = None
+    asset: str | None = None
+    product: str = ""
+    weight_gram: Decimal | None = None
+    min_amount: int | None = None
+    max_amount: int | None = None
+    note: str = ""
+    words: list[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return self == TxSearch()
+
+    def apply(self, qs: QuerySet[Transaction]) -> QuerySet[Transaction]:
+        if self.side:
+            qs = qs.filter(side=self.side)
+        if self.asset:
+            qs = qs.filter(asset=self.asset)
+        if self.product:
+            qs = qs.filter(product__in=_product_variants(self.product))
+        if self.weight_gram is not None:
+            qs = qs.filter(weight_gram=self.weight_gram)
+        if self.min_amount is not None:
+            qs = qs.filter(total_amount__gte=self.min_amount)
+        if self.max_amount is not None:
+            qs = qs.filter(total_amount__lte=self.max_amount)
+        if self.note:
+            qs = qs.filter(note__icontains=self.note)
+        for word in self.words:
+            qs = qs.filter(Q(note__icontains=word) | Q(product__icontains=word))
+        return qs
+
+    def describe(self) -> str:
+        parts = [
+            self.side,
+            {"GOLD": "EMAS", "SILVER": "PERAK"}.get(self.asset or ""),
+            self.product,
+            f"{self.weight_gram}gr" if self.weight_gram is not None else None,
+            f">= {fmt_int(self.min_amount)}" if self.min_amount is not None else None,
+            f"<= {fmt_int(self.max_amount)}" if self.max_amount is not None else None,
+            f'note "{self.note}"' if self.note else None,
+            *(f'"{w}"' for w in self.words),
+        ]
+        return ", ".join(p for p in parts if p) or "SEMUA"
+
+
+def _product_variants(name: str) -> list[str]:
+    # parser menyimpan "GALERI 24"; user bisa ketik "galeri24" atau "galeri 24"
+    name = " ".join(name.upper().split())
+    joined = name.replace(" ", "")
+    spaced = re.sub(r"(?<=[A-Z])(?=\d)", " ", joined)
+    return sorted({name, joined, spaced})
+
+
+def _amount(num: str, unit: str | None) -> int | None:
+    mult = AMOUNT_UNITS[(unit or "").lower()]
+    if mult == 1:
+        return norm_amount(num) or None
+    try:
+        return int(Decimal(num.replace(",", ".")) * mult)
+    except InvalidOperation:
+        return None
+
+
+def _parse_amount(tok: str, search: TxSearch) -> bool:
+    m = AMOUNT_RE.fullmatch(tok)
+    if not m:
+        return False
+    op, has_range = m.group("op"), m.group("b") is not None
+    # angka polos (tanpa operator / satuan / rentang) bukan nominal
+    if not (op or has_range or m.group("ua")):
+        return False
+    a = _amount(m.group("a"), m.group("ua") or m.group("ub"))
+    if a is None:
+        return False
+    if has_range:
+        b = _amount(m.group("b"), m.group("ub") or m.group("ua"))
+        if b is None:
+            return False
+        search.min_amount, search.max_amount = sorted((a, b))
+    elif op in (">", ">="):
+        search.min_amount = a + (1 if op == ">" else 0)
+    elif op in ("<", "<="):
+        search.max_amount = a - (1 if op == "<" else 0)
+    else:
+        search.min_amount = search.max_amount = a
+    return True
+
+
+def parse_find_args(text: str) -> TxSearch:
+    search = TxSearch()
+    note, rest, _ = note_raw_text(text or "")
+    search.note = note
+
+    m = PRODUCT_RE.search(rest)
+    if m:
+        search.product = " ".join(m.group(1).upper().split())
+        rest = rest[: m.start()] + " " + rest[m.end() :]
+
+    # "5 gr" -> "5gr", "> 10jt" -> ">10jt"
+    rest = re.sub(r"(\d)\s+(gr|gram)\b", r"\1\2", rest, flags=re.IGNORECASE)
+    rest = re.sub(r"([<>]=?)\s+(\d)", r"\1\2", rest)
+
+    for tok in rest.split():
+        t = tok.lower()
+        if t in SIDE_MAP:
+            search.side = SIDE_MAP[t]
+        elif t in ASSET_WORDS:
+            search.asset = ASSET_WORDS[t]
+        elif m := WEIGHT_RE.fullmatch(t):
+            search.weight_gram = Decimal(m.group(1).replace(",", "."))
+        elif _parse_amount(t, search):
+            continue
+        elif t not in STOP_WORDS:
+            search.words.append(tok)
+    return search
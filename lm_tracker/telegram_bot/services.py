@@ -1,27 +1,59 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
 from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import DecimalField
+from django.db.models import F
+from django.db.models import Q
 from django.db.models import Sum
 from django.utils import timezone
 
+from lm_tracker.bot_alert.services.charts import get_chart_png
+from lm_tracker.bot_alert.services.state import last_snapshot
+from lm_tracker.bot_alert.services.valuation import price_table
+from lm_tracker.bot_alert.services.valuation import value_lots
+
+from . import analytics
+from . import periods
+from . import rollups
+from .models import ActivationToken
 from .models import Subscription
 from .models import TelegramUser
 from .models import Transaction
+from .subscriptions import ais_pro_cached
+from .subscriptions import invalidate_entitlements
 
+if TYPE_CHECKING:
+    from datetime import date
 
-@sync_to_async
-def get_or_create_telegram_user(u) -> TelegramUser:
+    from .periods import Period
+    from .search import TxSearch
+
+LEDGER_AGG_KEY = "telegram_bot:ledger_agg:{user_id}"
+OPEN_LOTS_KEY = "telegram_bot:open_lots:{user_id}"
+PRODUCTS_KEY = "telegram_bot:products:{user_id}"
+QUOTA_USED_KEY = "telegram_bot:quota_used:{user_id}:{period}"
+CHAT_LEDGER_KEY = "telegram_bot:chat_ledger:{chat_id}"
+LEDGER_AGG_TTL = 60 * 60 * 24
+
+GROUP_CHAT_TYPES = ("group", "supergroup")
+PRO_PERIOD_DAYS = 30
+
+
+async def get_or_create_telegram_user(u) -> TelegramUser:
     tg_user_id = u.id
     first_name = u.first_name
     last_name = u.last_name
     username = u.username
 
     name = f"{first_name} {last_name}".strip()
-    telegram_user, _ = TelegramUser.objects.get_or_create(
+    telegram_user, _ = await TelegramUser.objects.aget_or_create(
         telegram_user_id=tg_user_id,
         defaults={"username": username or "", "name": name or ""},
     )
@@ -34,27 +66,117 @@ def get_or_create_telegram_user(u) -> TelegramUser:
         telegram_user.name = name or ""
         changed = True
     if changed:
-        telegram_user.save(update_fields=["username", "name"])
+        await telegram_user.asave(update_fields=["username", "name"])
     # ensure subscription row exists
-    Subscription.objects.get_or_create(telegram_user=telegram_user)
+    await Subscription.objects.aget_or_create(telegram_user=telegram_user)
     return telegram_user
 
 
+async def _chat_ledger_id(chat_id: int) -> int | None:
+    # dicek tiap pesan di grup: cukup baca cache (0 = mode grup mati)
+    key = CHAT_LEDGER_KEY.format(chat_id=chat_id)
+    account_id = await cache.aget(key)
+    if account_id is None:
+        account_id = (
+            await TelegramUser.objects.filter(
+                telegram_user_id=chat_id,
+                is_chat=True,
+                shared_ledger=True,
+            )
+            .values_list("pk", flat=True)
+            .afirst()
+        ) or 0
+        await cache.aset(key, account_id, LEDGER_AGG_TTL)
+    return account_id or None
+
+
+async def get_ledger_account(u, chat=None) -> tuple[TelegramUser, TelegramUser]:
+    """
+    (akun ledger, anggota pencatat). Di grup dengan ledger bersama, akun
+    ledger = akun chat; selain itu ledger pribadi user sendiri. Agregat,
+    rekap harian dan cache semuanya di-key per akun ledger, jadi laporan
+    grup tidak men-scan histori tiap anggota.
+    """
+    member = await get_or_create_telegram_user(u)
+    if chat is None or chat.type not in GROUP_CHAT_TYPES:
+        return member, member
+    account_id = await _chat_ledger_id(chat.id)
+    if account_id is None:
+        return member, member
+    account = await TelegramUser.objects.select_related("subscription").aget(
+        pk=account_id,
+    )
+    return account, member
+
+
 @sync_to_async
-def is_pro(telegram_user: TelegramUser) -> bool:
-    sub = getattr(telegram_user, "subscription", None)
-    return bool(sub and sub.is_pro_active())
+@transaction.atomic
+def set_chat_ledger(chat, *, enabled: bool) -> TelegramUser:
+    account, _ = TelegramUser.objects.get_or_create(
+        telegram_user_id=chat.id,
+        defaults={"is_chat": True, "name": chat.title or ""},
+    )
+    account.is_chat = True
+    account.shared_ledger = enabled
+    account.name = chat.title or account.name
+    account.save(update_fields=["is_chat", "shared_ledger", "name"])
+    Subscription.objects.get_or_create(telegram_user=account)
+    key = CHAT_LEDGER_KEY.format(chat_id=chat.id)
+    transaction.on_commit(lambda: cache.delete(key))
+    return account
+
+
+async def is_pro(telegram_user: TelegramUser) -> bool:
+    # flag di cache; di-invalidate saat aktivasi / sweeper expire
+    return await ais_pro_cached(telegram_user.pk)
 
 
 @sync_to_async
-def free_quota_remaining(telegram_user: TelegramUser) -> int:
-    limit = getattr(settings, "FREE_TXN_LIMIT_PER_MONTH", 30)
+@transaction.atomic
+def activate_pro(telegram_user: TelegramUser, token: str) -> TelegramUser | None:
+    """
+    Pakai token aktivasi. Yang jadi PRO akun tujuan checkout (bisa akun
+    ledger grup), atau `telegram_user` kalau token tidak menyebut akun.
+    Return akun yang diaktifkan, None kalau token tidak valid.
+    """
+    at = ActivationToken.objects.select_for_update().filter(token=token).first()
+    if at is None or not at.is_valid():
+        return None
+
+    account = telegram_user
+    if at.telegram_user_id is not None:
+        account = (
+            TelegramUser.objects.filter(telegram_user_id=at.telegram_user_id).first()
+            or telegram_user
+        )
+
     now = timezone.now()
-    start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    used = Transaction.objects.filter(
-        telegram_user=telegram_user,
-        created__gte=start,
-    ).count()
+    Subscription.objects.update_or_create(
+        telegram_user=account,
+        defaults={
+            "plan": Subscription.PLAN_PRO,
+            "status": Subscription.STATUS_ACTIVE,
+            "current_period_end": now + timedelta(days=PRO_PERIOD_DAYS),
+            "reminded_at": None,
+        },
+    )
+    at.used_at = now
+    at.save(update_fields=["used_at"])
+    invalidate_entitlements([account.pk])
+    return account
+
+
+async def free_quota_remaining(telegram_user: TelegramUser) -> int:
+    limit = getattr(settings, "FREE_TXN_LIMIT_PER_MONTH", 30)
+    period = periods.month_period(telegram_user)
+    key = QUOTA_USED_KEY.format(user_id=telegram_user.pk, period=period.key)
+    used = await cache.aget(key)
+    if used is None:
+        used = await Transaction.objects.filter(
+            period.q(),
+            telegram_user=telegram_user,
+        ).acount()
+        await cache.aset(key, used, LEDGER_AGG_TTL)
     return max(0, limit - used)
 
 
@@ -68,88 +190,263 @@ async def can_add_txn(telegram_user: TelegramUser) -> bool:
 
 @sync_to_async
 def today_summary(telegram_user: TelegramUser):
-    now = timezone.localtime(timezone.now())
-    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    qs = Transaction.objects.filter(telegram_user=telegram_user, created__gte=start)
+    ledger = analytics.load_ledger(
+        Transaction.objects.filter(
+            periods.day_period(telegram_user).q(),
+            telegram_user=telegram_user,
+        ),
+    )
+    totals = analytics.side_totals(ledger)
+    # stok gram (buy +, sell/buyback -). fee tidak ngaruh stok
+    stock = analytics.holdings(
+        ledger,
+        inflow=(Transaction.SIDE_BUY, Transaction.SIDE_BUYBACK),
+        outflow=(Transaction.SIDE_SELL,),
+    )
+    return totals, stock
 
-    agg = qs.values("side").annotate(total=Sum("total_amount"))
-    totals = {row["side"]: int(row["total"] or 0) for row in agg}
 
-    # stok gram (buy +, sell/buyback -). fee tidak ngaruh stok
-    stock = {"GOLD": 0, "SILVER": 0}
-    txs = qs.exclude(weight_gram__isnull=True).only(
-        "asset",
-        "side",
-        "weight_gram",
-        "pcs",
+def ledger_aggregates(telegram_user: TelegramUser) -> dict:
+    """
+    Total gram & nominal per (asset, side) untuk seluruh ledger user.
+    Satu query GROUP BY, hasilnya di-cache dan di-invalidate saat ada
+    transaksi dibuat / dihapus.
+      {"GOLD": {"BUY": {"grams": Decimal, "amount": int}, ...}, ...}
+    """
+    key = LEDGER_AGG_KEY.format(user_id=telegram_user.pk)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    rows = (
+        Transaction.objects.filter(telegram_user=telegram_user)
+        .values("asset", "side")
+        .annotate(
+            grams=Sum(
+                F("weight_gram") * F("pcs"),
+                output_field=DecimalField(max_digits=18, decimal_places=3),
+            ),
+            amount=Sum("total_amount"),
+        )
+        .order_by()
     )
-    for t in txs:
-        grams = float(t.weight_gram) * int(t.pcs)
-        if t.side in (Transaction.SIDE_BUY, Transaction.SIDE_BUYBACK):
-            stock[f"{t.asset}"] += grams
-        elif t.side == Transaction.SIDE_SELL:
-            stock[f"{t.asset}"] -= grams
+    data = {"GOLD": {}, "SILVER": {}}
+    for row in rows:
+        data.setdefault(row["asset"], {})[row["side"]] = {
+            "grams": row["grams"] or Decimal(0),
+            "amount": int(row["amount"] or 0),
+        }
+    cache.set(key, data, LEDGER_AGG_TTL)
+    return data
 
-    return totals, stock
+
+def open_lots(telegram_user: TelegramUser) -> list[tuple[str, Decimal, int]]:
+    """
+    Lot terbuka per (asset, berat per keping): keping BUY - SELL - BUYBACK.
+    Satu query GROUP BY, di-cache bareng agregat ledger.
+    """
+    key = OPEN_LOTS_KEY.format(user_id=telegram_user.pk)
+    lots = cache.get(key)
+    if lots is not None:
+        return lots
+
+    rows = (
+        Transaction.objects.filter(
+            telegram_user=telegram_user,
+            weight_gram__isnull=False,
+        )
+        .values("asset", "weight_gram")
+        .annotate(
+            pcs_in=Sum("pcs", filter=Q(side=Transaction.SIDE_BUY)),
+            pcs_out=Sum(
+                "pcs",
+                filter=Q(side__in=[Transaction.SIDE_SELL, Transaction.SIDE_BUYBACK]),
+            ),
+        )
+        .order_by()
+    )
+    lots = [
+        (row["asset"], row["weight_gram"], (row["pcs_in"] or 0) - (row["pcs_out"] or 0))
+        for row in rows
+    ]
+    lots = [lot for lot in lots if lot[2] > 0]
+    cache.set(key, lots, LEDGER_AGG_TTL)
+    return lots
+
+
+def product_breakdown(telegram_user: TelegramUser) -> list[dict]:
+    """Breakdown stok & avg beli per (asset, produk), di-cache bareng agregat."""
+    key = PRODUCTS_KEY.format(user_id=telegram_user.pk)
+    rows = cache.get(key)
+    if rows is None:
+        rows = analytics.product_breakdown(
+            analytics.load_ledger(
+                Transaction.objects.filter(telegram_user=telegram_user),
+            ),
+        )
+        cache.set(key, rows, LEDGER_AGG_TTL)
+    return rows
+
+
+def invalidate_ledger_aggregates(telegram_user: TelegramUser) -> None:
+    keys = [
+        LEDGER_AGG_KEY.format(user_id=telegram_user.pk),
+        OPEN_LOTS_KEY.format(user_id=telegram_user.pk),
+        PRODUCTS_KEY.format(user_id=telegram_user.pk),
+        QUOTA_USED_KEY.format(
+            user_id=telegram_user.pk,
+            period=periods.month_period(telegram_user).key,
+        ),
+    ]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _side_grams(agg: dict, asset: str, side: str) -> Decimal:
+    return agg.get(asset, {}).get(side, {}).get("grams", Decimal(0))
+
+
+def _side_amount(agg: dict, asset: str, side: str) -> int:
+    return agg.get(asset, {}).get(side, {}).get("amount", 0)
+
+
+def _stock_from_aggregates(agg: dict) -> dict:
+    # buy +, sell/buyback -
+    return {
+        asset: float(
+            _side_grams(agg, asset, Transaction.SIDE_BUY)
+            - _side_grams(agg, asset, Transaction.SIDE_SELL)
+            - _side_grams(agg, asset, Transaction.SIDE_BUYBACK),
+        )
+        for asset in ("GOLD", "SILVER")
+    }
 
 
 @sync_to_async
 def stock_all_time(telegram_user: TelegramUser):
-    stock = {"GOLD": 0, "SILVER": 0}
-    txs = (
-        Transaction.objects.filter(telegram_user=telegram_user)
-        .exclude(weight_gram__isnull=True)
-        .only("asset", "side", "weight_gram", "pcs")
-    )
-    for t in txs:
-        grams = float(t.weight_gram) * int(t.pcs)
-        if t.side == Transaction.SIDE_BUY:
-            stock[f"{t.asset}"] += grams
-        elif t.side in (Transaction.SIDE_SELL, Transaction.SIDE_BUYBACK):
-            stock[f"{t.asset}"] -= grams
-    return stock
+    return _stock_from_aggregates(ledger_aggregates(telegram_user))
+
+
+def _buyback_per_gram(snap, asset: str) -> int | None:
+    if snap is None:
+        return None
+    if asset == Transaction.ASSET_SILVER:
+        return snap.silver_buyback
+    return snap.buyback
+
+
+@sync_to_async
+def portfolio_valuation(telegram_user: TelegramUser) -> dict:
+    """
+    Mark-to-market stok: holdings x buyback terakhir, plus unrealized gain
+    terhadap cost basis (avg harga BUY x holdings). Semua dari agregat ledger
+    yang di-cache + snapshot harga yang di-cache, tanpa scan ledger.
+    Lot emas juga dinilai per ukuran batangan pakai tabel harga Antam
+    (retail_value = harga beli ulang di Antam untuk ukuran yang sama).
+    """
+    agg = ledger_aggregates(telegram_user)
+    stock = _stock_from_aggregates(agg)
+    snap = last_snapshot()
+    table = price_table(snap)
+    lot_values = value_lots(open_lots(telegram_user), table) if table else {}
+
+    assets = {}
+    for asset, holdings in stock.items():
+        buy_grams = _side_grams(agg, asset, Transaction.SIDE_BUY)
+        buy_cost = _side_amount(agg, asset, Transaction.SIDE_BUY)
+        avg_cost = (buy_cost / float(buy_grams)) if buy_grams > 0 else None
+        price = _buyback_per_gram(snap, asset)
+
+        cost_basis = holdings * avg_cost if avg_cost is not None else None
+        market_value = holdings * price if price is not None else None
+        unrealized = (
+            market_value - cost_basis
+            if (market_value is not None and cost_basis is not None)
+            else None
+        )
+        assets[asset] = {
+            "holdings": holdings,
+            "avg_cost": avg_cost,
+            "price": price,
+            "cost_basis": cost_basis,
+            "market_value": market_value,
+            "unrealized": unrealized,
+            "retail_value": lot_values.get(asset, {}).get("retail_value") or None,
+            "products": [
+                p
+                for p in product_breakdown(telegram_user)
+                if p["asset"] == asset and p["holdings"] > 0
+            ],
+        }
+    return {"assets": assets, "price_ts": snap.ts if snap else None}
 
 
 @sync_to_async
 @transaction.atomic
-def create_tx_from_text(telegram_user: TelegramUser, asset, parsed, update):
-    return Transaction.objects.create(
+def create_tx_from_text(
+    telegram_user: TelegramUser,
+    asset,
+    parsed,
+    update,
+    recorded_by: TelegramUser | None = None,
+):
+    invalidate_ledger_aggregates(telegram_user)
+    tx = Transaction.objects.create(
         telegram_user=telegram_user,
         asset=asset,
         product=parsed.product,
         side=parsed.side,
+        # tanggal lokal user, selaras dengan batas periode laporan
+        tx_date=periods.local_today(telegram_user),
         weight_gram=parsed.weight_gram,
         pcs=parsed.pcs,
         total_amount=parsed.total_amount,
         note=parsed.note,
         chat_id=update.effective_chat.id if update.effective_chat else None,
         message_id=update.message.message_id,
+        recorded_by=(
+            recorded_by if recorded_by and recorded_by.pk != telegram_user.pk else None
+        ),
     )
+    rollups.apply_tx(tx)
+    return tx
 
 
 @sync_to_async
+@transaction.atomic
 def delete_tx_by_telegram_user_and_id(
     telegram_user: TelegramUser,
     tx_id: int,
+    recorded_by: TelegramUser | None = None,
 ) -> Transaction | None:
-    tx = Transaction.objects.filter(telegram_user=telegram_user, id=tx_id).first()
+    """recorded_by: batasi ke catatan anggota itu (ledger grup, non-admin)."""
+    qs = Transaction.objects.filter(telegram_user=telegram_user, id=tx_id)
+    if recorded_by is not None:
+        qs = qs.filter(recorded_by=recorded_by)
+    tx = qs.first()
     if not tx:
         return None
+    rollups.apply_tx(tx, sign=-1)
     tx.delete()
+    invalidate_ledger_aggregates(telegram_user)
     return tx
 
 
 @sync_to_async
-def delete_last_tx(telegram_user: TelegramUser) -> int | None:
-    tx = (
-        Transaction.objects.filter(telegram_user=telegram_user)
-        .order_by("-tx_date", "-id")
-        .first()
-    )
-    tid = tx.id
+@transaction.atomic
+def delete_last_tx(
+    telegram_user: TelegramUser,
+    recorded_by: TelegramUser | None = None,
+) -> int | None:
+    qs = Transaction.objects.filter(telegram_user=telegram_user)
+    if recorded_by is not None:
+        qs = qs.filter(recorded_by=recorded_by)
+    tx = qs.order_by("-tx_date", "-id").first()
     if not tx:
         return None
+    tid = tx.id
+    rollups.apply_tx(tx, sign=-1)
     tx.delete()
+    invalidate_ledger_aggregates(telegram_user)
     return tid
 
 
@@ -161,35 +458,22 @@ def summary_simple(telegram_user: TelegramUser) -> dict:
       - holdings_grams (buy - sell - buyback)
       - avg_buy_price (berdasarkan transaksi BUY saja)
     """
-
-    txs = Transaction.objects.filter(telegram_user=telegram_user).order_by(
-        "-tx_date",
-        "-id",
+    ledger = analytics.load_ledger(
+        Transaction.objects.filter(telegram_user=telegram_user),
     )
+    agg = analytics.flows(ledger)
 
-    buys = txs.filter(side="BUY")
-    sells = txs.filter(side="SELL")
-    buybacks = txs.filter(side="BUYBACK")
-
-    # total buys
-    total_buy_grams = Decimal("0")
-    for tx in buys.only("weight_gram", "pcs"):
-        total_buy_grams += Decimal(tx.weight_gram or "0") * Decimal(tx.pcs or "1")
+    # semua asset digabung (ringkasan simple)
+    def total(side: str, field: str):
+        return sum(
+            (agg[asset].get(side, {}).get(field, 0) for asset in agg),
+            Decimal(0),
+        )
 
-    # total sells
-    total_sell_grams = Decimal("0")
-    for tx in sells.only("weight_gram", "pcs"):
-        total_sell_grams += Decimal(tx.weight_gram or "0") * Decimal(tx.pcs or "1")
-
-    # total buybacks
-    total_buyback_grams = Decimal("0")
-    for tx in buybacks.only("weight_gram", "pcs"):
-        total_buyback_grams += Decimal(tx.weight_gram or "0") * Decimal(tx.pcs or "1")
-
-    # avg buy price (simple)
-    total_buy_cost = Decimal("0")
-    for tx in buys.only("total_amount"):
-        total_buy_cost += Decimal(tx.total_amount)
+    total_buy_grams = total(Transaction.SIDE_BUY, "grams")
+    total_sell_grams = total(Transaction.SIDE_SELL, "grams")
+    total_buyback_grams = total(Transaction.SIDE_BUYBACK, "grams")
+    total_buy_cost = total(Transaction.SIDE_BUY, "amount")
 
     holdings = (total_buy_grams + total_buyback_grams) - total_sell_grams
     avg_buy = (total_buy_cost / total_buy_grams) if total_buy_grams > 0 else None
@@ -200,21 +484,90 @@ def summary_simple(telegram_user: TelegramUser) -> dict:
         "total_sell_grams": total_sell_grams,
         "holdings": holdings,
         "avg_buy": avg_buy,
-        "last_tx_date": (txs.first().tx_date if txs.exists() else None),
+        "last_tx_date": ledger.day.max().item() if len(ledger) else None,
     }
 
 
+async def export_transactions(telegram_user: TelegramUser, period: Period) -> list:
+    qs = Transaction.objects.filter(period.q(), telegram_user=telegram_user)
+    return [tx async for tx in qs.order_by("created")]
+
+
 @sync_to_async
-def list_last_txs(
+def export_summary(telegram_user: TelegramUser, period: Period) -> dict:
+    """Ringkasan untuk caption export: jumlah transaksi & total per side."""
+    ledger = analytics.load_ledger(
+        Transaction.objects.filter(period.q(), telegram_user=telegram_user),
+    )
+    return {
+        "count": len(ledger),
+        "totals": analytics.side_totals(ledger),
+    }
+
+
+async def period_summary(telegram_user: TelegramUser, period: Period) -> dict:
+    # dari rekap harian (DailyLedgerRollup), bukan scan transaksi
+    return await rollups.period_report(telegram_user, period)
+
+
+async def set_user_timezone(telegram_user: TelegramUser, name: str) -> None:
+    telegram_user.timezone = name
+    await telegram_user.asave(update_fields=["timezone"])
+
+
+async def list_txs_page(
     telegram_user: TelegramUser,
     limit: int = 5,
     metal_type: str | None = None,
-):
-    qs = Transaction.objects.filter(telegram_user=telegram_user).order_by(
-        "-tx_date",
-        "-id",
-    )
+    before: tuple[date, int] | None = None,
+    after: tuple[date, int] | None = None,
+) -> tuple[list[Transaction], bool, bool]:
+    """
+    Satu halaman transaksi urut terbaru dulu, keyset pada (tx_date, id):
+    `before` = halaman lebih lama dari cursor, `after` = lebih baru.
+    Tanpa OFFSET, jadi halaman ke-N sama murahnya dengan halaman pertama.
+    Return (txs, ada_lebih_lama, ada_lebih_baru).
+    """
+    qs = Transaction.objects.filter(telegram_user=telegram_user)
     if metal_type in ("GOLD", "SILVER"):
         qs = qs.filter(asset=metal_type)
 
-    return list(qs[:limit])
+    qs = qs.select_related("recorded_by")
+    if after is not None:
+        d, tx_id = after
+        newer = qs.filter(Q(tx_date__gt=d) | Q(tx_date=d, id__gt=tx_id))
+        rows = [tx async for tx in newer.order_by("tx_date", "id")[: limit + 1]]
+        has_newer = len(rows) > limit
+        return rows[:limit][::-1], True, has_newer
+
+    if before is not None:
+        d, tx_id = before
+        qs = qs.filter(Q(tx_date__lt=d) | Q(tx_date=d, id__lt=tx_id))
+    rows = [tx async for tx in qs.order_by("-tx_date", "-id")[: limit + 1]]
+    return rows[:limit], len(rows) > limit, before is not None
+
+
+async def find_txs(
+    telegram_user: TelegramUser,
+    search: TxSearch,
+    limit: int = 20,
+) -> tuple[list[Transaction], bool]:
+    """Transaksi yang cocok dengan filter /find, terbaru dulu. (txs, ada_lagi)."""
+    qs = search.apply(
+        Transaction.objects.filter(telegram_user=telegram_user).select_related(
+            "recorded_by",
+        ),
+    )
+    rows = [tx async for tx in qs.order_by("-tx_date", "-id")[: limit + 1]]
+    return rows[:limit], len(rows) > limit
+
+
+@sync_to_async
+def latest_price_snapshot():
+    # dari state cache broadcast; tidak ada call ke provider harga
+    return last_snapshot()
+
+
+@sync_to_async
+def price_chart_png(range_key: str) -> bytes:
+    return get_chart_png(range_key)
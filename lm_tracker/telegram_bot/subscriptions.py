@@ -0,0 +1,142 @@
+"""
+Status PRO (entitlement) yang di-cache + sweeper subscription.
+
+is_pro_cached() dipanggil tiap pesan (kuota transaksi), jadi cukup baca flag
+di cache. TTL flag PRO dipotong sampai current_period_end, jadi flag kedaluwarsa
+sendiri tepat saat periode habis. sweep_subscriptions() (Celery beat) menandai
+subscription yang lewat masa aktif jadi EXPIRED dalam satu UPDATE, mengirim
+pengingat perpanjangan beberapa hari sebelum habis, dan menghapus flag cache
+user yang berubah.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from lm_tracker.bot_alert.services.telegram import send_telegram_batch
+
+from .models import Subscription
+
+ENTITLEMENT_KEY = "telegram_bot:pro:{user_id}"
+ENTITLEMENT_TTL = 60 * 60
+
+
+def _entitlement_key(telegram_user_pk: int) -> str:
+    return ENTITLEMENT_KEY.format(user_id=telegram_user_pk)
+
+
+def _entitlement(sub: Subscription | None) -> tuple[int, int]:
+    # (nilai flag cache, TTL); TTL dipotong sampai akhir periode PRO.
+    # Dipakai versi sync & async supaya isi cache selalu sama.
+    active = bool(sub and sub.is_pro_active())
+    ttl = ENTITLEMENT_TTL
+    if active:
+        left = (sub.current_period_end - timezone.now()).total_seconds()
+        ttl = max(1, min(ttl, int(left)))
+    return int(active), ttl
+
+
+def is_pro_cached(telegram_user_pk: int) -> bool:
+    key = _entitlement_key(telegram_user_pk)
+    flag = cache.get(key)
+    if flag is None:
+        sub = Subscription.objects.filter(telegram_user_id=telegram_user_pk).first()
+        flag, ttl = _entitlement(sub)
+        cache.set(key, flag, ttl)
+    return bool(flag)
+
+
+async def ais_pro_cached(telegram_user_pk: int) -> bool:
+    key = _entitlement_key(telegram_user_pk)
+    flag = await cache.aget(key)
+    if flag is None:
+        sub = await Subscription.objects.filter(
+            telegram_user_id=telegram_user_pk,
+        ).afirst()
+        flag, ttl = _entitlement(sub)
+        await cache.aset(key, flag, ttl)
+    return bool(flag)
+
+
+def invalidate_entitlements(telegram_user_pks) -> None:
+    keys = [_entitlement_key(pk) for pk in telegram_user_pks]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _active_pro():
+    return Subscription.objects.filter(
+        plan=Subscription.PLAN_PRO,
+        status=Subscription.STATUS_ACTIVE,
+    )
+
+
+@transaction.atomic
+def expire_lapsed(now=None) -> int:
+    """PRO aktif yang current_period_end-nya lewat -> EXPIRED (satu UPDATE)."""
+    now = now or timezone.now()
+    lapsed = _active_pro().filter(current_period_end__lte=now)
+    user_pks = list(
+        lapsed.select_for_update().values_list("telegram_user_id", flat=True),
+    )
+    if not user_pks:
+        return 0
+    count = Subscription.objects.filter(telegram_user_id__in=user_pks).update(
+        status=Subscription.STATUS_EXPIRED,
+        modified=now,
+    )
+    invalidate_entitlements(user_pks)
+    return count
+
+
+def _reminder_text(sub: Subscription) -> str:
+    end = timezone.localtime(sub.current_period_end).strftime("%d %b %Y %H:%M")
+    link = (
+        f"{settings.APP_BASE_URL}/billing/checkout/"
+        f"?tg={sub.telegram_user.telegram_user_id}"
+    )
+    return (
+        f"⏰ PRO kamu berakhir {end}.\n"
+        f"Perpanjang supaya tetap unlimited transaksi + export: {link}"
+    )
+
+
+def send_renewal_reminders(now=None, *, dry_run=False) -> int:
+    """Pengingat sekali per periode untuk PRO yang habis dalam N hari ke depan."""
+    now = now or timezone.now()
+    ahead = timedelta(days=settings.SUBSCRIPTION_REMINDER_DAYS)
+    due = list(
+        _active_pro()
+        .filter(
+            current_period_end__gt=now,
+            current_period_end__lte=now + ahead,
+            reminded_at__isnull=True,
+        )
+        .select_related("telegram_user"),
+    )
+    if not due:
+        return 0
+
+    by_chat = {sub.telegram_user.telegram_user_id: sub for sub in due}
+    sent = send_telegram_batch(
+        settings.TELEGRAM_BOT_TOKEN,
+        [(chat_id, _reminder_text(sub)) for chat_id, sub in by_chat.items()],
+        dry_run=dry_run,
+    )
+    Subscription.objects.filter(pk__in=[by_chat[c].pk for c in sent]).update(
+        reminded_at=now,
+    )
+    return len(sent)
+
+
+def sweep_subscriptions(*, dry_run=False) -> dict:
+    now = timezone.now()
+    return {
+        "expired": expire_lapsed(now),
+        "reminded": send_renewal_reminders(now, dry_run=dry_run),
+    }
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from lm_tracker.telegram_bot.subscriptions import sweep_subscriptions
+
+
+@shared_task
+def subscription_sweep_task():
+    return sweep_subscriptions()
@@ -2,70 +2,131 @@ from __future__ import annotations
 
 import csv
 import io
+from datetime import date
+from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from telegram import Update
+    from telegram.request import BaseRequest
 
 from django.conf import settings
 from django.utils import timezone
+from telegram import InlineKeyboardButton
+from telegram import InlineKeyboardMarkup
+from telegram.constants import ChatMemberStatus
 from telegram.ext import Application
 from telegram.ext import ApplicationBuilder
+from telegram.ext import CallbackQueryHandler
 from telegram.ext import CommandHandler
 from telegram.ext import ContextTypes
 from telegram.ext import MessageHandler
 from telegram.ext import filters
+from telegram.request import HTTPXRequest
 
-from .models import ActivationToken
-from .models import Subscription
+from lm_tracker.bot_alert.services.charts import CHART_RANGES
+from lm_tracker.bot_alert.services.formatting import fmt_gr
+from lm_tracker.bot_alert.services.formatting import fmt_rp
+
+from . import periods
+from .instrumentation import InstrumentedRequest
+from .instrumentation import instrument_handlers
+from .instrumentation import parse_timer
 from .models import Transaction
-from .parser import parse_transaction
+from .ratelimit import rate_limit_handler
+from .ratelimit import update_transaction
+from .replies import ReplyLimiter
+from .search import parse_find_args
+from .services import GROUP_CHAT_TYPES
+from .services import activate_pro
 from .services import can_add_txn
 from .services import create_tx_from_text
 from .services import delete_last_tx
 from .services import delete_tx_by_telegram_user_and_id
+from .services import export_summary
+from .services import export_transactions
+from .services import find_txs
+from .services import get_ledger_account
 from .services import get_or_create_telegram_user
-from .services import list_last_txs
-from .services import stock_all_time
+from .services import is_pro
+from .services import latest_price_snapshot
+from .services import list_txs_page
+from .services import period_summary
+from .services import portfolio_valuation
+from .services import price_chart_png
+from .services import set_chat_ledger
+from .services import set_user_timezone
 from .services import summary_simple
 from .services import today_summary
 
 TWO_LEN = 2
+LIST_MAX_LIMIT = 50
+LIST_CB_PREFIX = "list:"
+FIND_LIMIT = 20
+REPORT_DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y")
+
+
+def api_base_urls() -> dict:
+    """base_url PTB dari TELEGRAM_API_BASE_URL (Bot API asli / emulator)."""
+    base = settings.TELEGRAM_API_BASE_URL
+    return {"base_url": f"{base}/bot", "base_file_url": f"{base}/file/bot"}
+
+
+def build_app(request: BaseRequest | None = None) -> Application:
+    if request is None:
+        # sama dengan default ApplicationBuilder
+        request = HTTPXRequest(connection_pool_size=256)
+    # request bisa Bot API lokal / tiruan untuk benchmark
+    urls = api_base_urls()
+    builder = (
+        ApplicationBuilder()
+        .token(settings.TELEGRAM_BOT_TOKEN)
+        .base_url(urls["base_url"])
+        .base_file_url(urls["base_file_url"])
+        .request(InstrumentedRequest(request))
+    )
+    if settings.TELEGRAM_REPLY_QUEUE:
+        # antrean balasan per chat: rate limit Telegram + gabung pesan beruntun
+        builder = builder.rate_limiter(ReplyLimiter())
+    app = builder.build()
 
-
-def build_app() -> Application:
-    app = ApplicationBuilder().token(settings.TELEGRAM_BOT_TOKEN).build()
+    if settings.TELEGRAM_RATE_LIMIT_BACKEND != "off":
+        # sebelum handler lain: buang update yang melewati rate limit tanpa akses DB
+        app.add_handler(rate_limit_handler(), group=-1)
 
     app.add_handler(CommandHandler("start", cmd_start))
     app.add_handler(CommandHandler("help", cmd_help))
     app.add_handler(CommandHandler("upgrade", cmd_upgrade))
     app.add_handler(CommandHandler("today", cmd_today))
+    app.add_handler(CommandHandler("week", cmd_week))
+    app.add_handler(CommandHandler("month", cmd_month))
+    app.add_handler(CommandHandler("report", cmd_report))
+    app.add_handler(CommandHandler("timezone", cmd_timezone))
+    app.add_handler(CommandHandler("groupmode", cmd_groupmode))
     app.add_handler(CommandHandler("stock", cmd_stock))
     app.add_handler(CommandHandler("export", cmd_export))
     app.add_handler(CommandHandler("delete", cmd_delete))
     app.add_handler(CommandHandler("summary", cmd_summary))
     app.add_handler(CommandHandler("list", cmd_list))
+    app.add_handler(CommandHandler("find", cmd_find))
+    app.add_handler(CallbackQueryHandler(cb_list, pattern=f"^{LIST_CB_PREFIX}"))
+    app.add_handler(CommandHandler("price", cmd_price))
+    app.add_handler(CommandHandler("chart", cmd_chart))
 
     # parse plain text messages as potential transactions
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, msg_text))
 
+    # latensi, query DB, Bot API & parse per handler -> Prometheus + Sentry
+    instrument_handlers(app)
     return app
 
 
-def _fmt_int(n: int) -> str:
-    return f"{int(n):,}".replace(",", ".")
-
-
-def _fmt_rp(n: int) -> str:
-    return "Rp " + _fmt_int(n)
-
-
-def _fmt_gr(d: Decimal) -> str:
-    # tampil 3 desimal, hapus trailing nol
-    s = f"{d:.1f}"
-    return s.rstrip("0").rstrip(".")
+def _approx_value(grams, price_per_gram) -> str:
+    if not grams or price_per_gram is None:
+        return ""
+    return f" (~{fmt_rp(grams * price_per_gram)})"
 
 
 def _parse_metal_arg(arg: str) -> str | None:
@@ -81,15 +142,22 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     u = update.effective_user
     if not u:
         return
-    telegram_user = await get_or_create_telegram_user(u)
+    # ledger grup kalau /start di grup dengan ledger bersama
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
 
     # Activation deep link: /start paid_<token>
     if update.message and update.message.text:
         parts = update.message.text.split(maxsplit=1)
         if len(parts) == TWO_LEN and parts[1].startswith("paid_"):
             token = parts[1].replace("paid_", "", 1).strip()
-            ok = await _consume_activation_token(telegram_user, token)
-            if ok:
+            # token dari checkout /upgrade grup mengaktifkan akun ledger grup
+            account = await activate_pro(telegram_user, token)
+            if account is not None and account.is_chat:
+                label = account.name or account.telegram_user_id
+                await update.message.reply_text(
+                    f"✅ PRO aktif untuk ledger grup {label}. Terima kasih!",
+                )
+            elif account is not None:
                 await update.message.reply_text(
                     "✅ PRO aktif. Terima kasih! Coba: /export atau /stock",
                 )
@@ -105,7 +173,8 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "- jual emas ANTAM 2gr 2pcs total 11.000.000\n"
         "- beli perak ANTAM 100gr total 1.250.000\n"
         "- bb emas ANTAM 100gr total 1.250.000\n\n"
-        "Cek laporan: /today /stock /summary /export\n"
+        "Cek laporan: /today /week /month /stock /summary /export\n"
+        "Cek harga: /price /chart\n"
         "Upgrade: /upgrade",
     )
 
@@ -117,9 +186,13 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "- jual emas 1gr total 1.200.000\n"
         "- buyback emas 5gr total 28.000.000\n\n"
         "Laporan:\n"
-        "- /today\n- /stock\n- /summary\n- /export (PRO)\n\n"
+        "- /today\n- /week\n- /month\n- /report <dari> <sampai>\n"
+        "- /stock\n- /summary\n- /export (PRO)\n\n"
+        "Harga:\n"
+        "- /price\n- /chart 7d|30d|1y\n\n"
         "Manajemen:\n"
-        "- /delete last\n- /delete <id>\n\n"
+        "- /list\n- /find <filter>\n- /groupmode on|off (grup)\n"
+        "- /delete last\n- /delete <id>\n- /timezone <Area/Kota>\n\n"
         "Upgrade:\n- /upgrade",
     )
 
@@ -128,14 +201,16 @@ async def cmd_upgrade(update: Update, context: ContextTypes.DEFAULT_TYPE):
     u = update.effective_user
     if not u:
         return
-    telegram_user = await get_or_create_telegram_user(u)
+    # di grup dengan ledger bersama yang di-upgrade akun ledger grup
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
     # simple checkout link
     # (Django view will generate activation token after payment simulated)
     link = (
         f"{settings.APP_BASE_URL}/billing/checkout/?tg={telegram_user.telegram_user_id}"
     )
+    target = "ledger grup ini " if telegram_user.is_chat else ""
     await update.message.reply_text(
-        "Upgrade ke PRO:\n"
+        f"Upgrade {target}ke PRO:\n"
         "✅ Unlimited transaksi\n"
         "✅ Export CSV\n"
         "✅ Fitur baru\n\n"
@@ -148,56 +223,212 @@ async def cmd_today(update: Update, context: ContextTypes.DEFAULT_TYPE):
     u = update.effective_user
     if not u:
         return
-    telegram_user = await get_or_create_telegram_user(u)
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
     totals, stock = await today_summary(telegram_user)
+    snap = await latest_price_snapshot()
     buy = totals.get("BUY", 0)
     sell = totals.get("SELL", 0)
     buyback = totals.get("BUYBACK", 0)
     net = (sell - buy) - buyback
 
+    # nilai stok hari ini pakai buyback terakhir
+    gold_value = _approx_value(stock["GOLD"], snap.buyback if snap else None)
+    silver_value = _approx_value(
+        stock["SILVER"],
+        snap.silver_buyback if snap else None,
+    )
+
     await update.message.reply_text(
         f"📄 Rekap Hari Ini:\n"
-        f"- BUY: {_fmt_rp(buy)}\n"
-        f"- SELL: {_fmt_rp(sell)}\n"
-        f"- BUYBACK: {_fmt_rp(buyback)}\n\n"
-        f"📌 Net Cashflow: {_fmt_rp(net)}\n"
+        f"- BUY: {fmt_rp(buy)}\n"
+        f"- SELL: {fmt_rp(sell)}\n"
+        f"- BUYBACK: {fmt_rp(buyback)}\n\n"
+        f"📌 Net Cashflow: {fmt_rp(net)}\n"
         f"📌 Stok hari ini:\n"
-        f"- EMAS: {_fmt_gr(stock['GOLD'])} gr\n"
-        f"- PERAK: {_fmt_gr(stock['SILVER'])} gr",
+        f"- EMAS: {fmt_gr(stock['GOLD'])} gr{gold_value}\n"
+        f"- PERAK: {fmt_gr(stock['SILVER'])} gr{silver_value}",
+    )
+
+
+def _parse_report_date(arg: str) -> date | None:
+    for fmt in REPORT_DATE_FORMATS:
+        try:
+            return datetime.strptime(arg, fmt).date()  # noqa: DTZ007
+        except ValueError:
+            continue
+    return None
+
+
+async def _reply_period(update: Update, title: str, make_period):
+    telegram_user, _ = await get_ledger_account(
+        update.effective_user,
+        update.effective_chat,
+    )
+    period = make_period(telegram_user)
+    r = await period_summary(telegram_user, period)
+    net = (r["sell_amount"] - r["buy_amount"]) - r["buyback_amount"]
+    label = f"{period.first_day:%d %b %Y} - {period.last_day:%d %b %Y}"
+    await update.message.reply_text(
+        f"📄 Rekap {title} ({label}):\n"
+        f"- Transaksi: {r['tx_count']} ({r['days']} hari aktif)\n"
+        f"- BUY: {fmt_rp(r['buy_amount'])}\n"
+        f"- SELL: {fmt_rp(r['sell_amount'])}\n"
+        f"- BUYBACK: {fmt_rp(r['buyback_amount'])}\n"
+        f"- FEE: {fmt_rp(r['fee_amount'])}\n\n"
+        f"📌 Net Cashflow: {fmt_rp(net)}\n"
+        f"📌 Gram masuk / keluar:\n"
+        f"- EMAS: +{fmt_gr(r['gold_grams_in'])} / -{fmt_gr(r['gold_grams_out'])} gr\n"
+        f"- PERAK: +{fmt_gr(r['silver_grams_in'])} / "
+        f"-{fmt_gr(r['silver_grams_out'])} gr",
     )
 
 
+async def cmd_week(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.effective_user or not update.message:
+        return
+    await _reply_period(update, "Minggu Ini", periods.week_period)
+
+
+async def cmd_month(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.effective_user or not update.message:
+        return
+    await _reply_period(update, "Bulan Ini", periods.month_period)
+
+
+async def cmd_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.effective_user or not update.message:
+        return
+    args = context.args or []
+    dates = [_parse_report_date(a) for a in args[:TWO_LEN]]
+    if len(dates) != TWO_LEN or None in dates:
+        await update.message.reply_text(
+            "Pakai: /report <dari> <sampai>\nContoh: /report 2025-01-01 2025-03-31",
+        )
+        return
+    first, last = sorted(dates)
+    await _reply_period(
+        update,
+        "Periode",
+        lambda tu: periods.date_range(tu, first, last + timedelta(days=1)),
+    )
+
+
+async def cmd_timezone(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    u = update.effective_user
+    if not u or not update.message:
+        return
+    telegram_user = await get_or_create_telegram_user(u)
+    if not context.args:
+        current = telegram_user.timezone or settings.TIME_ZONE
+        await update.message.reply_text(
+            f"Timezone kamu: {current}\nGanti: /timezone Asia/Makassar",
+        )
+        return
+    name = context.args[0].strip()
+    if not periods.valid_timezone(name):
+        await update.message.reply_text(
+            "Timezone tidak dikenal. Contoh: Asia/Jakarta, Asia/Makassar",
+        )
+        return
+    await set_user_timezone(telegram_user, name)
+    await update.message.reply_text(f"✅ Timezone diset ke {name}")
+
+
+async def _is_chat_admin(context: ContextTypes.DEFAULT_TYPE, chat, u) -> bool:
+    member = await context.bot.get_chat_member(chat.id, u.id)
+    return member.status in (ChatMemberStatus.OWNER, ChatMemberStatus.ADMINISTRATOR)
+
+
+async def cmd_groupmode(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    u = update.effective_user
+    chat = update.effective_chat
+    if not u or not chat or not update.message:
+        return
+    if chat.type not in GROUP_CHAT_TYPES:
+        await update.message.reply_text("Mode ledger grup hanya untuk grup.")
+        return
+
+    arg = (context.args[0].lower() if context.args else "").strip()
+    if arg not in ("on", "off"):
+        account, _ = await get_ledger_account(u, chat)
+        status = "ON" if account.is_chat else "OFF"
+        await update.message.reply_text(
+            f"Ledger grup: {status}\n"
+            "Pakai: /groupmode on | off (admin grup)\n"
+            "ON = semua transaksi anggota dicatat ke satu ledger grup.",
+        )
+        return
+
+    if not await _is_chat_admin(context, chat, u):
+        await update.message.reply_text("Hanya admin grup yang bisa mengubah mode.")
+        return
+
+    await set_chat_ledger(chat, enabled=arg == "on")
+    if arg == "on":
+        await update.message.reply_text(
+            "✅ Ledger grup aktif. Transaksi & laporan di grup ini memakai "
+            "ledger bersama.",
+        )
+    else:
+        await update.message.reply_text(
+            "✅ Ledger grup nonaktif. Kembali ke ledger pribadi.",
+        )
+
+
 async def cmd_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
     u = update.effective_user
     if not u:
         return
-    telegram_user = await get_or_create_telegram_user(u)
-    stock = await stock_all_time(telegram_user)
-    await update.message.reply_text(
-        "📌 Stok Saat Ini:\n"
-        f"- EMAS: {stock['GOLD']:.1f} gr\n"
-        f"- PERAK: {stock['SILVER']:.1f} gr",
-    )
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
+    valuation = await portfolio_valuation(telegram_user)
+    assets = valuation["assets"]
+
+    lines = [
+        "📌 Stok Saat Ini:",
+        f"- EMAS: {assets['GOLD']['holdings']:.1f} gr",
+        f"- PERAK: {assets['SILVER']['holdings']:.1f} gr",
+    ]
+    for asset, label in (("GOLD", "EMAS"), ("SILVER", "PERAK")):
+        v = assets[asset]
+        if v["market_value"] is None or not v["holdings"]:
+            continue
+        price_ts = timezone.localtime(valuation["price_ts"]).strftime("%d %b %H:%M")
+        lines += [
+            "",
+            f"💰 Nilai {label} (buyback {fmt_rp(v['price'])}/gr, {price_ts}):",
+            f"- Nilai pasar: {fmt_rp(v['market_value'])}",
+        ]
+        if v["retail_value"]:
+            lines.append(f"- Harga Antam per ukuran: {fmt_rp(v['retail_value'])}")
+        for p in v["products"]:
+            avg = f" (avg {fmt_rp(p['avg_cost'])}/gr)" if p["avg_cost"] else ""
+            lines.append(
+                f"  • {p['product'] or 'lainnya'}: {fmt_gr(p['holdings'])} gr{avg}",
+            )
+        if v["unrealized"] is not None:
+            sign = "+" if v["unrealized"] >= 0 else "-"
+            lines += [
+                f"- Modal (avg beli {fmt_rp(v['avg_cost'])}/gr): "
+                f"{fmt_rp(v['cost_basis'])}",
+                f"- Unrealized: {sign}{fmt_rp(abs(v['unrealized']))}",
+            ]
+    await update.message.reply_text("\n".join(lines))
 
 
 async def cmd_export(update: Update, context: ContextTypes.DEFAULT_TYPE):
     u = update.effective_user
     if not u:
         return
-    telegram_user = await get_or_create_telegram_user(u)
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
 
-    if not telegram_user.subscription.is_pro_active():
+    if not await is_pro(telegram_user):
         await update.message.reply_text("Fitur /export hanya untuk PRO. Ketik /upgrade")
         return
 
-    # default: export bulan ini
-    now = timezone.localtime(timezone.now())
-    start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-    txs = Transaction.objects.filter(
-        telegram_user=telegram_user,
-        created_at__gte=start,
-    ).order_by("created_at")
+    # default: export bulan ini (timezone user)
+    period = periods.month_period(telegram_user)
+    tz = periods.user_tz(telegram_user)
+    txs = await export_transactions(telegram_user, period)
 
     buf = io.StringIO()
     writer = csv.writer(buf)
@@ -218,7 +449,7 @@ async def cmd_export(update: Update, context: ContextTypes.DEFAULT_TYPE):
         writer.writerow(
             [
                 t.id,
-                timezone.localtime(t.created_at).isoformat(),
+                t.created.astimezone(tz).isoformat(),
                 t.side,
                 t.asset,
                 t.product,
@@ -230,12 +461,19 @@ async def cmd_export(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
 
     data = buf.getvalue().encode("utf-8")
-    filename = f"transactions_{now.strftime('%Y_%m')}.csv"
+    filename = f"transactions_{period.first_day:%Y_%m}.csv"
 
+    summary = await export_summary(telegram_user, period)
+    totals = summary["totals"]
     await update.message.reply_document(
         document=data,
         filename=filename,
-        caption="✅ Export CSV bulan ini",
+        caption=(
+            f"✅ Export CSV bulan ini ({summary['count']} transaksi)\n"
+            f"BUY {fmt_rp(totals.get('BUY', 0))} | "
+            f"SELL {fmt_rp(totals.get('SELL', 0))} | "
+            f"BUYBACK {fmt_rp(totals.get('BUYBACK', 0))}"
+        ),
     )
 
 
@@ -243,7 +481,7 @@ async def cmd_delete(update: Update, context: ContextTypes.DEFAULT_TYPE):
     u = update.effective_user
     if not u or not update.message:
         return
-    telegram_user = await get_or_create_telegram_user(u)
+    telegram_user, member = await get_ledger_account(u, update.effective_chat)
 
     args = update.message.text.split()
     if len(args) < TWO_LEN:
@@ -251,23 +489,47 @@ async def cmd_delete(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     target = args[1].strip().lower()
+    if target != "last" and not target.isdigit():
+        await update.message.reply_text("Pakai: /delete last atau /delete <id>")
+        return
+
+    # ledger grup: anggota biasa hanya boleh menghapus catatannya sendiri
+    recorded_by = None
+    if telegram_user.pk != member.pk and not await _is_chat_admin(
+        context,
+        update.effective_chat,
+        u,
+    ):
+        recorded_by = member
+
     if target == "last":
-        tid = await delete_last_tx(telegram_user)
+        tid = await delete_last_tx(telegram_user, recorded_by=recorded_by)
         if not tid:
-            await update.message.reply_text("Belum ada transaksi.")
+            await update.message.reply_text(
+                "Belum ada transaksi yang kamu catat."
+                if recorded_by is not None
+                else "Belum ada transaksi.",
+            )
             return
         await update.message.reply_text(f"🗑️ Dihapus transaksi terakhir (#{tid})")
         return
 
-    if target.isdigit():
-        tid = int(target)
-        tx = await delete_tx_by_telegram_user_and_id(telegram_user, tid)
-        if not tx:
+    tid = int(target)
+    tx = await delete_tx_by_telegram_user_and_id(
+        telegram_user,
+        tid,
+        recorded_by=recorded_by,
+    )
+    if not tx:
+        if recorded_by is not None:
+            await update.message.reply_text(
+                "ID tidak ditemukan di catatanmu. Hanya admin grup yang bisa "
+                "menghapus catatan anggota lain.",
+            )
+        else:
             await update.message.reply_text("ID tidak ditemukan.")
-            return
-        await update.message.reply_text(f"🗑️ Dihapus transaksi #{tid}")
         return
-    await update.message.reply_text("Pakai: /delete last atau /delete <id>")
+    await update.message.reply_text(f"🗑️ Dihapus transaksi #{tid}")
 
 
 async def cmd_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -275,7 +537,7 @@ async def cmd_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not u or not update.message:
         return
 
-    telegram_user = await get_or_create_telegram_user(u)
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
     s = await summary_simple(telegram_user)
     if not s.get("exists"):
         await update.message.reply_text(
@@ -284,14 +546,14 @@ async def cmd_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     avg_buy = s["avg_buy"]
-    avg_buy_str = _fmt_rp(int(avg_buy)) if avg_buy is not None else "-"
+    avg_buy_str = fmt_rp(int(avg_buy)) if avg_buy is not None else "-"
     await update.message.reply_text(
         "\n".join(
             [
                 "📊 Ringkasan (simple):",
-                f"- Total masuk (beli + buyback): {_fmt_gr(s['total_buy_grams'])}gr",
-                f"- Total jual: {_fmt_gr(s['total_sell_grams'])}gr",
-                f"- Holdings: {_fmt_gr(s['holdings'])}gr",
+                f"- Total masuk (beli + buyback): {fmt_gr(s['total_buy_grams'])}gr",
+                f"- Total jual: {fmt_gr(s['total_sell_grams'])}gr",
+                f"- Holdings: {fmt_gr(s['holdings'])}gr",
                 f"- Avg beli (BUY saja): {avg_buy_str}/gr",
                 "",
                 "Catatan: ringkasan ini versi MVP (belum FIFO/realized P&L).",
@@ -300,12 +562,109 @@ async def cmd_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+def _list_scope(metal_type: str | None) -> str:
+    if metal_type == "GOLD":
+        return "EMAS"
+    if metal_type == "SILVER":
+        return "PERAK"
+    return "SEMUA"
+
+
+def _member_label(member) -> str:
+    return f"@{member.username}" if member.username else (member.name or "-")
+
+
+def _render_list(txs, scope: str) -> str:
+    lines = [f"📄 {len(txs)} transaksi ({scope}):"]
+
+    total_pcs = 0
+    total_amount_sum = 0
+    total_grams_sum = 0  # tampil sederhana (float) untuk total list
+
+    for tx in txs:
+        metal_label = "EMAS" if tx.asset == "GOLD" else "PERAK"
+        pcs = tx.pcs or 1
+        total_pcs += pcs
+
+        total_amount = tx.total_amount
+        total_amount_sum += int(total_amount)
+
+        # ledger grup: tampilkan anggota yang mencatat
+        by = f" | oleh {_member_label(tx.recorded_by)}" if tx.recorded_by_id else ""
+
+        if tx.weight_gram is None:
+            # FEE dsb. tanpa berat: tanpa gram & harga per gram
+            lines.append(
+                f"- #{tx.id} {tx.side} | {metal_label} {tx.product} | "
+                f"total {fmt_rp(total_amount)} | {tx.tx_date}{by}",
+            )
+            continue
+
+        # grams sum (Decimal -> float untuk display ringkas)
+        total_grams_sum += float(tx.total_weight)
+
+        # Breakdown pcs x gram/pcs
+        breakdown = f"{pcs}pcs x {fmt_gr(tx.weight_gram)}gr"
+        price_per_gram = tx.total_amount / pcs
+
+        lines.append(
+            f"- #{tx.id} {tx.side} | {metal_label} {tx.product} "
+            f"{fmt_gr(tx.weight_gram)}gr | {breakdown} | "
+            f"@ {fmt_rp(price_per_gram)}/gr | total {fmt_rp(total_amount)}"
+            f" | {tx.tx_date}{by}",
+        )
+
+    lines.append("")
+    lines.append("📌 Total (dari list ini):")
+    lines.append(f"- Total pcs: {total_pcs}pcs")
+    lines.append(
+        f"- Total gram: {fmt_gr(Decimal(total_grams_sum))}gr".rstrip("0").rstrip("."),
+    )
+    lines.append(f"- Total nilai: {fmt_rp(total_amount_sum)}")
+    return "\n".join(lines)
+
+
+def _list_keyboard(
+    owner_id: int,
+    page: tuple,
+    metal_type: str | None,
+    limit: int,
+) -> InlineKeyboardMarkup | None:
+    # callback_data maks 64 byte: list:<owner>:<o|n>:<G|S|A>:<limit>:<yyyymmdd>:<id>
+    txs, has_older, has_newer = page
+    metal = (metal_type or "A")[0]
+    buttons = []
+    if has_newer:
+        first = txs[0]
+        buttons.append(
+            InlineKeyboardButton(
+                "⬅️ Lebih baru",
+                callback_data=(
+                    f"{LIST_CB_PREFIX}{owner_id}:n:{metal}:{limit}:"
+                    f"{first.tx_date:%Y%m%d}:{first.id}"
+                ),
+            ),
+        )
+    if has_older:
+        last = txs[-1]
+        buttons.append(
+            InlineKeyboardButton(
+                "Lebih lama ➡️",
+                callback_data=(
+                    f"{LIST_CB_PREFIX}{owner_id}:o:{metal}:{limit}:"
+                    f"{last.tx_date:%Y%m%d}:{last.id}"
+                ),
+            ),
+        )
+    return InlineKeyboardMarkup([buttons]) if buttons else None
+
+
 async def cmd_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
     u = update.effective_user
     if not u or not update.message:
         return
 
-    telegram_user = await get_or_create_telegram_user(u)
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
 
     metal_type = None
     limit = 5
@@ -316,63 +675,142 @@ async def cmd_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
             metal_type = m
             continue
         if arg.isdigit():
-            limit = max(1, min(int(arg), 50))
+            limit = max(1, min(int(arg), LIST_MAX_LIMIT))
             continue
 
-    txs = await list_last_txs(telegram_user, limit=limit, metal_type=metal_type)
-    scope = (
-        "EMAS"
-        if metal_type == "GOLD"
-        else ("PERAK" if metal_type == "SILVER" else "SEMUA")
-    )
+    page = await list_txs_page(telegram_user, limit=limit, metal_type=metal_type)
+    txs = page[0]
+    scope = _list_scope(metal_type)
     if not txs:
         await update.message.reply_text(f"Belum ada transaksi ({scope}).")
         return
 
-    lines = [f"📄 {len(txs)} transaksi terakhir ({scope}):"]
+    await update.message.reply_text(
+        _render_list(txs, scope),
+        reply_markup=_list_keyboard(u.id, page, metal_type, limit),
+    )
 
-    total_pcs = 0
-    total_amount_sum = 0
-    total_grams_sum = 0  # tampil sederhana (float) untuk total list
 
-    for tx in txs:
-        metal_label = "EMAS" if tx.asset == "GOLD" else "PERAK"
-        pcs = tx.pcs or 1
-        total_pcs += pcs
+async def cb_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    if not query or not query.data:
+        return
+    try:
+        owner, direction, metal, limit, day, tx_id = query.data.removeprefix(
+            LIST_CB_PREFIX,
+        ).split(":")
+        cursor = (datetime.strptime(day, "%Y%m%d").date(), int(tx_id))  # noqa: DTZ007
+        owner, limit = int(owner), max(1, min(int(limit), LIST_MAX_LIMIT))
+    except ValueError:
+        await query.answer("Tombol tidak valid.")
+        return
+    if query.from_user.id != owner:
+        await query.answer("Ini bukan list kamu.", show_alert=True)
+        return
 
-        total_amount = tx.total_amount
-        total_amount_sum += int(total_amount)
+    telegram_user, _ = await get_ledger_account(query.from_user, update.effective_chat)
+    metal_type = {"G": "GOLD", "S": "SILVER"}.get(metal)
+    page = await list_txs_page(
+        telegram_user,
+        limit=limit,
+        metal_type=metal_type,
+        before=cursor if direction == "o" else None,
+        after=cursor if direction == "n" else None,
+    )
+    txs = page[0]
+    await query.answer()
+    if not txs:
+        await query.edit_message_reply_markup(reply_markup=None)
+        return
+    # edit pesan yang sama, bukan kirim pesan baru per halaman
+    await query.edit_message_text(
+        _render_list(txs, _list_scope(metal_type)),
+        reply_markup=_list_keyboard(owner, page, metal_type, limit),
+    )
 
-        # grams sum (Decimal -> float untuk display ringkas)
-        total_grams_sum += float(tx.total_weight)
 
-        # Breakdown pcs x gram/pcs
-        per_piece = None
-        if pcs > 0:
-            per_piece = tx.weight_gram
+async def cmd_find(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    u = update.effective_user
+    if not u or not update.message:
+        return
 
-        breakdown = f"{pcs}pcs"
-        if per_piece is not None:
-            breakdown += f" x {_fmt_gr(per_piece)}gr"
+    with parse_timer():
+        search = parse_find_args(" ".join(context.args or []))
+    if search.is_empty():
+        await update.message.reply_text(
+            "Pakai: /find <filter>\n"
+            "Contoh:\n"
+            "- /find beli emas produk:antam\n"
+            "- /find produk:galeri 24 5gr\n"
+            "- /find jual >10jt\n"
+            "- /find 1jt-5jt note:hadiah",
+        )
+        return
 
-        price_per_gram = tx.total_amount / tx.pcs
+    telegram_user, _ = await get_ledger_account(u, update.effective_chat)
+    txs, has_more = await find_txs(telegram_user, search, limit=FIND_LIMIT)
+    scope = search.describe()
+    if not txs:
+        await update.message.reply_text(f"Tidak ada transaksi ({scope}).")
+        return
 
-        lines.append(
-            f"- {tx.side} | {metal_label} {tx.product} "
-            f"{_fmt_gr(tx.weight_gram)}gr | {breakdown} | "
-            f"@ {_fmt_rp(price_per_gram)}/gr | total {_fmt_rp(total_amount)}"
-            f" | {tx.tx_date}",
-        )
+    text = _render_list(txs, scope)
+    if has_more:
+        text += f"\n\nHanya {FIND_LIMIT} terbaru yang ditampilkan, persempit filter."
+    await update.message.reply_text(text)
 
-    lines.append("")
-    lines.append("📌 Total (dari list ini):")
-    lines.append(f"- Total pcs: {total_pcs}pcs")
-    lines.append(
-        f"- Total gram: {_fmt_gr(Decimal(total_grams_sum))}gr".rstrip("0").rstrip("."),
+
+async def cmd_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.message:
+        return
+
+    snap = await latest_price_snapshot()
+    if not snap:
+        await update.message.reply_text("Belum ada data harga.")
+        return
+
+    ts = timezone.localtime(snap.ts).strftime("%d %b %Y %H:%M WIB")
+    await update.message.reply_text(
+        "\n".join(
+            [
+                f"💰 Harga Emas & Perak ({ts})",
+                "",
+                f"- XAU/USD: {snap.xauusd:,.2f}",
+                f"- USD/IDR: {snap.usdidr:,.2f}",
+                f"- Est. Spot Rp/gram: {fmt_rp(snap.spot_idr_gr)}",
+                f"- Antam 1gr (Harga Dasar): {fmt_rp(snap.antam_1g_base)}",
+                f"- Antam 1gr (+PPh 0.25%): {fmt_rp(snap.antam_1g_pph)}",
+                f"- Buyback: {fmt_rp(snap.buyback)}",
+                *(
+                    [
+                        "",
+                        f"- XAG/USD: {snap.xagusd:,.2f}",
+                        f"- Buyback perak: {fmt_rp(snap.silver_buyback)}",
+                    ]
+                    if snap.xagusd is not None
+                    else []
+                ),
+                "",
+                "Chart: /chart 7d | /chart 30d | /chart 1y",
+            ],
+        ),
     )
-    lines.append(f"- Total nilai: {_fmt_rp(total_amount_sum)}")
 
-    await update.message.reply_text("\n".join(lines))
+
+async def cmd_chart(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.message:
+        return
+
+    range_key = (context.args[0].lower() if context.args else "30d").strip()
+    if range_key not in CHART_RANGES:
+        await update.message.reply_text("Pakai: /chart 7d | 30d | 1y")
+        return
+
+    png = await price_chart_png(range_key)
+    await update.message.reply_photo(
+        photo=png,
+        caption=f"📈 Buyback Logam Mulia - {range_key}",
+    )
 
 
 async def msg_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -380,9 +818,10 @@ async def msg_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     u = update.effective_user
-    telegram_user = await get_or_create_telegram_user(u)
+    telegram_user, member = await get_ledger_account(u, update.effective_chat)
 
-    parsed = parse_transaction(update.message.text)
+    # sudah di-parse guard rate limit kalau aktif
+    parsed = update_transaction(update, context)
     if not parsed:
         # ignore non-transaction chat
         return
@@ -398,39 +837,26 @@ async def msg_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     asset = parsed.asset or Transaction.ASSET_GOLD
 
-    t = await create_tx_from_text(telegram_user, asset, parsed, update)
+    t = await create_tx_from_text(
+        telegram_user,
+        asset,
+        parsed,
+        update,
+        recorded_by=member,
+    )
 
     # reply summary
     total_weight = ""
     if t.weight_gram is not None:
         tw = Decimal(t.weight_gram) * int(t.pcs)
         total_weight = (
-            f"\nBerat: {_fmt_gr(t.weight_gram)} gr X {t.pcs} pcs ({_fmt_gr(tw)} gr)"
+            f"\nBerat: {fmt_gr(t.weight_gram)} gr X {t.pcs} pcs ({fmt_gr(tw)} gr)"
         )
 
     product = f"{t.product} " if t.product else ""
     await update.message.reply_text(
         f"✅ Tercatat: {t.side} {product}{t.asset}"
         f"{total_weight}\n"
-        f"Total: {_fmt_rp(t.total_amount)}\n"
+        f"Total: {fmt_rp(t.total_amount)}\n"
         f"ID: #{t.id}",
     )
-
-
-async def _consume_activation_token(telegram_user, token: str) -> bool:
-    try:
-        at = ActivationToken.objects.get(token=token)
-    except ActivationToken.DoesNotExist:
-        return False
-    if not at.is_valid():
-        return False
-
-    sub = telegram_user.subscription
-    sub.plan = Subscription.PLAN_PRO
-    sub.status = Subscription.STATUS_ACTIVE
-    sub.current_period_end = timezone.now() + timedelta(days=30)
-    sub.save(update_fields=["plan", "status", "current_period_end"])
-
-    at.used_at = timezone.now()
-    at.save(update_fields=["used_at"])
-    return True
@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # agregat ledger, mapping chat -> ledger grup, flag PRO di-cache per pk
+    cache.clear()
+    yield
+    cache.clear()
@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from factory import Sequence
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from lm_tracker.telegram_bot.models import TelegramUser
+from lm_tracker.telegram_bot.models import Transaction
+
+
+class TelegramUserFactory(DjangoModelFactory[TelegramUser]):
+    telegram_user_id = Sequence(lambda n: 500_000_000 + n)
+    username = Sequence(lambda n: f"user{n}")
+
+    class Meta:
+        model = TelegramUser
+
+
+class TransactionFactory(DjangoModelFactory[Transaction]):
+    telegram_user = SubFactory(TelegramUserFactory)
+    asset = Transaction.ASSET_GOLD
+    product = "ANTAM"
+    side = Transaction.SIDE_BUY
+    weight_gram = Decimal(1)
+    pcs = 1
+    total_amount = 1_500_000
+
+    class Meta:
+        model = Transaction
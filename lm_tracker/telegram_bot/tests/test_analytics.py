@@ -0,0 +1,34 @@
+from datetime import date
+
+from lm_tracker.telegram_bot.analytics import cash_flow_by_period
+from lm_tracker.telegram_bot.analytics import ledger_from_rows
+
+
+def _rows(*days: date) -> list[tuple]:
+    return [(day, "GOLD", "BUY", "ANTAM", 1.0, 1_000_000) for day in days]
+
+
+def test_weekly_buckets_start_on_monday():
+    # Minggu 31 Des 2023 | Senin 1 Jan 2024 ... Minggu 7 Jan | Senin 8 Jan
+    ledger = ledger_from_rows(
+        _rows(date(2023, 12, 31), date(2024, 1, 1), date(2024, 1, 7), date(2024, 1, 8)),
+    )
+    buckets = cash_flow_by_period(ledger, "week")
+    assert [start for start, _ in buckets] == [
+        date(2023, 12, 25),
+        date(2024, 1, 1),
+        date(2024, 1, 8),
+    ]
+    assert [totals["BUY"] for _, totals in buckets] == [1_000_000, 2_000_000, 1_000_000]
+
+
+def test_monthly_buckets():
+    ledger = ledger_from_rows(_rows(date(2024, 1, 31), date(2024, 2, 1)))
+    assert [start for start, _ in cash_flow_by_period(ledger)] == [
+        date(2024, 1, 1),
+        date(2024, 2, 1),
+    ]
+
+
+def test_empty_ledger():
+    assert cash_flow_by_period(ledger_from_rows([]), "week") == []
@@ -0,0 +1,60 @@
+import secrets
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from django.utils import timezone
+
+from lm_tracker.telegram_bot.billing_views import checkout
+from lm_tracker.telegram_bot.models import ActivationToken
+from lm_tracker.telegram_bot.models import Subscription
+from lm_tracker.telegram_bot.services import activate_pro
+from lm_tracker.telegram_bot.tests.factories import TelegramUserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize("tg", ["123456", "-1001234567890"])
+def test_checkout_records_target_account(rf: RequestFactory, tg: str):
+    response = checkout(rf.get("/billing/checkout/", {"tg": tg}))
+    assert response.status_code == 302  # noqa: PLR2004
+    assert ActivationToken.objects.get().telegram_user_id == int(tg)
+
+
+@pytest.mark.parametrize("tg", ["", "abc", "12-3", "--1"])
+def test_checkout_rejects_invalid_id(rf: RequestFactory, tg: str):
+    assert checkout(rf.get("/billing/checkout/", {"tg": tg})).content == b"invalid"
+    assert not ActivationToken.objects.exists()
+
+
+def _token(telegram_user_id=None) -> str:
+    token = secrets.token_urlsafe(24)
+    ActivationToken.objects.create(
+        token=token,
+        telegram_user_id=telegram_user_id,
+        expires_at=timezone.now() + timedelta(hours=1),
+    )
+    return token
+
+
+def test_activate_group_ledger_from_private_chat():
+    member = TelegramUserFactory()
+    group = TelegramUserFactory(telegram_user_id=-1001234567890, is_chat=True)
+    Subscription.objects.create(telegram_user=group)
+
+    account = async_to_sync(activate_pro)(member, _token(group.telegram_user_id))
+
+    assert account == group
+    group.subscription.refresh_from_db()
+    assert group.subscription.plan == Subscription.PLAN_PRO
+    assert not Subscription.objects.filter(telegram_user=member).exists()
+
+
+def test_activate_without_target_upgrades_caller():
+    member = TelegramUserFactory()
+    token = _token()
+    assert async_to_sync(activate_pro)(member, token) == member
+    assert Subscription.objects.get(telegram_user=member).plan == Subscription.PLAN_PRO
+    # token sekali pakai
+    assert async_to_sync(activate_pro)(member, token) is None
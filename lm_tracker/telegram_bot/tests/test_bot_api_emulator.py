@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+import pytest
+from telegram.request import HTTPXRequest
+
+from lm_tracker.bot_alert.services.telegram import send_telegram
+from lm_tracker.bot_alert.services.telegram import send_telegram_batch
+from lm_tracker.telegram_bot.bench import BENCH_TOKEN
+from lm_tracker.telegram_bot.bot_api_emulator import running_emulator
+from lm_tracker.telegram_bot.telegram_app import build_app
+
+CHAT_ID = 920_000_001
+
+
+@pytest.fixture
+def emulator(settings):
+    with running_emulator() as (emu, base_url):
+        settings.TELEGRAM_API_BASE_URL = base_url
+        settings.TELEGRAM_BOT_TOKEN = BENCH_TOKEN
+        settings.TELEGRAM_REPLY_QUEUE = False
+        settings.TELEGRAM_RATE_LIMIT_BACKEND = "off"
+        yield emu
+
+
+def _run_bot(coro_fn):
+    async def main():
+        app = build_app(request=HTTPXRequest())
+        await app.bot.initialize()
+        try:
+            return await coro_fn(app.bot)
+        finally:
+            await app.bot.shutdown()
+
+    return asyncio.run(main())
+
+
+def test_base_url_switches_both_clients(emulator):
+    send_telegram(BENCH_TOKEN, CHAT_ID, "dari requests")
+
+    async def calls(bot):
+        message = await bot.send_message(CHAT_ID, "dari PTB")
+        document = await bot.send_document(CHAT_ID, b"a,b\n1,2\n", filename="tx.csv")
+        webhook = await bot.set_webhook("https://example.com/telegram/webhook/")
+        return message, document, webhook
+
+    message, document, webhook = _run_bot(calls)
+    assert message.text == "dari PTB"
+    assert document.document.file_name == "tx.csv"
+    assert webhook is True
+    assert [m.get("text") for m in emulator.sent_messages(CHAT_ID)] == [
+        "dari requests",
+        "dari PTB",
+        None,
+    ]
+    assert emulator.stats()["calls"]["getMe"] == 1
+    assert emulator.webhook["url"] == "https://example.com/telegram/webhook/"
+
+
+def test_rate_limited_send_retried(emulator):
+    emulator.configure(rate_limit=1, retry_after=1)
+
+    sent = send_telegram_batch(BENCH_TOKEN, [(CHAT_ID, "satu"), (CHAT_ID, "dua")])
+
+    assert sent == [CHAT_ID, CHAT_ID]
+    assert emulator.throttled == 1
+    assert emulator.stats()["calls"]["sendMessage"] == 3  # noqa: PLR2004
+    assert [m["text"] for m in emulator.sent_messages(CHAT_ID)] == ["satu", "dua"]
+
+
+def test_flood_ratio_always_throttles(emulator):
+    emulator.configure(flood_ratio=1.0, retry_after=0)
+    # satu retry di send_telegram_batch, lalu pesan dilewati (di-log)
+    assert send_telegram_batch(BENCH_TOKEN, [(CHAT_ID, "x")]) == []
+    assert emulator.throttled == 2  # noqa: PLR2004
+    assert emulator.sent_messages() == []
+
+
+def test_get_updates_and_answer_callback_query(emulator, settings):
+    r = httpx.post(
+        f"{settings.TELEGRAM_API_BASE_URL}/emulator/updates",
+        json={"chat_id": CHAT_ID, "text": "/today"},
+    )
+    update_id = r.json()["result"][0]
+
+    async def poll(bot):
+        updates = await bot.get_updates(timeout=0)
+        confirmed = await bot.get_updates(offset=update_id + 1, timeout=0)
+        answered = await bot.answer_callback_query("cb1", text="ok")
+        return updates, confirmed, answered
+
+    updates, confirmed, answered = _run_bot(poll)
+    assert [(u.update_id, u.message.text) for u in updates] == [(update_id, "/today")]
+    assert updates[0].effective_user.id == CHAT_ID
+    assert confirmed == ()
+    assert answered is True
+    assert emulator.stats()["pending_updates"] == 0
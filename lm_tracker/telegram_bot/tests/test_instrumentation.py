@@ -0,0 +1,99 @@
+import asyncio
+import secrets
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from telegram.ext import ApplicationHandlerStop
+from telegram.request import BaseRequest
+
+from lm_tracker.telegram_bot.instrumentation import InstrumentedRequest
+from lm_tracker.telegram_bot.instrumentation import install_db_wrapper
+from lm_tracker.telegram_bot.instrumentation import instrument
+from lm_tracker.telegram_bot.instrumentation import parse_timer
+from lm_tracker.telegram_bot.models import TelegramUser
+
+API_DELAY = 0.02
+
+
+class SlowBotApi(BaseRequest):
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        await asyncio.sleep(API_DELAY)
+        return 200, b'{"ok": true, "result": true}'
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_instrumented_handler_records_histograms():
+    install_db_wrapper(None, connection)
+    request = InstrumentedRequest(SlowBotApi())
+
+    async def probe(update, context):
+        await sync_to_async(TelegramUser.objects.count)()
+        await sync_to_async(TelegramUser.objects.exists)()
+        with parse_timer():
+            sum(range(1000))
+        await request.do_request("https://api.telegram.org/botX/sendMessage", "POST")
+
+    async def stopped(update, context):
+        raise ApplicationHandlerStop
+
+    update = SimpleNamespace()
+    async_to_sync(instrument(probe, "probe_ok"))(update, None)
+    with pytest.raises(ApplicationHandlerStop):
+        async_to_sync(instrument(stopped, "probe_stop"))(update, None)
+
+    ok = {"handler": "probe_ok"}
+    assert _sample("telegram_handler_duration_seconds_count", outcome="ok", **ok) == 1
+    assert _sample("telegram_handler_duration_seconds_sum", outcome="ok", **ok) >= (
+        API_DELAY
+    )
+    assert _sample("telegram_handler_db_queries_sum", **ok) == 2  # noqa: PLR2004
+    assert _sample("telegram_handler_db_duration_seconds_sum", **ok) > 0
+    assert _sample("telegram_handler_api_duration_seconds_sum", **ok) >= API_DELAY
+    assert _sample("telegram_handler_parse_duration_seconds_sum", **ok) > 0
+    assert _sample("telegram_api_request_duration_seconds_count", method="sendMessage")
+    assert (
+        _sample(
+            "telegram_handler_duration_seconds_count",
+            handler="probe_stop",
+            outcome="stop",
+        )
+        == 1
+    )
+    # di luar handler tidak ada yang dicatat ke handler mana pun
+    assert _sample("telegram_handler_db_queries_sum", handler="probe_stop") == 0
+
+
+def test_metrics_requires_token(client, settings):
+    settings.METRICS_TOKEN = secrets.token_urlsafe()
+    url = reverse("telegram_bot:metrics")
+
+    forbidden = HTTPStatus.FORBIDDEN
+    assert client.get(url).status_code == forbidden
+    wrong = client.get(url, headers={"Authorization": "Bearer salah"})
+    assert wrong.status_code == forbidden
+    response = client.get(
+        url,
+        headers={"Authorization": f"Bearer {settings.METRICS_TOKEN}"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert b"telegram_handler_duration_seconds" in response.content
@@ -0,0 +1,47 @@
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from types import SimpleNamespace
+
+from lm_tracker.telegram_bot.periods import day_period
+from lm_tracker.telegram_bot.periods import month_period
+from lm_tracker.telegram_bot.periods import valid_timezone
+from lm_tracker.telegram_bot.periods import week_period
+
+JAKARTA = SimpleNamespace(timezone="Asia/Jakarta")
+LONDON = SimpleNamespace(timezone="Europe/London")
+
+
+def test_day_period_starts_at_local_midnight():
+    period = day_period(JAKARTA, date(2025, 1, 15))
+    assert period.start == datetime(2025, 1, 14, 17, tzinfo=UTC)
+    assert period.end == datetime(2025, 1, 15, 17, tzinfo=UTC)
+    assert period.last_day == date(2025, 1, 15)
+
+
+def test_week_period_monday_to_sunday():
+    period = week_period(JAKARTA, date(2025, 1, 19))  # Minggu
+    assert (period.first_day, period.last_day) == (date(2025, 1, 13), date(2025, 1, 19))
+
+
+def test_month_period_across_dst():
+    # London pindah ke BST (UTC+1) 30 Maret 2025
+    period = month_period(LONDON, date(2025, 3, 31))
+    assert (period.first_day, period.end_day) == (date(2025, 3, 1), date(2025, 4, 1))
+    assert period.start == datetime(2025, 3, 1, tzinfo=UTC)
+    assert period.end == datetime(2025, 3, 31, 23, tzinfo=UTC)
+
+
+def test_period_key_shared_per_timezone():
+    other = SimpleNamespace(timezone="Asia/Jakarta")
+    day = date(2025, 1, 15)
+    assert week_period(JAKARTA, day).key == week_period(other, day).key
+    assert week_period(JAKARTA, day).key != week_period(LONDON, day).key
+
+
+def test_invalid_timezone_falls_back_to_default(settings):
+    settings.TIME_ZONE = "Asia/Jakarta"
+    assert not valid_timezone("Mars/Olympus")
+    broken = SimpleNamespace(timezone="Mars/Olympus")
+    day = date(2025, 1, 15)
+    assert day_period(broken, day) == day_period(JAKARTA, day)
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop
+
+from lm_tracker.telegram_bot import ratelimit
+from lm_tracker.telegram_bot.bench import BENCH_TOKEN
+from lm_tracker.telegram_bot.bench import CannedBotApi
+from lm_tracker.telegram_bot.bench import update_payload
+from lm_tracker.telegram_bot.parser import parse_transaction
+from lm_tracker.telegram_bot.ratelimit import MemoryBuckets
+from lm_tracker.telegram_bot.ratelimit import rate_limit_guard
+from lm_tracker.telegram_bot.telegram_app import build_app
+
+GROUP_ID = -100555
+MEMBER_ID = 4242
+
+
+def test_memory_buckets_burst_then_refill():
+    buckets = MemoryBuckets(rate=1, burst=3)
+
+    async def main():
+        waits = [await buckets.take(1, 1) for _ in range(4)]
+        assert waits[:3] == [0, 0, 0]
+        assert 0 < waits[3] <= 1
+        # user lain punya bucket sendiri; biaya > 1 memakan beberapa token
+        assert await buckets.take(2, 3) == 0
+        assert await buckets.take(2, 1) > 0
+
+    asyncio.run(main())
+
+
+@pytest.fixture
+def app(settings):
+    settings.TELEGRAM_BOT_TOKEN = BENCH_TOKEN
+    settings.TELEGRAM_RATE_LIMIT_BACKEND = "memory"
+    settings.TELEGRAM_RATE_LIMIT_RATE = 0.01
+    settings.TELEGRAM_RATE_LIMIT_BURST = 2
+    ratelimit.get_buckets.cache_clear()
+    ratelimit._notified_until.clear()  # noqa: SLF001
+    app = build_app(request=CannedBotApi())
+    asyncio.run(app.bot.initialize())  # username bot untuk /cmd@bot
+    yield app
+    ratelimit.get_buckets.cache_clear()
+
+
+def _group_update(app, update_id: int, text: str) -> Update:
+    data = update_payload(update_id, MEMBER_ID, text)
+    data["message"]["chat"] = {"id": GROUP_ID, "type": "supergroup", "title": "Staf"}
+    return Update.de_json(data, app.bot)
+
+
+def _guard(app, update: Update) -> bool:
+    """True kalau update dihentikan limiter."""
+    context = SimpleNamespace(application=app)
+    try:
+        asyncio.run(rate_limit_guard(update, context))
+    except ApplicationHandlerStop:
+        return True
+    return False
+
+
+def test_group_chatter_is_not_charged(app):
+    # burst 2: tanpa filter, update ketiga sudah dihentikan
+    texts = ["halo semua", "/foo@bot_lain", "/today@bot_lain", "siap, nanti dicek"]
+    for i, text in enumerate(texts * 5):
+        assert not _guard(app, _group_update(app, i + 1, text)), text
+
+
+def test_commands_and_transactions_are_charged(app):
+    texts = ["/today", "beli emas antam 1gr total 1.500.000", "/help"]
+    stopped = [
+        _guard(app, _group_update(app, i + 1, text)) for i, text in enumerate(texts)
+    ]
+    assert stopped == [False, False, True]
+
+
+def test_transaction_parsed_once_per_update(app, monkeypatch):
+    calls = []
+
+    def counting_parse(text):
+        calls.append(text)
+        return parse_transaction(text)
+
+    monkeypatch.setattr(ratelimit, "parse_transaction", counting_parse)
+    text = "beli emas antam 1gr total 1.500.000"
+    update = _group_update(app, 1, text)
+    context = SimpleNamespace(application=app)
+    asyncio.run(rate_limit_guard(update, context))
+
+    parsed = ratelimit.update_transaction(update, context)
+    assert parsed.total_amount == 1_500_000  # noqa: PLR2004
+    assert calls == [text]
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+
+from lm_tracker.telegram_bot.replies import MESSAGE_SEPARATOR
+from lm_tracker.telegram_bot.replies import ReplyLimiter
+
+CHAT_ID = 7001
+
+
+class FakeBotApi:
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, endpoint, data, **kwargs):
+        await self.release.wait()
+        self.calls.append((endpoint, data))
+        if endpoint == "getChatMember":
+            return {"status": "administrator"}
+        return {"message_id": len(self.calls)}
+
+
+async def _send(limiter, api, endpoint, **data):
+    return await limiter.process_request(api, (), {}, endpoint, data, None)
+
+
+def test_paced_send_does_not_block_handler():
+    async def main():
+        limiter = ReplyLimiter()
+        api = FakeBotApi()
+        api.release.clear()  # Bot API "lambat"
+        result = await _send(limiter, api, "sendMessage", chat_id=CHAT_ID, text="ok")
+        # handler langsung dapat Message pengganti, kiriman masih di antrean
+        assert result["message_id"] == 0
+        assert result["chat"] == {"id": CHAT_ID, "type": "private"}
+        assert api.calls == []
+
+        api.release.set()
+        await limiter.shutdown()
+        assert api.calls == [("sendMessage", {"chat_id": CHAT_ID, "text": "ok"})]
+
+    asyncio.run(main())
+
+
+def test_unqueued_endpoint_returns_real_result():
+    async def main():
+        limiter = ReplyLimiter()
+        api = FakeBotApi()
+        result = await _send(
+            limiter,
+            api,
+            "getChatMember",
+            chat_id=-100,
+            user_id=CHAT_ID,
+        )
+        assert result == {"status": "administrator"}
+        assert not limiter._workers  # noqa: SLF001
+
+    asyncio.run(main())
+
+
+def test_consecutive_texts_merged_and_edits_collapsed():
+    async def main():
+        limiter = ReplyLimiter()
+        api = FakeBotApi()
+        for text in ("a", "b", "c"):
+            await _send(limiter, api, "sendMessage", chat_id=CHAT_ID, text=text)
+        # keyboard: tidak digabung dengan teks biasa
+        await _send(
+            limiter,
+            api,
+            "sendMessage",
+            chat_id=CHAT_ID,
+            text="d",
+            reply_markup="kb",
+        )
+        for text in ("v1", "v2", "v3"):
+            await _send(
+                limiter,
+                api,
+                "editMessageText",
+                chat_id=CHAT_ID,
+                message_id=5,
+                text=text,
+            )
+        await limiter.shutdown()
+
+        texts = [(endpoint, data["text"]) for endpoint, data in api.calls]
+        assert texts == [
+            ("sendMessage", MESSAGE_SEPARATOR.join(["a", "b", "c"])),
+            ("sendMessage", "d"),
+            ("editMessageText", "v3"),
+        ]
+        assert limiter.merged == 4  # noqa: PLR2004
+
+    asyncio.run(main())
+
+
+def test_failed_background_send_is_logged(caplog):
+    async def failing(endpoint, data, **kwargs):
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    async def main():
+        limiter = ReplyLimiter()
+        await _send(limiter, failing, "sendMessage", chat_id=CHAT_ID, text="x")
+        await limiter.shutdown()
+        assert not limiter._queues  # noqa: SLF001
+
+    with caplog.at_level(logging.ERROR, logger="lm_tracker.telegram_bot.replies"):
+        asyncio.run(main())
+    assert "gagal kirim sendMessage" in caplog.text
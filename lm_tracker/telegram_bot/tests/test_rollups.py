@@ -0,0 +1,93 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from lm_tracker.telegram_bot import rollups
+from lm_tracker.telegram_bot.models import DailyLedgerRollup
+from lm_tracker.telegram_bot.models import Transaction
+from lm_tracker.telegram_bot.periods import week_period
+from lm_tracker.telegram_bot.tests.factories import TelegramUserFactory
+from lm_tracker.telegram_bot.tests.factories import TransactionFactory
+
+pytestmark = pytest.mark.django_db
+
+MONDAY = date(2025, 1, 13)
+
+
+def _ledger(account):
+    return [
+        TransactionFactory(telegram_user=account, tx_date=MONDAY, pcs=2),
+        TransactionFactory(
+            telegram_user=account,
+            tx_date=MONDAY,
+            side=Transaction.SIDE_BUYBACK,
+            weight_gram=Decimal("0.5"),
+            total_amount=700_000,
+        ),
+        TransactionFactory(
+            telegram_user=account,
+            tx_date=date(2025, 1, 15),
+            asset=Transaction.ASSET_SILVER,
+            weight_gram=Decimal(100),
+            total_amount=1_600_000,
+        ),
+        TransactionFactory(
+            telegram_user=account,
+            tx_date=date(2025, 1, 15),
+            side=Transaction.SIDE_FEE,
+            weight_gram=None,
+            total_amount=25_000,
+        ),
+        # minggu berikutnya
+        TransactionFactory(telegram_user=account, tx_date=date(2025, 1, 20)),
+    ]
+
+
+def _rows(account):
+    return list(
+        DailyLedgerRollup.objects.filter(telegram_user=account)
+        .order_by("day")
+        .values("day", *rollups.ROLLUP_FIELDS),
+    )
+
+
+def test_apply_tx_matches_rebuild():
+    account = TelegramUserFactory()
+    for tx in _ledger(account):
+        rollups.apply_tx(tx)
+    incremental = _rows(account)
+
+    assert rollups.rebuild_rollups(account) == len(incremental)
+    assert _rows(account) == incremental
+
+    monday = incremental[0]
+    assert monday["tx_count"] == 2  # noqa: PLR2004
+    assert monday["gold_grams_in"] == Decimal(2)
+    assert monday["gold_grams_out"] == Decimal("0.5")
+    assert monday["buyback_amount"] == 700_000  # noqa: PLR2004
+    wednesday = incremental[1]
+    assert wednesday["silver_grams_in"] == Decimal(100)
+    assert wednesday["fee_amount"] == 25_000  # noqa: PLR2004
+
+
+def test_apply_tx_reversal_drops_empty_day():
+    account = TelegramUserFactory()
+    tx = TransactionFactory(telegram_user=account, tx_date=MONDAY)
+    rollups.apply_tx(tx)
+    rollups.apply_tx(tx, sign=-1)
+    assert not DailyLedgerRollup.objects.filter(telegram_user=account).exists()
+
+
+def test_period_report_sums_days_in_week():
+    account = TelegramUserFactory()
+    for tx in _ledger(account):
+        rollups.apply_tx(tx)
+
+    report = async_to_sync(rollups.period_report)(account, week_period(account, MONDAY))
+    assert report["first_day"] == MONDAY
+    assert report["days"] == 2  # noqa: PLR2004
+    assert report["tx_count"] == 4  # noqa: PLR2004
+    assert report["buy_amount"] == 3_100_000  # noqa: PLR2004
+    assert report["fee_amount"] == 25_000  # noqa: PLR2004
@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from lm_tracker.telegram_bot.models import Transaction
+from lm_tracker.telegram_bot.search import TxSearch
+from lm_tracker.telegram_bot.search import parse_find_args
+from lm_tracker.telegram_bot.services import find_txs
+from lm_tracker.telegram_bot.tests.factories import TelegramUserFactory
+from lm_tracker.telegram_bot.tests.factories import TransactionFactory
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (
+            "beli emas produk:galeri 24 5gr >10jt note:hadiah",
+            TxSearch(
+                side=Transaction.SIDE_BUY,
+                asset=Transaction.ASSET_GOLD,
+                product="GALERI 24",
+                weight_gram=Decimal(5),
+                min_amount=10_000_001,
+                note="hadiah",
+            ),
+        ),
+        (
+            "jual 1jt-5jt ubs",
+            TxSearch(
+                side=Transaction.SIDE_SELL,
+                min_amount=1_000_000,
+                max_amount=5_000_000,
+                words=["ubs"],
+            ),
+        ),
+        (
+            "bb 3.000.000-2.000.000",
+            TxSearch(
+                side=Transaction.SIDE_BUYBACK,
+                min_amount=2_000_000,
+                max_amount=3_000_000,
+            ),
+        ),
+        (
+            "<= 500rb perak",
+            TxSearch(asset=Transaction.ASSET_SILVER, max_amount=500_000),
+        ),
+        # "5 gr" setelah produk:GALERI 24 tetap berat, bukan bagian nama produk
+        (
+            "produk:galeri 24 5 gr",
+            TxSearch(product="GALERI 24", weight_gram=Decimal(5)),
+        ),
+        # angka polos bukan nominal
+        ("2025 kado", TxSearch(words=["2025", "kado"])),
+        ("", TxSearch()),
+    ],
+)
+def test_parse_find_args(text, expected):
+    assert parse_find_args(text) == expected
+
+
+def test_describe():
+    assert parse_find_args("").describe() == "SEMUA"
+    assert parse_find_args("jual perak <1jt").describe() == "SELL, PERAK, <= 999.999"
+
+
+@pytest.mark.django_db
+def test_find_txs_matches_product_variants_and_filters():
+    account = TelegramUserFactory()
+    galeri = TransactionFactory(
+        telegram_user=account,
+        product="GALERI 24",
+        weight_gram=Decimal(5),
+        total_amount=8_000_000,
+        note="hadiah nikah",
+    )
+    TransactionFactory(telegram_user=account, product="UBS", weight_gram=Decimal(5))
+    TransactionFactory(telegram_user=account, side=Transaction.SIDE_SELL)
+
+    find = async_to_sync(find_txs)
+    assert find(account, parse_find_args("produk:galeri24")) == ([galeri], False)
+    assert find(account, parse_find_args("beli 5gr >5jt")) == ([galeri], False)
+    assert find(account, parse_find_args("nikah")) == ([galeri], False)
+    txs, more = find(account, parse_find_args("beli"), limit=1)
+    assert len(txs) == 1
+    assert more
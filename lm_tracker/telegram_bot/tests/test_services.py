@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from lm_tracker.telegram_bot import rollups
+from lm_tracker.telegram_bot.models import DailyLedgerRollup
+from lm_tracker.telegram_bot.models import Transaction
+from lm_tracker.telegram_bot.services import delete_last_tx
+from lm_tracker.telegram_bot.services import list_txs_page
+from lm_tracker.telegram_bot.tests.factories import TelegramUserFactory
+from lm_tracker.telegram_bot.tests.factories import TransactionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_delete_last_tx_empty_ledger():
+    account = TelegramUserFactory()
+    assert async_to_sync(delete_last_tx)(account) is None
+
+
+def test_delete_last_tx_reverses_rollup():
+    account = TelegramUserFactory()
+    first = TransactionFactory(telegram_user=account)
+    last = TransactionFactory(telegram_user=account, total_amount=2_000_000)
+    for tx in (first, last):
+        rollups.apply_tx(tx)
+
+    assert async_to_sync(delete_last_tx)(account) == last.id
+    assert list(Transaction.objects.filter(telegram_user=account)) == [first]
+    rollup = DailyLedgerRollup.objects.get(telegram_user=account)
+    assert rollup.tx_count == 1
+    assert rollup.buy_amount == first.total_amount
+
+
+def test_list_txs_page_keyset_both_directions():
+    account = TelegramUserFactory()
+    # 7 transaksi, beberapa di tanggal yang sama: urutan (tx_date, id)
+    days = [1, 2, 2, 2, 3, 4, 4]
+    txs = [
+        TransactionFactory(telegram_user=account, tx_date=date(2025, 1, d))
+        for d in days
+    ]
+    newest_first = txs[::-1]
+    page = async_to_sync(list_txs_page)
+
+    first, older, newer = page(account, limit=3)
+    assert (first, older, newer) == (newest_first[:3], True, False)
+
+    cursor = (first[-1].tx_date, first[-1].id)
+    second, older, newer = page(account, limit=3, before=cursor)
+    assert (second, older, newer) == (newest_first[3:6], True, True)
+
+    cursor = (second[-1].tx_date, second[-1].id)
+    last, older, newer = page(account, limit=3, before=cursor)
+    assert (last, older, newer) == (newest_first[6:], False, True)
+
+    # kembali ke halaman yang lebih baru dari cursor halaman kedua
+    cursor = (second[0].tx_date, second[0].id)
+    back, older, newer = page(account, limit=3, after=cursor)
+    assert (back, older, newer) == (newest_first[:3], True, False)
+
+
+def test_list_txs_page_filters_metal():
+    account = TelegramUserFactory()
+    gold = TransactionFactory(telegram_user=account)
+    TransactionFactory(telegram_user=account, asset=Transaction.ASSET_SILVER)
+    txs, older, newer = async_to_sync(list_txs_page)(account, metal_type="GOLD")
+    assert (txs, older, newer) == ([gold], False, False)
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+from lm_tracker.telegram_bot import subscriptions
+from lm_tracker.telegram_bot.models import Subscription
+from lm_tracker.telegram_bot.tests.factories import TelegramUserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _pro(end_in: timedelta, **kwargs) -> Subscription:
+    return Subscription.objects.create(
+        telegram_user=TelegramUserFactory(),
+        plan=Subscription.PLAN_PRO,
+        current_period_end=timezone.now() + end_in,
+        **kwargs,
+    )
+
+
+def test_expire_lapsed_clears_cached_flag(django_capture_on_commit_callbacks):
+    lapsed = _pro(timedelta(seconds=-1))
+    active = _pro(timedelta(days=10))
+    free = Subscription.objects.create(telegram_user=TelegramUserFactory())
+    # flag PRO lama masih di cache sebelum sweeper jalan
+    subscriptions.cache.set(
+        subscriptions.ENTITLEMENT_KEY.format(user_id=lapsed.telegram_user_id),
+        1,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert subscriptions.expire_lapsed() == 1
+
+    lapsed.refresh_from_db()
+    assert lapsed.status == Subscription.STATUS_EXPIRED
+    assert not subscriptions.is_pro_cached(lapsed.telegram_user_id)
+    assert subscriptions.is_pro_cached(active.telegram_user_id)
+    assert not subscriptions.is_pro_cached(free.telegram_user_id)
+    assert subscriptions.expire_lapsed() == 0
+
+
+def test_entitlement_ttl_capped_at_period_end():
+    sub = _pro(timedelta(seconds=90))
+    active, ttl = subscriptions._entitlement(sub)  # noqa: SLF001
+    assert active
+    assert 0 < ttl <= 90  # noqa: PLR2004
+
+
+def test_renewal_reminder_sent_once_per_period(settings):
+    settings.SUBSCRIPTION_REMINDER_DAYS = 3
+    due = _pro(timedelta(days=2))
+    _pro(timedelta(days=20))
+    _pro(timedelta(days=1), reminded_at=timezone.now())
+
+    assert subscriptions.send_renewal_reminders(dry_run=True) == 1
+    due.refresh_from_db()
+    assert due.reminded_at is not None
+    assert subscriptions.send_renewal_reminders(dry_run=True) == 0
+
+
+def test_sweep_subscriptions(settings):
+    settings.SUBSCRIPTION_REMINDER_DAYS = 3
+    _pro(timedelta(hours=-1))
+    _pro(timedelta(days=1))
+    assert subscriptions.sweep_subscriptions(dry_run=True) == {
+        "expired": 1,
+        "reminded": 1,
+    }
+
+
+def test_sync_and_async_cache_same_flag():
+    sub = _pro(timedelta(days=1))
+    pk = sub.telegram_user_id
+    key = subscriptions.ENTITLEMENT_KEY.format(user_id=pk)
+    assert async_to_sync(subscriptions.ais_pro_cached)(pk)
+    cached_async = subscriptions.cache.get(key)
+    subscriptions.cache.delete(key)
+    assert subscriptions.is_pro_cached(pk)
+    assert subscriptions.cache.get(key) == cached_async == 1
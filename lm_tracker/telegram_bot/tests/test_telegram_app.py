@@ -0,0 +1,106 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from asgiref.sync import async_to_sync
+from telegram.constants import ChatMemberStatus
+
+from lm_tracker.telegram_bot.models import Transaction
+from lm_tracker.telegram_bot.search import parse_find_args
+from lm_tracker.telegram_bot.services import find_txs
+from lm_tracker.telegram_bot.telegram_app import _render_list
+from lm_tracker.telegram_bot.telegram_app import cmd_delete
+from lm_tracker.telegram_bot.tests.factories import TelegramUserFactory
+from lm_tracker.telegram_bot.tests.factories import TransactionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_render_list_with_fee_rows():
+    account = TelegramUserFactory()
+    fee = TransactionFactory(
+        telegram_user=account,
+        side=Transaction.SIDE_FEE,
+        product="",
+        weight_gram=None,
+        total_amount=50_000,
+    )
+    buy = TransactionFactory(
+        telegram_user=account,
+        weight_gram=Decimal("0.5"),
+        pcs=2,
+        total_amount=3_000_000,
+    )
+
+    txs, _ = async_to_sync(find_txs)(account, parse_find_args("fee"))
+    assert txs == [fee]
+    text = _render_list(txs, "fee")
+    assert f"#{fee.id} FEE" in text
+    assert "/gr" not in text.splitlines()[1]
+    assert "- Total nilai: Rp 50.000" in text
+
+    text = _render_list([fee, buy], "semua")
+    assert "2pcs x 0,5gr" in text
+    assert "- Total gram: 1gr" in text
+    assert "- Total nilai: Rp 3.050.000" in text
+
+
+def _group_delete(member, text: str, status: str):
+    # panggil cmd_delete langsung: update grup + bot palsu (tanpa Bot API)
+    chat = SimpleNamespace(id=-100123, type="supergroup", title="Staf")
+    user = SimpleNamespace(
+        id=member.telegram_user_id,
+        first_name=member.name,
+        last_name=None,
+        username=member.username,
+    )
+    message = SimpleNamespace(text=text, reply_text=AsyncMock())
+    update = SimpleNamespace(
+        effective_user=user,
+        effective_chat=chat,
+        message=message,
+    )
+    bot = SimpleNamespace(
+        get_chat_member=AsyncMock(return_value=SimpleNamespace(status=status)),
+    )
+    async_to_sync(cmd_delete)(update, SimpleNamespace(bot=bot))
+    return message.reply_text.await_args.args[0]
+
+
+@pytest.fixture
+def group_ledger():
+    account = TelegramUserFactory(telegram_user_id=-100123, is_chat=True)
+    account.shared_ledger = True
+    account.save()
+    alice = TelegramUserFactory()
+    bob = TelegramUserFactory()
+    alice_tx = TransactionFactory(telegram_user=account, recorded_by=alice)
+    bob_tx = TransactionFactory(telegram_user=account, recorded_by=bob)
+    return account, alice, bob, alice_tx, bob_tx
+
+
+def test_group_member_cannot_delete_others_entries(group_ledger):
+    account, alice, _, alice_tx, bob_tx = group_ledger
+
+    reply = _group_delete(alice, f"/delete {bob_tx.id}", ChatMemberStatus.MEMBER)
+    assert "Hanya admin grup" in reply
+    assert Transaction.objects.filter(pk=bob_tx.pk).exists()
+
+    # "last" = catatan terakhir anggota itu sendiri, bukan milik bob
+    reply = _group_delete(alice, "/delete last", ChatMemberStatus.MEMBER)
+    assert f"#{alice_tx.id}" in reply
+    assert list(Transaction.objects.filter(telegram_user=account)) == [bob_tx]
+
+
+def test_group_admin_can_delete_any_entry(group_ledger):
+    _, alice, _, _, bob_tx = group_ledger
+    reply = _group_delete(alice, f"/delete {bob_tx.id}", ChatMemberStatus.ADMINISTRATOR)
+    assert reply == f"🗑️ Dihapus transaksi #{bob_tx.id}"
+    assert not Transaction.objects.filter(pk=bob_tx.pk).exists()
+
+
+def test_render_list_truncates_fractional_price():
+    tx = TransactionFactory(pcs=3, total_amount=2_000_000)
+    # 2.000.000 / 3 = 666.666,67 -> dipotong, bukan dibulatkan
+    assert "@ Rp 666.666/gr | total Rp 2.000.000" in _render_list([tx], "semua")
@@ -0,0 +1,177 @@
+import asyncio
+import contextlib
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from telegram import Update
+from telegram.error import NetworkError
+from telegram.error import RetryAfter
+from telegram.error import TimedOut
+
+from lm_tracker.telegram_bot import update_stream
+from lm_tracker.telegram_bot.bench import update_payload
+from lm_tracker.telegram_bot.update_stream import ShardConsumer
+from lm_tracker.telegram_bot.update_stream import run_fetcher
+from lm_tracker.telegram_bot.update_stream import shard_owner
+from lm_tracker.telegram_bot.update_stream import update_shard
+
+SHARDS = 16
+
+
+class FakeRedis:
+    """Cukup untuk run_fetcher: GET offset + pipeline XADD / SET."""
+
+    def __init__(self):
+        self.streams: dict[str, list[dict]] = {}
+        self.values: dict[str, object] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    @contextlib.asynccontextmanager
+    async def pipeline(self, *, transaction=True):
+        yield FakePipeline(self)
+
+    async def zrem(self, key, name):
+        raise RedisConnectionError
+
+
+class ClaimRedis:
+    """SET NX lease + XAUTOCLAIM berhalaman atas entry pending satu shard."""
+
+    def __init__(self, pending: list[str]):
+        self.pending = dict.fromkeys(pending, "mati")
+        self.claim_calls = 0
+
+    async def set(self, key, value, **kwargs):
+        return True
+
+    async def xautoclaim(self, stream, group, name, *, start_id, count, **kwargs):
+        self.claim_calls += 1
+        ids = [i for i in self.pending if i >= start_id]
+        for entry_id in ids[:count]:
+            self.pending[entry_id] = name
+        next_id = ids[count] if len(ids) > count else "0-0"
+        return [next_id.encode(), ids[:count], []]
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.ops = []
+
+    def xadd(self, key, fields, **kwargs):
+        self.ops.append(lambda: self.redis.streams.setdefault(key, []).append(fields))
+
+    def set(self, key, value):
+        self.ops.append(lambda: self.redis.values.__setitem__(key, value))
+
+    async def execute(self):
+        for op in self.ops:
+            op()
+
+
+def test_update_shard_follows_sender():
+    data = update_payload(1, 1234, "/today")
+    assert update_shard(data, SHARDS) == 1234 % SHARDS
+    assert update_shard({"update_id": 7}, SHARDS) == 7 % SHARDS
+
+
+def test_rebalance_moves_only_affected_shards():
+    consumers = ["a", "b", "c"]
+    before = {s: shard_owner(s, consumers) for s in range(SHARDS)}
+    assert set(before.values()) == set(consumers)
+
+    # c berhenti: hanya shard milik c yang pindah
+    after = {s: shard_owner(s, ["a", "b"]) for s in range(SHARDS)}
+    assert all(after[s] == before[s] for s in before if before[s] != "c")
+
+    # d bergabung: shard yang pindah hanya ke d
+    joined = {s: shard_owner(s, [*consumers, "d"]) for s in range(SHARDS)}
+    assert all(joined[s] in (before[s], "d") for s in before)
+    assert shard_owner(0, []) is None
+
+
+def test_fetcher_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr(update_stream, "RETRY_BACKOFF", 0)
+    redis = FakeRedis()
+    updates = [Update.de_json(update_payload(i, 100 + i, "hi"), None) for i in (5, 6)]
+    results = [
+        NetworkError("koneksi putus"),
+        TimedOut(),
+        RetryAfter(0),
+        updates,
+    ]
+    offsets = []
+
+    class FakeBot:
+        async def get_updates(self, offset, **kwargs):
+            offsets.append(offset)
+            if not results:
+                await asyncio.Event().wait()  # long-poll tanpa update baru
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+    async def main():
+        task = asyncio.create_task(
+            run_fetcher(redis, FakeBot(), shards=SHARDS, maxlen=100),
+        )
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            # error, timeout, 429, batch, lalu poll berikutnya dengan offset baru
+            if len(offsets) == 5:  # noqa: PLR2004
+                break
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert offsets == [None, None, None, None, 7]
+    assert redis.values[update_stream.OFFSET_KEY] == 7  # noqa: PLR2004
+    assert sum(len(entries) for entries in redis.streams.values()) == len(updates)
+
+
+def test_consumer_stops_when_heartbeat_fails():
+    consumer = ShardConsumer(FakeRedis(), None, shards=SHARDS, name="a")
+    consumed = []
+
+    async def ensure_groups():
+        pass
+
+    async def heartbeat(stop):
+        await asyncio.sleep(0.05)
+        raise RedisConnectionError
+
+    async def rebalance():
+        consumer.owned = consumer.owned or {0, 1}
+
+    async def consume_once():
+        consumed.append(set(consumer.owned))
+        await asyncio.sleep(0.01)
+
+    consumer._ensure_groups = ensure_groups  # noqa: SLF001
+    consumer._heartbeat = heartbeat  # noqa: SLF001
+    consumer.rebalance = rebalance
+    consumer.consume_once = consume_once
+
+    async def main():
+        await asyncio.wait_for(consumer.run(asyncio.Event()), 1)
+
+    with pytest.raises(RedisConnectionError):
+        asyncio.run(main())
+    assert consumed
+    assert consumer.owned == set()
+
+
+def test_acquire_claims_all_pending_pages():
+    pending = [f"{n:05d}-0" for n in range(2500)]
+    redis = ClaimRedis(pending)
+    consumer = ShardConsumer(redis, None, shards=SHARDS, name="baru")
+
+    asyncio.run(consumer._acquire(3))  # noqa: SLF001
+
+    assert set(redis.pending.values()) == {"baru"}
+    assert redis.claim_calls == 3  # noqa: PLR2004
+    assert consumer.owned == consumer.backlog == {3}
@@ -0,0 +1,361 @@
+"""
+Long-polling yang bisa di-scale horizontal lewat Redis stream.
+
+  fetcher (1 proses)  : getUpdates -> XADD ke stream shard
+                        telegram_bot:updates:<user_id % N>, offset disimpan
+                        di Redis bareng XADD (at-least-once).
+  consumer (N proses) : tiap shard dipegang tepat satu consumer (lease Redis),
+                        entry diproses berurutan lalu XACK, jadi urutan update
+                        per user terjaga. Shard dibagi pakai rendezvous hashing
+                        atas consumer yang masih heartbeat; consumer baru /
+                        berhenti -> shard pindah setelah batch berjalan selesai
+                        (lease dilepas), consumer mati -> lease kedaluwarsa dan
+                        entry pending-nya di-XAUTOCLAIM pemilik baru.
+
+Jumlah shard (TELEGRAM_UPDATE_SHARDS) jangan diubah selagi stream masih berisi
+entry, karena user bisa pindah shard di tengah antrean.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError
+from redis.exceptions import ResponseError
+from redis.exceptions import WatchError
+from telegram.error import InvalidToken
+from telegram.error import RetryAfter
+from telegram.error import TelegramError
+from telegram.error import TimedOut
+
+from .ratelimit import retry_after_seconds
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+
+    from telegram import Bot
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "telegram_bot:updates:{shard}"
+OFFSET_KEY = "telegram_bot:updates:offset"
+CONSUMERS_KEY = "telegram_bot:updates:consumers"  # zset nama -> heartbeat (epoch)
+LEASE_KEY = "telegram_bot:updates:lease:{shard}"
+GROUP = "bot"
+
+HEARTBEAT_INTERVAL = 2  # detik
+HEARTBEAT_TTL = 10  # consumer tanpa heartbeat selama ini dianggap mati
+LEASE_TTL_MS = 15_000
+CLAIM_PAGE = 1000  # entry per XAUTOCLAIM saat mengambil alih shard
+POLL_TIMEOUT = 30  # long-poll getUpdates (detik)
+RETRY_BACKOFF = 1  # detik, dilipatgandakan per error beruntun
+RETRY_BACKOFF_MAX = 30
+BLOCK_MS = 1000  # XREADGROUP menunggu entry baru
+
+
+def redis_client() -> Redis:
+    kwargs = {"ssl_cert_reqs": None} if settings.REDIS_SSL else {}
+    return Redis.from_url(settings.REDIS_URL, **kwargs)
+
+
+def update_shard(data: dict, shards: int) -> int:
+    """Shard dari user pengirim; fallback chat, lalu update_id."""
+    for value in data.values():
+        if not isinstance(value, dict):
+            continue
+        user = value.get("from") or value.get("user")
+        if user:
+            return user["id"] % shards
+        chat = value.get("chat") or (value.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"] % shards
+    return data.get("update_id", 0) % shards
+
+
+def shard_owner(shard: int, consumers: list[str]) -> str | None:
+    # rendezvous hashing: consumer lain tidak berubah pemilik saat satu join/keluar
+    def weight(name: str) -> bytes:
+        return hashlib.blake2b(f"{shard}:{name}".encode(), digest_size=8).digest()
+
+    return max(consumers, key=weight, default=None)
+
+
+async def run_fetcher(
+    redis: Redis,
+    bot: Bot,
+    *,
+    shards: int,
+    maxlen: int,
+    poll_timeout: int = POLL_TIMEOUT,
+) -> None:
+    """
+    getUpdates terus-menerus; dibatalkan (cancel) untuk berhenti.
+    Error sementara Bot API / Redis dicoba ulang dengan backoff seperti
+    run_polling PTB; offset baru disimpan setelah XADD berhasil, jadi batch
+    yang gagal diambil ulang.
+    """
+    offset = int(await redis.get(OFFSET_KEY) or 0)
+    backoff = RETRY_BACKOFF
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset or None,
+                timeout=poll_timeout,
+                allowed_updates=None,
+            )
+            if not updates:
+                continue
+            next_offset = updates[-1].update_id + 1
+            async with redis.pipeline(transaction=True) as pipe:
+                for update in updates:
+                    data = update.to_dict()
+                    pipe.xadd(
+                        STREAM_KEY.format(shard=update_shard(data, shards)),
+                        {"u": json.dumps(data)},
+                        maxlen=maxlen,
+                        approximate=True,
+                    )
+                pipe.set(OFFSET_KEY, next_offset)
+                await pipe.execute()
+        except InvalidToken:
+            raise
+        except TimedOut:
+            continue  # long-poll habis waktu: langsung poll lagi
+        except RetryAfter as err:
+            await asyncio.sleep(retry_after_seconds(err))
+            continue
+        except (TelegramError, RedisConnectionError) as err:
+            logger.warning("fetcher error, coba lagi %ss: %s", backoff, err)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+            continue
+        offset = next_offset
+        backoff = RETRY_BACKOFF
+
+
+class ShardConsumer:
+    def __init__(
+        self,
+        redis: Redis,
+        process: Callable[[dict], Awaitable[None]],
+        *,
+        shards: int,
+        batch: int = 50,
+        name: str | None = None,
+    ):
+        self.redis = redis
+        self.process = process
+        self.shards = shards
+        self.batch = batch
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.owned: set[int] = set()
+        self.backlog: set[int] = set()  # shard yang pending-nya belum habis
+
+    async def run(self, stop: asyncio.Event) -> None:
+        await self._ensure_groups()
+        heartbeat = asyncio.create_task(self._heartbeat(stop))
+        heartbeat.add_done_callback(self._heartbeat_done)
+        try:
+            while not stop.is_set():
+                if heartbeat.done():
+                    # lease tidak diperpanjang lagi -> jangan konsumsi shard
+                    self.owned.clear()
+                    self.backlog.clear()
+                    heartbeat.result()
+                    break
+                await self.rebalance()
+                if self.owned:
+                    await self.consume_once()
+                else:
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(stop.wait(), BLOCK_MS / 1000)
+        finally:
+            heartbeat.cancel()
+            # Redis mati: lease & heartbeat toh kedaluwarsa sendiri
+            with contextlib.suppress(RedisError):
+                await self.leave()
+
+    def _heartbeat_done(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        # langsung lepas shard supaya batch yang sedang jalan berhenti di entry
+        # berikutnya, sebelum lease kedaluwarsa dan shard dipegang consumer lain
+        logger.error(
+            "heartbeat %s gagal, berhenti memproses shard",
+            self.name,
+            exc_info=task.exception(),
+        )
+        self.owned.clear()
+        self.backlog.clear()
+
+    async def _ensure_groups(self) -> None:
+        for shard in range(self.shards):
+            try:
+                await self.redis.xgroup_create(
+                    STREAM_KEY.format(shard=shard),
+                    GROUP,
+                    id="0",
+                    mkstream=True,
+                )
+            except ResponseError as err:
+                if "BUSYGROUP" not in str(err):
+                    raise
+
+    async def _heartbeat(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await self.redis.zadd(CONSUMERS_KEY, {self.name: time.time()})
+            for shard in list(self.owned):
+                key = LEASE_KEY.format(shard=shard)
+                if not await self._if_lease_owner(key, pexpire=LEASE_TTL_MS):
+                    logger.warning("%s kehilangan lease shard %s", self.name, shard)
+                    self.owned.discard(shard)
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    async def _if_lease_owner(self, key: str, *, pexpire=None, delete=False) -> bool:
+        # perpanjang / lepas lease hanya kalau masih milik consumer ini
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) != self.name.encode():
+                    return False
+                pipe.multi()
+                if delete:
+                    pipe.delete(key)
+                else:
+                    pipe.pexpire(key, pexpire)
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    async def live_consumers(self) -> list[str]:
+        now = time.time()
+        await self.redis.zadd(CONSUMERS_KEY, {self.name: now})
+        await self.redis.zremrangebyscore(CONSUMERS_KEY, "-inf", now - HEARTBEAT_TTL)
+        return [m.decode() for m in await self.redis.zrange(CONSUMERS_KEY, 0, -1)]
+
+    async def rebalance(self) -> None:
+        live = await self.live_consumers()
+        wanted = {s for s in range(self.shards) if shard_owner(s, live) == self.name}
+        for shard in self.owned - wanted:
+            await self._release(shard)
+        for shard in sorted(wanted - self.owned):
+            await self._acquire(shard)
+
+    async def _acquire(self, shard: int) -> None:
+        key = LEASE_KEY.format(shard=shard)
+        if not await self.redis.set(key, self.name, nx=True, px=LEASE_TTL_MS):
+            return  # pemilik lama belum melepas / lease belum kedaluwarsa
+        # entry pending pemilik lama (mati di tengah batch) diproses dulu;
+        # XAUTOCLAIM per halaman sampai cursor kembali ke 0-0
+        start_id = "0-0"
+        while True:
+            next_id, *_ = await self.redis.xautoclaim(
+                STREAM_KEY.format(shard=shard),
+                GROUP,
+                self.name,
+                min_idle_time=0,
+                start_id=start_id,
+                count=CLAIM_PAGE,
+            )
+            start_id = next_id.decode() if isinstance(next_id, bytes) else next_id
+            if start_id == "0-0":
+                break
+        self.owned.add(shard)
+        self.backlog.add(shard)
+        logger.info("%s memegang shard %s", self.name, shard)
+
+    async def _release(self, shard: int) -> None:
+        self.owned.discard(shard)
+        self.backlog.discard(shard)
+        await self._if_lease_owner(LEASE_KEY.format(shard=shard), delete=True)
+        logger.info("%s melepas shard %s", self.name, shard)
+
+    async def consume_once(self) -> None:
+        streams = {
+            STREAM_KEY.format(shard=s): "0" if s in self.backlog else ">"
+            for s in sorted(self.owned)
+        }
+        resp = await self.redis.xreadgroup(
+            GROUP,
+            self.name,
+            streams,
+            count=self.batch,
+            block=None if self.backlog else BLOCK_MS,
+        )
+        jobs = []
+        for key, entries in resp or []:
+            shard = int(key.decode().rsplit(":", 1)[1])
+            if not entries:
+                self.backlog.discard(shard)
+                continue
+            jobs.append(self._consume_shard(shard, entries))
+        await asyncio.gather(*jobs)
+
+    async def _consume_shard(self, shard: int, entries: list) -> None:
+        key = STREAM_KEY.format(shard=shard)
+        for entry_id, fields in entries:
+            if shard not in self.owned:
+                return  # lease hilang: sisa entry tetap pending untuk pemilik baru
+            try:
+                await self.process(json.loads(fields[b"u"]))
+            except Exception:
+                # entry rusak tidak boleh memblok shard
+                logger.exception("gagal memproses update %s shard %s", entry_id, shard)
+            await self.redis.xack(key, GROUP, entry_id)
+
+    async def leave(self) -> None:
+        for shard in list(self.owned):
+            await self._release(shard)
+        await self.redis.zrem(CONSUMERS_KEY, self.name)
+
+
+async def stream_stats(redis: Redis, shards: int) -> dict:
+    """Panjang stream, lag & pending consumer group, pemilik lease per shard."""
+    now = time.time()
+    consumers = {
+        name.decode(): round(now - score, 1)
+        for name, score in await redis.zrange(CONSUMERS_KEY, 0, -1, withscores=True)
+    }
+    rows = []
+    for shard in range(shards):
+        key = STREAM_KEY.format(shard=shard)
+        group = {}
+        with contextlib.suppress(ResponseError):  # stream / group belum ada
+            group = next(
+                (
+                    g
+                    for g in await redis.xinfo_groups(key)
+                    if g["name"] in (GROUP, GROUP.encode())
+                ),
+                {},
+            )
+        owner = await redis.get(LEASE_KEY.format(shard=shard))
+        rows.append(
+            {
+                "shard": shard,
+                "length": await redis.xlen(key),
+                "lag": group.get("lag"),
+                "pending": group.get("pending", 0),
+                "owner": owner.decode() if owner else None,
+            },
+        )
+    return {
+        "offset": int(await redis.get(OFFSET_KEY) or 0),
+        "consumers": consumers,  # nama -> detik sejak heartbeat terakhir
+        "lag": sum(r["lag"] or 0 for r in rows),
+        "pending": sum(r["pending"] for r in rows),
+        "shards": rows,
+    }
@@ -2,6 +2,8 @@ from django.urls import path
 
 from .billing_views import checkout  # (lihat step 8)
 from .billing_views import success  # (lihat step 8)
+from .health import health
+from .health import metrics
 from .views import telegram_webhook
 
 app_name = "telegram_bot"
@@ -14,4 +16,6 @@ urlpatterns = [
     ),
     path("billing/checkout/", checkout, name="checkout"),
     path("billing/success/", success, name="success"),
+    path("health/", health, name="health"),
+    path("metrics/", metrics, name="metrics"),
 ]
@@ -1,26 +1,24 @@
 import json
 
-from django.conf import settings
+from django.db import transaction
 from django.http import HttpResponse
 from django.http import HttpResponseForbidden
 from django.views.decorators.csrf import csrf_exempt
-from telegram import Update
 
-from .telegram_app import build_app
+from .webhook import process_update_json
+from .webhook import valid_secret
 
 
+# Di ASGI, config/asgi.py mengarahkan path ini ke webhook.telegram_webhook_app
+# (tanpa middleware). View ini tetap ada untuk runner non-ASGI / reverse().
+# ATOMIC_REQUESTS tidak bisa dipakai untuk async view -> non_atomic_requests;
+# transaksi DB ada di service yang menulis ledger.
 @csrf_exempt
+@transaction.non_atomic_requests
 async def telegram_webhook(request, secret_path: str):
-    # Optional: secret path check (you can hardcode it in URL)
-    # e.g. /telegram/webhook/<secret_path>/
-    # If you don't want secret_path, remove it from urls.
-
     # Verify secret header (recommended)
     secret_header = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
-    if (
-        settings.TELEGRAM_WEBHOOK_SECRET_TOKEN
-        and secret_header != settings.TELEGRAM_WEBHOOK_SECRET_TOKEN
-    ):
+    if not valid_secret(secret_header):
         return HttpResponseForbidden("invalid secret token")
 
     try:
@@ -28,7 +26,5 @@ async def telegram_webhook(request, secret_path: str):
     except json.JSONDecodeError as err:
         return HttpResponse(str(err))
 
-    app = build_app()
-    update = Update.de_json(data, app.bot)
-    await app.process_update(update)
+    await process_update_json(data)
     return HttpResponse("ok")
@@ -0,0 +1,137 @@
+"""
+Route ASGI ringan untuk webhook Telegram.
+
+config/asgi.py meneruskan /telegram/webhook/<secret>/ langsung ke
+telegram_webhook_app() tanpa lewat handler Django: tanpa middleware
+(session, CSRF, allauth, locale, messages) dan tanpa ATOMIC_REQUESTS.
+Transaksi DB cukup di service yang menulis ledger (@transaction.atomic).
+
+Application PTB dibuat + di-initialize sekali per proses (bukan per update).
+Tiap update jalan di ThreadSensitiveContext sendiri (seperti request di
+ASGIHandler Django), jadi query sync_to_async / async ORM update yang berbeda
+tidak antre di satu executor thread-sensitive global. Jumlah update paralel
+dibatasi TELEGRAM_UPDATE_CONCURRENCY (= maksimal koneksi DB per worker).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+import re
+from typing import TYPE_CHECKING
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db import connections
+from telegram import Update
+
+from .telegram_app import build_app
+
+if TYPE_CHECKING:
+    from telegram.ext import Application
+
+WEBHOOK_PATH_RE = re.compile(r"^/telegram/webhook/[^/]+/$")
+SECRET_HEADER = b"x-telegram-bot-api-secret-token"
+
+_app: Application | None = None
+_app_lock = asyncio.Lock()
+_update_slots = asyncio.Semaphore(settings.TELEGRAM_UPDATE_CONCURRENCY)
+
+
+async def get_application() -> Application:
+    global _app  # noqa: PLW0603
+    if _app is None:
+        async with _app_lock:
+            if _app is None:
+                app = build_app()
+                await app.initialize()
+                _app = app
+    return _app
+
+
+def set_application(app: Application | None) -> None:
+    # untuk benchmark / emulator: pakai Application yang sudah di-initialize
+    global _app  # noqa: PLW0603
+    _app = app
+
+
+def is_webhook_path(path: str) -> bool:
+    return WEBHOOK_PATH_RE.match(path) is not None
+
+
+def valid_secret(header: bytes | str) -> bool:
+    secret = settings.TELEGRAM_WEBHOOK_SECRET_TOKEN
+    if not secret:
+        return True
+    if isinstance(header, str):
+        header = header.encode()
+    return hmac.compare_digest(header, secret.encode())
+
+
+async def process_update_json(data: dict, *, isolate: bool = True) -> None:
+    app = await get_application()
+    update = Update.de_json(data, app.bot)
+    if not isolate:
+        # satu executor thread-sensitive bersama (perilaku lama, untuk benchmark)
+        await _process(app, update, close=close_old_connections)
+        return
+    async with _update_slots, ThreadSensitiveContext():
+        # thread milik context ini dibuang sesudahnya -> tutup koneksinya
+        await _process(app, update, close=connections.close_all)
+
+
+async def _process(app: Application, update: Update, close) -> None:
+    # pengganti request_started / request_finished Django
+    await sync_to_async(close_old_connections)()
+    try:
+        await app.process_update(update)
+    finally:
+        await sync_to_async(close)()
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    more = True
+    while more:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def _respond(send, status: int, body: bytes) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        },
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def telegram_webhook_app(scope, receive, send) -> None:
+    if scope["method"] != "POST":
+        await _respond(send, 405, b"method not allowed")
+        return
+
+    headers = dict(scope["headers"])
+    if not valid_secret(headers.get(SECRET_HEADER, b"")):
+        await _respond(send, 403, b"invalid secret token")
+        return
+
+    try:
+        data = json.loads(await _read_body(receive))
+    except json.JSONDecodeError as err:
+        # 200 supaya Telegram tidak mengirim ulang payload rusak
+        await _respond(send, 200, str(err).encode())
+        return
+
+    await process_update_json(data)
+    await _respond(send, 200, b"ok")